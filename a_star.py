@@ -1,5 +1,9 @@
 # path = pathing
 import heapq
+import time
+import numpy as np
+import profiling
+from grid import DIAGONAL_COST, step_cost
 
 class Node:
 
@@ -25,15 +29,92 @@ def distance(posture1, posture2):
     return abs(posture1[0] - posture2[0]) + abs(posture1[1] - posture2[1])
 
 
-def a_star_search(grid, start, goal):
+def octile(posture1, posture2):
+    """Shortest 8-connected length on open ground: diagonal steps first, then straight"""
+    rows = abs(posture1[0] - posture2[0])
+    cols = abs(posture1[1] - posture2[1])
+    return max(rows, cols) + (DIAGONAL_COST - 1) * min(rows, cols)
+
+
+def heuristic(grid):
+    """
+    Admissible distance estimate for the grid's movement model, scaled by
+    the cheapest cell cost when the grid has a cost layer
+    """
+    base = octile if grid.connectivity == 8 else distance
+    floor = grid.cost_floor()
+    if floor == 1:
+        return base
+    return lambda posture1, posture2: floor * base(posture1, posture2)
+
+
+def path_cost(path, grid=None):
+    """
+    Energy of a path in units of moving_cost: its flown length (diagonal
+    steps count sqrt(2)), weighted by grid's cell costs if it has any
+    """
+    if grid is not None and grid.cost is not None:
+        return sum(grid.move_cost(path[i - 1], path[i]) for i in range(1, len(path)))
+    return sum(step_cost(path[i - 1], path[i]) for i in range(1, len(path)))
+
+
+def clearance_penalty(grid, weight, safe_distance=2):
+    """
+    Extra cost for entering each cell, growing as the cell gets closer to
+    an obstacle: weight * (safe_distance + 1 - clearance) for cells within
+    safe_distance of one, 0 elsewhere. Returned as nested lists (fast to
+    index inside the search loop) and cached per grid version.
+    """
+    def build():
+        clearance = grid.clearance_field()
+        penalty = weight * (safe_distance + 1 - clearance)
+        return penalty.clip(min=0).tolist()
+
+    return grid.cached(('clearance_penalty', weight, safe_distance), build)
+
+
+def _search_stats(stats, expanded, pushes, max_open):
+    """Fill a caller's stats dict and the active profiler's counters"""
+    if stats is not None:
+        stats['expanded'] = expanded
+        stats['pushes'] = pushes
+        stats['max_open'] = max_open
+    profiling.count('a_star.expanded', expanded)
+    profiling.count('a_star.pushes', pushes)
+    profiling.peak('a_star.max_open', max_open)
+
+
+@profiling.profiled('a_star_search')
+def a_star_search(grid, start, goal, clearance_weight=0, safe_distance=2, stats=None):
+    """
+    A* over the grid's 4- or 8-connected moves (diagonals cost sqrt(2) and
+    the heuristic is octile distance), minimizing energy when the grid has
+    a cost layer (see Grid.moves). With clearance_weight > 0 every move also
+    pays clearance_penalty() for the cell it enters, so the search trades
+    a few extra steps for staying away from obstacles and no-fly zones.
+    If a stats dict is given, the number of expanded nodes, heap pushes and
+    the largest open-set size are stored in stats['expanded'],
+    stats['pushes'] and stats['max_open'].
+    """
     
     if not grid.isvalid(start) or not grid.isvalid(goal):
         return None
+
+    # Walled-off goals would otherwise exhaust the whole reachable region
+    if not grid.reachable(start, goal):
+        _search_stats(stats, 0, 0, 0)
+        return None
+
+    penalty = None
+    if clearance_weight > 0:
+        penalty = clearance_penalty(grid, clearance_weight, safe_distance)
     
-    start_node = Node(start, g=0, h=distance(start, goal))
+    estimate = heuristic(grid)
+    start_node = Node(start, g=0, h=estimate(start, goal))
     
     openset = []
     heapq.heappush(openset, start_node)
+    pushes = max_open = 1
 
     visited = set()
     cost_so_far = {start: 0}
@@ -42,6 +123,7 @@ def a_star_search(grid, start, goal):
         current = heapq.heappop(openset)
 
         if current.posture == goal:
+            _search_stats(stats, len(visited), pushes, max_open)
             return reconstruct_path(current)
         
         if current.posture in visited:
@@ -49,20 +131,232 @@ def a_star_search(grid, start, goal):
 
         visited.add(current.posture)
 
-        for surrounding_posture in grid.surroundings(current.posture):
-            new_cost = current.g + 1 
+        for surrounding_posture, move_cost in grid.moves(current.posture):
+            new_cost = current.g + move_cost
+            if penalty is not None:
+                new_cost += penalty[surrounding_posture[0]][surrounding_posture[1]]
 
             if surrounding_posture in cost_so_far and new_cost >= cost_so_far[surrounding_posture]:
                 continue
 
-            h = distance(surrounding_posture, goal)
+            h = estimate(surrounding_posture, goal)
             surrounding_node = Node(surrounding_posture, g=new_cost, h=h, parent=current)
 
             cost_so_far[surrounding_posture] = new_cost
             heapq.heappush(openset, surrounding_node)
+            pushes += 1
+            if len(openset) > max_open:
+                max_open = len(openset)
 
+    _search_stats(stats, len(visited), pushes, max_open)
     return None
 
+@profiling.profiled('bidirectional_search')
+def bidirectional_search(grid, start, goal, stats=None):
+    """
+    Bidirectional A* without clearance penalties (orthogonal steps cost 1,
+    diagonal ones sqrt(2) on 8-connected grids, times the cost of the cell
+    entered if the grid has a cost layer): one search grows from the
+    start towards the goal and one from the goal back towards the start,
+    always advancing the side with the smaller open set. Every time a
+    side reaches a cell the other side has seen, the joined length becomes
+    a candidate; the search stops once the smallest f on either open set
+    can no longer beat the best candidate, so the path has the same length
+    as a_star_search. Ties on f prefer the deeper node, which keeps the
+    frontiers narrow on open ground. stats['expanded'] is filled like there.
+    """
+    if not grid.isvalid(start) or not grid.isvalid(goal):
+        return None
+
+    if not grid.reachable(start, goal):
+        if stats is not None:
+            stats['expanded'] = 0
+        return None
+
+    if start == goal:
+        if stats is not None:
+            stats['expanded'] = 0
+        return [start]
+
+    targets = (goal, start)
+    cost_so_far = ({start: 0}, {goal: 0})
+    parents = ({start: None}, {goal: None})
+    visited = (set(), set())
+    # Entries are (f, -g, g, posture): lowest f first, deepest on ties
+    estimate = heuristic(grid)
+    costs = grid.cost_lists()
+    opensets = ([(estimate(start, goal), 0, 0, start)],
+                [(estimate(goal, start), 0, 0, goal)])
+
+    best_length = float('inf')
+    meeting = None
+    expanded = 0
+
+    while opensets[0] and opensets[1]:
+        if max(opensets[0][0][0], opensets[1][0][0]) >= best_length:
+            break
+
+        side = 0 if len(opensets[0]) <= len(opensets[1]) else 1
+        _, _, g, posture = heapq.heappop(opensets[side])
+
+        if posture in visited[side]:
+            continue
+        visited[side].add(posture)
+        expanded += 1
+
+        other_cost = cost_so_far[1 - side]
+        moves = grid.moves(posture)
+        if side == 1 and costs is not None:
+            # The goal side walks moves backwards: they end in posture
+            here = costs[posture[0]][posture[1]]
+            moves = [(other, step_cost(posture, other) * here) for other, _ in moves]
+        for surrounding_posture, move_cost in moves:
+            new_cost = g + move_cost
+            known = cost_so_far[side].get(surrounding_posture)
+            if known is not None and new_cost >= known:
+                continue
+
+            cost_so_far[side][surrounding_posture] = new_cost
+            parents[side][surrounding_posture] = posture
+            h = estimate(surrounding_posture, targets[side])
+            heapq.heappush(opensets[side], (new_cost + h, -new_cost, new_cost, surrounding_posture))
+
+            if surrounding_posture in other_cost:
+                length = new_cost + other_cost[surrounding_posture]
+                if length < best_length:
+                    best_length = length
+                    meeting = surrounding_posture
+
+    if stats is not None:
+        stats['expanded'] = expanded
+
+    if meeting is None:
+        return None
+    return _join_paths(parents, meeting)
+
+
+def _join_paths(parents, meeting):
+    """Stitch the start-side and goal-side parent chains at the meeting cell"""
+    forward = []
+    posture = meeting
+    while posture is not None:
+        forward.append(posture)
+        posture = parents[0][posture]
+    forward.reverse()
+
+    posture = parents[1][meeting]
+    while posture is not None:
+        forward.append(posture)
+        posture = parents[1][posture]
+
+    return forward
+
+
+@profiling.profiled('anytime_search')
+def anytime_search(grid, start, goal, time_budget=0.02, epsilon=3.0, step=0.5, stats=None):
+    """
+    Anytime repairing A* (ARA*): a first path comes quickly from a search
+    whose heuristic is inflated by epsilon, then epsilon shrinks by step
+    and the search resumes from the costs and parents it already has,
+    re-opening only the cells whose cost improved, until epsilon reaches 1
+    (optimal) or time_budget seconds have passed. The first path is always
+    completed, so a tight budget still returns a path if one exists.
+
+    Parameters:
+        grid: Grid object (same moves and costs as a_star_search)
+        start, goal: Cells to connect
+        time_budget: Seconds to spend improving the path
+        epsilon: Initial heuristic inflation (>= 1)
+        step: Amount epsilon shrinks by after each solution
+        stats: Optional dict; filled with 'expanded', 'iterations' (paths
+               found) and 'epsilon' (inflation of the last finished search)
+
+    Returns:
+        tuple: (path, bound) where path costs at most bound times the
+               optimum, or (None, inf) if goal cannot be reached
+    """
+    deadline = time.perf_counter() + time_budget
+    if not grid.isvalid(start) or not grid.isvalid(goal) or not grid.reachable(start, goal):
+        if stats is not None:
+            stats.update(expanded=0, iterations=0, epsilon=epsilon)
+        return None, float('inf')
+
+    estimate = heuristic(grid)
+    h = {}
+
+    def key(posture, weight):
+        if posture not in h:
+            h[posture] = estimate(posture, goal)
+        return cost_so_far[posture] + weight * h[posture]
+
+    cost_so_far = {start: 0}
+    parents = {start: None}
+    # Entries are (key, g, posture); stale ones (g no longer current) are skipped
+    openset = [(key(start, epsilon), 0, start)]
+    inconsistent = set()
+    expanded = iterations = 0
+    best_path, bound, finished = None, float('inf'), epsilon
+
+    while True:
+        closed = set()
+        timed_out = False
+        while openset:
+            top_key, g, posture = openset[0]
+            if posture in closed or g != cost_so_far[posture]:
+                heapq.heappop(openset)
+                continue
+            if cost_so_far.get(goal, float('inf')) <= top_key:
+                break
+            if best_path is not None and time.perf_counter() > deadline:
+                timed_out = True
+                break
+            heapq.heappop(openset)
+            closed.add(posture)
+            expanded += 1
+
+            for surrounding_posture, move_cost in grid.moves(posture):
+                new_cost = g + move_cost
+                if new_cost >= cost_so_far.get(surrounding_posture, float('inf')):
+                    continue
+                cost_so_far[surrounding_posture] = new_cost
+                parents[surrounding_posture] = posture
+                if surrounding_posture in closed:
+                    # Already expanded in this round: improve it in the next
+                    inconsistent.add(surrounding_posture)
+                else:
+                    heapq.heappush(openset, (key(surrounding_posture, epsilon),
+                                             new_cost, surrounding_posture))
+        if timed_out:
+            break
+
+        iterations += 1
+        finished = epsilon
+        best_path = [goal]
+        while parents[best_path[-1]] is not None:
+            best_path.append(parents[best_path[-1]])
+        best_path.reverse()
+
+        # Any cheaper path must pass through an open or inconsistent cell
+        frontier = [key(posture, 1) for _, g, posture in openset if g == cost_so_far[posture]]
+        frontier += [key(posture, 1) for posture in inconsistent]
+        lower = min(frontier, default=cost_so_far[goal])
+        bound = min(epsilon, cost_so_far[goal] / lower) if lower > 0 else 1.0
+
+        if epsilon <= 1 or time.perf_counter() > deadline:
+            break
+        epsilon = max(1.0, epsilon - step)
+        openset = [(key(posture, epsilon), cost_so_far[posture], posture)
+                   for posture in {posture for _, g, posture in openset
+                                    if posture not in closed and g == cost_so_far[posture]} | inconsistent]
+        heapq.heapify(openset)
+        inconsistent = set()
+
+    if stats is not None:
+        stats.update(expanded=expanded, iterations=iterations, epsilon=finished)
+    profiling.count('anytime.expanded', expanded)
+    return best_path, max(bound, 1.0)
+
+
 def reconstruct_path(node):
     path = []
     current = node
@@ -74,22 +368,161 @@ def reconstruct_path(node):
     path.reverse()
     return path
 
-def find_the_nearest_unvisited(grid, drone, unvisited_cells):
+def distance_field(grid, source):
+    """
+    flood_field from a single source: step counts on plain 4-connected
+    grids, energies once the grid has diagonal moves or a cost layer.
+    Cached per grid version, so repeated queries from the same cell are
+    free until the grid changes.
+    """
+    return grid.cached(('distance_field', tuple(source)), lambda: flood_field(grid, [source]))
+
+
+def flood_field(grid, sources, toward=False):
+    """
+    Uncached multi-source flood over grid.moves: energy (in units of
+    moving_cost, like path_cost) of the cheapest route from the nearest
+    source to every cell, or with toward=True from every cell to the
+    nearest source; -1 where no source is reachable. Plain 4-connected
+    grids without a cost layer use a BFS and get int32 step counts (both
+    directions agree there); otherwise Dijkstra fills a float array. For
+    callers that keep their own (bounded) cache of fields.
+    """
+    if grid.cost is None and grid.connectivity == 4:
+        return _step_field(grid, sources)
+
+    size = grid.size
+    field = np.full((size, size), -1.0)
+    costs = grid.cost_lists()
+    best = {}
+    for source in sources:
+        if grid.isvalid(tuple(source)):
+            best[tuple(source)] = 0.0
+    openset = [(0.0, source) for source in best]
+
+    while openset:
+        energy, posture = heapq.heappop(openset)
+        if field[posture] >= 0:
+            continue
+        field[posture] = energy
+        for other in grid.surroundings(posture):
+            # A move pays the cost of the cell it enters
+            entered = posture if toward else other
+            here = 1 if costs is None else costs[entered[0]][entered[1]]
+            new_energy = energy + step_cost(posture, other) * here
+            if field[other] < 0 and new_energy < best.get(other, float('inf')):
+                best[other] = new_energy
+                heapq.heappush(openset, (new_energy, other))
+    return field
+
+
+def _step_field(grid, sources):
+    """Multi-source BFS step counts over 4-connected moves"""
+    size = grid.size
+    field = [-1] * (size * size)
+    neighbors = grid.cached('neighbor_lists', lambda: grid.neighbor_table()[0].tolist())
+    frontier = []
+    for row, col in sources:
+        if grid.isvalid((row, col)) and field[row * size + col] < 0:
+            field[row * size + col] = 0
+            frontier.append(row * size + col)
+
+    steps = 0
+    while frontier:
+        steps += 1
+        next_frontier = []
+        for cell in frontier:
+            for other in neighbors[cell]:
+                if other >= 0 and field[other] < 0:
+                    field[other] = steps
+                    next_frontier.append(other)
+        frontier = next_frontier
+    return np.array(field, dtype=np.int32).reshape(size, size)
+
+
+def cost_field(grid, target):
+    """
+    Energy (in units of moving_cost, honouring connectivity and the cost
+    layer) of the cheapest route from every cell to target, -1 where
+    target is unreachable: flood_field towards target, as floats. Cached
+    per grid version, so battery reserve checks against a fixed home or
+    end point are lookups.
+    """
+    return grid.cached(('cost_field', tuple(target)),
+                       lambda: flood_field(grid, [target], toward=True).astype(float))
+
+
+def path_from_field(grid, field, target):
+    """
+    Walk a flood_field / distance_field back from target to its source,
+    each time stepping to the neighbor the cheapest route came from.
+
+    Returns:
+        list: Cells from the field's source to target, or None if target
+              is unreachable
+    """
+    row, col = target
+    if field[row][col] < 0:
+        return None
+
+    path = [(row, col)]
+    while field[path[-1][0]][path[-1][1]] > 0:
+        here = path[-1]
+        path.append(min((other for other in grid.surroundings(here) if field[other[0]][other[1]] >= 0),
+                        key=lambda other: field[other[0]][other[1]] + grid.move_cost(other, here)))
+
+    path.reverse()
+    return path
+
+
+def path_along_cost_field(grid, field, start):
+    """
+    Cheapest route from start to a cost_field's target, always stepping to
+    the neighbor with the least move cost plus remaining energy
+
+    Returns:
+        list: Cells from start to the target, or None if it is unreachable
+    """
+    row, col = start
+    if field[row][col] < 0:
+        return None
+
+    path = [(row, col)]
+    while field[path[-1][0]][path[-1][1]] > 0:
+        here = path[-1]
+        path.append(min((other for other in grid.surroundings(here) if field[other[0]][other[1]] >= 0),
+                        key=lambda other: grid.move_cost(here, other) + field[other[0]][other[1]]))
+    return path
+
+
+def find_the_nearest_unvisited(grid, drone, unvisited_cells, position=None):
+    """Closest reachable unvisited cell (by A* path cost) from position, default the drone's"""
     if not unvisited_cells:
         return None, None
     
-    current_position = drone.position
+    current_position = drone.position if position is None else position
     best_position = None
     best_path = None
     best_distance = float('inf')
 
+    # Only spend A* calls on cells that can actually be reached
+    if grid.isvalid(current_position):
+        labels = grid.component_labels()
+        here = labels[current_position[0]][current_position[1]]
+        unvisited_cells = [posture for posture in unvisited_cells
+                           if labels[posture[0]][posture[1]] == here]
+
+    estimate = heuristic(grid)
     sorted_cells = sorted(unvisited_cells,
-                          key=lambda posture: distance(current_position, posture))
+                          key=lambda posture: estimate(current_position, posture))
     
+    profiling.count('nearest_unvisited.picks')
     for target in sorted_cells[:10]:
+        profiling.count('nearest_unvisited.a_star_calls')
         path = a_star_search(grid, current_position, target)
-        if path and len(path) < best_distance:
-            best_distance = len(path)
+        cost = path_cost(path, grid) if path else None
+        if path and cost < best_distance:
+            best_distance = cost
             best_position = target
             best_path = path
 
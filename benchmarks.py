@@ -0,0 +1,275 @@
+"""
+Benchmarks for Drone Path Optimizer search algorithms
+Compares node expansions and run time of the path finders on the
+built-in scenarios (run directly: python benchmarks.py)
+"""
+
+import time
+from grid import Grid
+from a_star import a_star_search, anytime_search, bidirectional_search, path_cost
+from metrics import calculate_turns, energy_breakdown
+from quadtree import QuadTree
+
+
+def _corner_grid(scenario, size, seed, connectivity=4):
+    """Scenario grid with both routing corners forced open"""
+    grid = Grid(size=size, obstacle_prob=0.15, no_fly_zone=0.05, seedling=seed,
+                connectivity=connectivity)
+    grid.load_scenario(scenario)
+    grid.setstartposition((size - 1, size - 1))
+    return grid
+
+
+def benchmark_bidirectional(scenarios=('Maze', 'Narrow Passage', 'Random'),
+                            size=60, seeds=(1, 2, 3)):
+    """
+    Route corner to corner with a_star_search and bidirectional_search
+
+    Parameters:
+        scenarios: Grid.load_scenario names to test
+        size: Grid size
+        seeds: Seeds used for each scenario (matters for 'Random')
+
+    Returns:
+        list: One dict per scenario with summed expansions, time (ms) and
+              path lengths for both searches
+    """
+    results = []
+
+    for scenario in scenarios:
+        row = {
+            'scenario': scenario,
+            'astar_expanded': 0, 'astar_ms': 0.0, 'astar_length': 0,
+            'bidir_expanded': 0, 'bidir_ms': 0.0, 'bidir_length': 0
+        }
+
+        for seed in seeds:
+            grid = _corner_grid(scenario, size, seed)
+            goal = (size - 1, size - 1)
+
+            for name, search in (('astar', a_star_search), ('bidir', bidirectional_search)):
+                stats = {}
+                start_time = time.perf_counter()
+                path = search(grid, (0, 0), goal, stats=stats)
+                row[name + '_ms'] += (time.perf_counter() - start_time) * 1000
+                row[name + '_expanded'] += stats['expanded']
+                row[name + '_length'] += len(path) if path else 0
+
+        results.append(row)
+
+    return results
+
+
+def benchmark_connectivity(scenarios=('Open', 'Random', 'Maze', 'Narrow Passage'),
+                           size=60, seeds=(1, 2, 3)):
+    """
+    Route corner to corner with A* on 4- and 8-connected versions of the
+    same grids
+
+    Returns:
+        list: One dict per scenario and connectivity with summed flown
+              distance, steps, turns, energy_breakdown total energy,
+              expansions and time (ms)
+    """
+    results = []
+
+    for scenario in scenarios:
+        for connectivity in (4, 8):
+            row = {'scenario': scenario, 'connectivity': connectivity,
+                   'distance': 0.0, 'steps': 0, 'turns': 0, 'energy': 0.0,
+                   'expanded': 0, 'ms': 0.0}
+
+            for seed in seeds:
+                grid = _corner_grid(scenario, size, seed, connectivity)
+                stats = {}
+                start_time = time.perf_counter()
+                path = a_star_search(grid, (0, 0), (size - 1, size - 1), stats=stats)
+                row['ms'] += (time.perf_counter() - start_time) * 1000
+                row['expanded'] += stats['expanded']
+                if path:
+                    row['distance'] += path_cost(path)
+                    row['steps'] += len(path) - 1
+                    row['turns'] += calculate_turns(path)
+                    row['energy'] += energy_breakdown(path)['total_energy']
+
+            results.append(row)
+
+    return results
+
+
+def _add_weather(grid):
+    """Headwind band, high-altitude block and sensor-noisy zone on a grid"""
+    size = grid.size
+    grid.add_cost_region((size // 3, 0), (size // 3 + size // 6, size - 1), 3.0)          # Headwind
+    grid.add_cost_region((0, size // 2), (size // 4, size // 2 + size // 4), 2.0)         # Altitude
+    grid.add_cost_region((2 * size // 3, size // 5), (size - 1, size // 5 + size // 5), 1.5)  # Noise
+    return grid
+
+
+def benchmark_cost_layer(scenarios=('Open', 'Random'), size=60, seeds=(1, 2, 3)):
+    """
+    Route corner to corner on grids with a weather cost layer: the
+    shortest path (planned ignoring costs) against the energy-optimal one
+
+    Returns:
+        list: One dict per scenario with summed true energy of both paths
+              and A* time (ms) without and with the cost layer
+    """
+    results = []
+
+    for scenario in scenarios:
+        row = {'scenario': scenario, 'shortest_energy': 0.0, 'weighted_energy': 0.0,
+               'uniform_ms': 0.0, 'weighted_ms': 0.0}
+
+        for seed in seeds:
+            grid = _corner_grid(scenario, size, seed)
+            goal = (size - 1, size - 1)
+
+            start_time = time.perf_counter()
+            shortest = a_star_search(grid, (0, 0), goal)
+            row['uniform_ms'] += (time.perf_counter() - start_time) * 1000
+
+            _add_weather(grid)
+            start_time = time.perf_counter()
+            weighted = a_star_search(grid, (0, 0), goal)
+            row['weighted_ms'] += (time.perf_counter() - start_time) * 1000
+
+            if shortest and weighted:
+                row['shortest_energy'] += path_cost(shortest, grid)
+                row['weighted_energy'] += path_cost(weighted, grid)
+
+        results.append(row)
+
+    return results
+
+
+def benchmark_anytime(scenarios=('Random', 'Maze'), size=150, seeds=(1, 2, 3),
+                      budgets=(0.0, 0.005, 0.02, 0.1)):
+    """
+    Route corner to corner with anytime_search under several time budgets
+    against plain A*
+
+    Returns:
+        list: One dict per scenario and budget with summed time (ms) and
+              path energy, the worst reported bound and the optimal energy
+    """
+    results = []
+
+    for scenario in scenarios:
+        grids = [_corner_grid(scenario, size, seed, connectivity=8) for seed in seeds]
+        goal = (size - 1, size - 1)
+
+        optimal_energy = astar_ms = 0.0
+        for grid in grids:
+            start_time = time.perf_counter()
+            path = a_star_search(grid, (0, 0), goal)
+            astar_ms += (time.perf_counter() - start_time) * 1000
+            optimal_energy += path_cost(path, grid) if path else 0
+
+        for budget in budgets:
+            row = {'scenario': scenario, 'budget_ms': budget * 1000, 'ms': 0.0, 'energy': 0.0,
+                   'bound': 1.0, 'optimal_energy': optimal_energy, 'astar_ms': astar_ms}
+            for grid in grids:
+                start_time = time.perf_counter()
+                path, bound = anytime_search(grid, (0, 0), goal, time_budget=budget)
+                row['ms'] += (time.perf_counter() - start_time) * 1000
+                if path:
+                    row['energy'] += path_cost(path, grid)
+                    row['bound'] = max(row['bound'], bound)
+            results.append(row)
+
+    return results
+
+
+def benchmark_quadtree(scenarios=('Open', 'Narrow Passage', 'Trap'), size=128, seeds=(1, 2, 3)):
+    """
+    Route corner to corner with cell A* and over a QuadTree decomposition
+
+    Returns:
+        list: One dict per scenario with summed safe leaves, safe cells,
+              expansions, time (ms) and path energy of both searches
+    """
+    results = []
+
+    for scenario in scenarios:
+        row = {'scenario': scenario, 'leaves': 0, 'cells': 0,
+               'astar_expanded': 0, 'astar_ms': 0.0, 'astar_energy': 0.0,
+               'tree_expanded': 0, 'tree_ms': 0.0, 'tree_energy': 0.0}
+
+        for seed in seeds:
+            grid = _corner_grid(scenario, size, seed)
+            grid.component_labels()  # Shared reachability check, not timed
+            goal = (size - 1, size - 1)
+            tree = QuadTree(grid)
+            row['leaves'] += tree.leaf_count()[0]
+            row['cells'] += int(grid.reachable_mask((0, 0)).sum())
+
+            stats = {}
+            start_time = time.perf_counter()
+            path = a_star_search(grid, (0, 0), goal, stats=stats)
+            row['astar_ms'] += (time.perf_counter() - start_time) * 1000
+            row['astar_expanded'] += stats['expanded']
+            row['astar_energy'] += path_cost(path, grid) if path else 0
+
+            stats = {}
+            start_time = time.perf_counter()
+            path = tree.find_path((0, 0), goal, stats=stats)
+            row['tree_ms'] += (time.perf_counter() - start_time) * 1000
+            row['tree_expanded'] += stats['expanded']
+            row['tree_energy'] += path_cost(path, grid) if path else 0
+
+        results.append(row)
+
+    return results
+
+
+if __name__ == "__main__":
+    print("=== Bidirectional Search Benchmark ===")
+    print("-" * 72)
+    print(f"{'Scenario':<16} | {'A* nodes':<9} | {'A* ms':<8} | {'Bi nodes':<9} | {'Bi ms':<8} | {'Same length'}")
+    print("-" * 72)
+
+    for r in benchmark_bidirectional():
+        same = r['astar_length'] == r['bidir_length']
+        print(f"{r['scenario']:<16} | {r['astar_expanded']:<9} | {r['astar_ms']:<8.1f} | "
+              f"{r['bidir_expanded']:<9} | {r['bidir_ms']:<8.1f} | {'yes' if same else 'NO'}")
+
+    print("\n=== 4- vs 8-Connected Routing ===")
+    print("-" * 72)
+    print(f"{'Scenario':<16} | {'Conn':<4} | {'Distance':<9} | {'Steps':<6} | {'Turns':<6} | "
+          f"{'Energy':<8} | {'Nodes':<7} | {'ms'}")
+    print("-" * 72)
+
+    for r in benchmark_connectivity():
+        print(f"{r['scenario']:<16} | {r['connectivity']:<4} | {r['distance']:<9.1f} | {r['steps']:<6} | "
+              f"{r['turns']:<6} | {r['energy']:<8.1f} | {r['expanded']:<7} | {r['ms']:.1f}")
+
+    print("\n=== Weather Cost Layer ===")
+    print("-" * 72)
+    print(f"{'Scenario':<16} | {'Shortest energy':<15} | {'Weighted energy':<15} | {'Uniform ms':<10} | {'Weighted ms'}")
+    print("-" * 72)
+
+    for r in benchmark_cost_layer():
+        print(f"{r['scenario']:<16} | {r['shortest_energy']:<15.1f} | {r['weighted_energy']:<15.1f} | "
+              f"{r['uniform_ms']:<10.1f} | {r['weighted_ms']:.1f}")
+
+    print("\n=== Anytime Search (8-connected, 150x150) ===")
+    print("-" * 72)
+    print(f"{'Scenario':<16} | {'Budget ms':<9} | {'ms':<8} | {'Energy':<8} | {'Bound':<6} | "
+          f"{'Optimal':<8} | {'A* ms'}")
+    print("-" * 72)
+
+    for r in benchmark_anytime():
+        print(f"{r['scenario']:<16} | {r['budget_ms']:<9.0f} | {r['ms']:<8.1f} | {r['energy']:<8.1f} | "
+              f"{r['bound']:<6.3f} | {r['optimal_energy']:<8.1f} | {r['astar_ms']:.1f}")
+
+    print("\n=== Quadtree Routing (128x128) ===")
+    print("-" * 72)
+    print(f"{'Scenario':<16} | {'Leaves':<7} | {'Cells':<6} | {'A* nodes':<8} | {'A* ms':<7} | "
+          f"{'QT nodes':<8} | {'QT ms':<7} | {'Energy A*/QT'}")
+    print("-" * 72)
+
+    for r in benchmark_quadtree():
+        print(f"{r['scenario']:<16} | {r['leaves']:<7} | {r['cells']:<6} | {r['astar_expanded']:<8} | "
+              f"{r['astar_ms']:<7.1f} | {r['tree_expanded']:<8} | {r['tree_ms']:<7.1f} | "
+              f"{r['astar_energy']:.0f}/{r['tree_energy']:.0f}")
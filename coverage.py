@@ -1,6 +1,9 @@
 
+import heapq
 import numpy as np
-from a_star import a_star_search, find_the_nearest_unvisited
+import profiling
+from grid import ORTHOGONAL, DIAGONAL
+from a_star import a_star_search, heuristic, path_cost, cost_field, flood_field, find_the_nearest_unvisited
 
 class CoveragePlanner:
 
@@ -10,13 +13,14 @@ class CoveragePlanner:
 
 
     def get_unvisited_safe_cells(self):
-        unvisited = set()
-        for i in range(self.grid.size):
-            for j in range(self.grid.size):
-                posture = (i, j)
-                if self.grid.isvalid(posture) and posture not in self.drone.visited:
-                    unvisited.add(posture)
-        return unvisited
+        """Unvisited safe cells the drone can actually reach from where it is"""
+        reachable = self.grid.reachable_mask(self.drone.position)
+        unvisited = set(zip(*(index.tolist() for index in np.nonzero(reachable))))
+        return unvisited - self.drone.visited
+
+    def reachable_cell_count(self):
+        """Number of safe cells connected to the drone's start position"""
+        return int(np.sum(self.grid.reachable_mask(self.drone.startposition)))
     
     def plan_zigzag_coverage(self):
         coverage_path = []
@@ -34,100 +38,490 @@ class CoveragePlanner:
         return coverage_path
     
     def plan_adaptive_coverage(self, battery_limit=None, end_point=None):
+        full_path = []
+        for segment in self.iter_adaptive_coverage(battery_limit, end_point):
+            full_path.extend(segment)
+        return full_path
+
+    def iter_adaptive_coverage(self, battery_limit=None, end_point=None):
+        """
+        Streaming form of plan_adaptive_coverage: yields each path segment
+        (moves only, without the cell it starts from) as soon as its target
+        is chosen. Planning follows a cursor from the drone's position with
+        the battery it will have left, and stops once the battery limit is
+        reached, so segments that would never be flown are never computed.
+        """
         if battery_limit is None:
             battery_limit = self.drone.battery_capacity * 0.2 
 
-        full_path = []
-        unvisited = self.get_unvisited_safe_cells()
-
-        while unvisited and self.drone.battery > battery_limit:
+        with profiling.phase('adaptive.setup'):
+            unvisited = self.get_unvisited_safe_cells()
+        position = self.drone.position
+        battery = self.drone.battery
+        moving_cost = self.drone.moving_cost
+        estimate = heuristic(self.grid)
+        if end_point and self.grid.cost is not None:
+            # Weighted cells make straight-line estimates of the way back
+            # meaningless: look up the exact energy instead
+            to_end = cost_field(self.grid, end_point)
+            estimate = lambda posture, _: max(to_end[posture[0]][posture[1]], 0)
+
+        while unvisited and battery > battery_limit:
+            profiling.count('adaptive.iterations')
             # If we have an endpoint, reserve battery to reach it
             if end_point:
-                from a_star import distance, a_star_search
                 # Calculate distance to endpoint
-                dist_to_end = distance(self.drone.position, end_point)
+                dist_to_end = estimate(position, end_point)
                 # Reserve battery with safety margin
                 reserve = dist_to_end * 1.5
                 
                 # If we're running low on battery, navigate to endpoint
-                if self.drone.battery < reserve + battery_limit + 10:
-                    path_to_end = a_star_search(self.grid, self.drone.position, end_point)
-                    if path_to_end and len(path_to_end) > 1:
-                        full_path.extend(path_to_end[1:])
+                if battery < reserve + battery_limit + 10:
                     break
             
-            target_posture, path = find_the_nearest_unvisited(self.grid, self.drone, unvisited)
+            with profiling.phase('adaptive.pick'):
+                target_posture, path = find_the_nearest_unvisited(self.grid, self.drone, unvisited,
+                                                                  position=position)
 
             if path is None:
                 break
 
-            path_cost = len(path) - 1 
+            cost = path_cost(path, self.grid) * moving_cost
             
             # Check if we have enough battery (including endpoint reserve if applicable)
             effective_limit = battery_limit
             if end_point:
-                from a_star import distance
-                dist_to_end = distance(self.drone.position, end_point)
+                dist_to_end = estimate(path[-1], end_point)
                 effective_limit = battery_limit + dist_to_end * 1.5
             
-            if self.drone.battery < path_cost + effective_limit:
+            if battery < cost + effective_limit:
                 break 
 
-            full_path.extend(path[1:])
-
             for posture in path:
-                if posture in unvisited:
-                    unvisited.remove(posture)
+                unvisited.discard(posture)
 
-        return full_path
+            position = path[-1]
+            battery -= cost
+            yield path[1:]
+
+        # Finish the mission at the endpoint
+        if end_point and position != end_point:
+            with profiling.phase('adaptive.to_end'):
+                path_to_end = a_star_search(self.grid, position, end_point)
+            if path_to_end and len(path_to_end) > 1:
+                yield path_to_end[1:]
 
 
     def plan_greedy_coverage(self, look_ahead=5):
-        unvisited = self.get_unvisited_safe_cells()
         path = []
+        for segment in self.iter_greedy_coverage(look_ahead):
+            path.extend(segment)
+        return path
 
-        while unvisited and self.drone.can_move():
-            best_cell = None
-            best_score = -1
-            best_path = None
+    def iter_greedy_coverage(self, look_ahead=5):
+        """
+        Streaming form of plan_greedy_coverage (see iter_adaptive_coverage)
+
+        Each unvisited cell within look_ahead (Manhattan) scores its number
+        of unvisited neighbors minus a tenth of the energy to reach it. The
+        neighbor counts of every cell are one convolution of the unvisited
+        mask, patched as cells are consumed, and the energies come from a
+        single flood bounded to the look-ahead diamond, so a step costs one
+        local search plus an argmax.
+        """
+        with profiling.phase('greedy.setup'):
+            unvisited = self.grid.reachable_mask(self.drone.position).copy()
+            unvisited[self.drone.position] = False
+            for posture in self.drone.visited:
+                unvisited[posture] = False
+            counts = self._neighbor_counts(unvisited)
+        position = self.drone.position
+        battery = self.drone.battery
+        moving_cost = self.drone.moving_cost
+
+        while unvisited.any() and battery >= moving_cost:
+            profiling.count('greedy.iterations')
+            with profiling.phase('greedy.score'):
+                energy, parents = self._local_flood(position, look_ahead)
+                best_cell = None
+                best_score = None
+                for cell, cell_energy in energy.items():
+                    if unvisited[cell]:
+                        score = counts[cell] - cell_energy * 0.1
+                        if best_score is None or score > best_score:
+                            best_score = score
+                            best_cell = cell
+
+            if best_cell is None:
+                break
 
-            current_pos = self.drone.position 
-            candidates = [cell for cell in unvisited
-                          if abs(cell[0] - current_pos[0]) + abs(cell[1] - current_pos[1]) <= look_ahead]
-            
-            for cell in candidates[:20]: 
-                cell_path = a_star_search(self.grid, self.drone.position, cell)
-                if not cell_path:
-                    continue
+            best_path = [best_cell]
+            while best_path[-1] != position:
+                best_path.append(parents[best_path[-1]])
+            best_path.reverse()
 
-                score = sum(1 for surrounding in self.grid.surroundings(cell)
-                            if surrounding in unvisited)
-                
-                score = score - len(cell_path) * 0.1
+            cost = energy[best_cell] * moving_cost
+            if cost > battery:
+                break
 
-                if score > best_score:
-                    best_score = score
-                    best_cell = cell
-                    best_path = cell_path
+            for posture in best_path:
+                if unvisited[posture]:
+                    unvisited[posture] = False
+                    for surrounding in self.grid.surroundings(posture):
+                        counts[surrounding] -= 1
+
+            position = best_cell
+            battery -= cost
+            yield best_path[1:]
+
+    def _neighbor_counts(self, mask):
+        """Number of each cell's surroundings set in mask, for all cells at once"""
+        from footprint import shifted
+
+        valid = (self.grid.grid != 1) & (self.grid.grid != 2)
+        offsets = ORTHOGONAL + DIAGONAL if self.grid.connectivity == 8 else ORTHOGONAL
+        counts = np.zeros(mask.shape, dtype=np.int32)
+        for hori, verti in offsets:
+            allowed = shifted(valid, hori, verti)
+            if hori and verti:
+                # Same corner-cutting rule as Grid.surroundings
+                allowed &= shifted(valid, hori, 0) & shifted(valid, 0, verti)
+            counts += shifted(mask, hori, verti) & allowed
+        return counts
+
+    def _local_flood(self, position, radius):
+        """
+        Energy (and parent pointers) from position to every cell reachable
+        without leaving the Manhattan diamond of the given radius
+        """
+        energy = {position: 0}
+        parents = {}
+        heap = [(0, position)]
+        while heap:
+            current_energy, current = heapq.heappop(heap)
+            if current_energy > energy[current]:
+                continue
+            for nextpos, move_cost in self.grid.moves(current):
+                if abs(nextpos[0] - position[0]) + abs(nextpos[1] - position[1]) > radius:
+                    continue
+                new_energy = current_energy + move_cost
+                if nextpos not in energy or new_energy < energy[nextpos]:
+                    energy[nextpos] = new_energy
+                    parents[nextpos] = current
+                    heapq.heappush(heap, (new_energy, nextpos))
+        return energy, parents
+
+    def plan_viewpoint_coverage(self, sensor, battery_limit=None):
+        path = []
+        for segment in self.iter_viewpoint_coverage(sensor, battery_limit):
+            path.extend(segment)
+        return path
 
-            if best_path is None:
+    def iter_viewpoint_coverage(self, sensor, battery_limit=None):
+        """
+        Streaming coverage for a drone that observes a footprint instead of
+        a single cell: fly to the viewpoint with the most unseen cells per
+        unit of energy (flood_field, so diagonal moves and the cost layer
+        count), marking everything the sensor sees along the way
+
+        Parameters:
+            sensor: footprint.SensorFootprint of the drone's camera
+            battery_limit: Battery left untouched (default 20% of capacity)
+        """
+        if battery_limit is None:
+            battery_limit = self.drone.battery_capacity * 0.2
+
+        with profiling.phase('viewpoint.setup'):
+            # Cells that count towards coverage: the area reachable from the
+            # start; the sensor may see more, but only these are scored
+            targets = self.grid.reachable_mask(self.drone.position)
+            seen = sensor.observed([self.drone.position])
+        position = self.drone.position
+        battery = self.drone.battery
+        moving_cost = self.drone.moving_cost
+
+        while battery > battery_limit:
+            profiling.count('viewpoint.iterations')
+            with profiling.phase('viewpoint.score'):
+                gain = sensor.gain_map(targets & ~seen)
+                steps = flood_field(self.grid, [position])
+                score = np.where((steps > 0) & (gain > 0), gain / np.maximum(steps, 1), 0.0)
+                best = np.unravel_index(int(np.argmax(score)), score.shape)
+            if score[best] <= 0:
                 break
 
-            path.extend(best_path[1:])  
-           
-            for posture in best_path:
-                if posture in unvisited:
-                    unvisited.remove(posture)
+            with profiling.phase('viewpoint.route'):
+                path = a_star_search(self.grid, position, (int(best[0]), int(best[1])))
+            if not path:
+                break
 
+            cost = path_cost(path, self.grid) * moving_cost
+            if battery < cost + battery_limit:
+                break
+
+            sensor.observe(seen, path)
+            position = path[-1]
+            battery -= cost
+            yield path[1:]
+
+    def plan_optimized_coverage(self, waypoints=None, time_budget=1.0, max_waypoints=200):
+        """
+        Visit waypoints in an order improved by route_optimizer instead of
+        greedy nearest-first. By default the waypoints are the unvisited
+        cells; since the distance matrix costs one flood per waypoint, when
+        there are more than max_waypoints they are grouped into square
+        blocks and one cell per block stands in for it. The blocks are
+        ordered on those cells and each is then swept cell by cell, so no
+        cell is dropped. time_budget covers building the matrix as well as
+        improving the order.
+
+        Returns:
+            dict: optimize_route report, with 'path' (the moves from the
+                  drone's position, start excluded, like the other planners),
+                  'length' and 'greedy_length' (path_cost of the swept
+                  routes), 'saved', 'waypoints' (number of blocks, or of
+                  the waypoints given) and 'coverage' (percent of the
+                  waypoint cells the path visits)
+        """
+        from distance_oracle import DistanceOracle
+        from route_optimizer import optimize_route
+
+        if waypoints is None:
+            clusters = self._waypoint_clusters(self.get_unvisited_safe_cells(), max_waypoints)
+        else:
+            clusters = {tuple(p): [tuple(p)] for p in waypoints}
+        oracle = DistanceOracle(self.grid)
+
+        with profiling.phase('optimized.route'):
+            report = optimize_route(self.grid, self.drone.position, list(clusters),
+                                    time_budget=time_budget, oracle=oracle)
+        with profiling.phase('optimized.sweep'):
+            path = self._sweep_clusters(report['order'], clusters, oracle)
+            greedy = self._sweep_clusters(report['greedy_order'], clusters, oracle)
+
+        targets = {cell for members in clusters.values() for cell in members}
+        report['length'] = path_cost(path, self.grid)
+        report['greedy_length'] = path_cost(greedy, self.grid)
+        report['saved'] = report['greedy_length'] - report['length']
+        report['waypoints'] = len(clusters)
+        report['coverage'] = 100.0 * len(targets.intersection(path)) / len(targets) if targets else 100.0
+        report['path'] = path[1:]
+        return report
+
+    def _waypoint_clusters(self, cells, max_waypoints):
+        """
+        Group cells into at most max_waypoints square blocks (single cells
+        when there are few enough)
+
+        Returns:
+            dict: Block's cell nearest its centre -> the block's cells in
+                  serpentine (boustrophedon) order
+        """
+        side = max(1, int((len(cells) / max(1, max_waypoints)) ** 0.5))
+        while True:
+            blocks = {}
+            for cell in cells:
+                blocks.setdefault((cell[0] // side, cell[1] // side), []).append(cell)
+            if len(blocks) <= max_waypoints:
+                break
+            side += 1
+
+        clusters = {}
+        for (block_row, block_col), members in sorted(blocks.items()):
+            centre = (block_row * side + (side - 1) / 2, block_col * side + (side - 1) / 2)
+            representative = min(members, key=lambda c: (abs(c[0] - centre[0]) + abs(c[1] - centre[1]), c))
+            members.sort(key=lambda c: (c[0], c[1] if c[0] % 2 == 0 else -c[1]))
+            clusters[representative] = members
+        return clusters
+
+    def _sweep_clusters(self, order, clusters, oracle):
+        """Cell-by-cell path from the drone through every cell of each cluster, clusters in order"""
+        path = [tuple(self.drone.position)]
+        covered = {path[0]}
+        for representative in order:
+            for cell in clusters[representative]:
+                if cell in covered:
+                    continue
+                here = path[-1]
+                leg = [here, cell] if cell in self.grid.surroundings(here) else oracle.path(here, cell)
+                if leg is None:
+                    continue
+                path.extend(leg[1:])
+                covered.update(leg)
         return path
+
+    def plan_sortie_coverage(self, home=None, battery_limit=None):
+        """
+        Full coverage split into sorties that each start and end at the
+        home (charging) cell on a full battery. Each sortie visits the
+        nearest unvisited cell next (by energy, from one flood that stops
+        at that cell and never goes past what the battery could pay for)
+        for as long as the battery left after reaching it still covers
+        the exact flight home (a lookup in the cached cost_field) plus
+        battery_limit; then it turns around. Cells no sortie can reach and
+        return from are skipped. execute_sorties() flies the result.
+
+        Parameters:
+            home: Charging cell (default the drone's start position)
+            battery_limit: Battery never used on any sortie (default 20% of capacity)
+
+        Returns:
+            dict: 'sorties' (one path per sortie, home to home), 'sortie_count',
+                  'energy' (total, in battery units), 'coverage' (percent of
+                  the area reachable from home), 'out_of_range' (cells skipped)
+                  and 'path' (all sorties joined, home excluded at the start)
+        """
+        from a_star import path_along_cost_field
+
+        home = tuple(self.drone.startposition if home is None else home)
+        if battery_limit is None:
+            battery_limit = self.drone.battery_capacity * 0.2
+        moving_cost = self.drone.moving_cost
+        capacity = self.drone.battery_capacity
+
+        with profiling.phase('sorties.setup'):
+            to_home = cost_field(self.grid, home)
+            reachable = self.grid.reachable_mask(home)
+            unvisited = set(zip(*(index.tolist() for index in np.nonzero(reachable))))
+            unvisited.discard(home)
+            total = len(unvisited) + 1
+
+        sorties = []
+        energy = 0.0
+        out_of_range = 0
+        while unvisited:
+            profiling.count('sorties.count')
+            sortie = [home]
+            position = home
+            battery = capacity
+
+            while unvisited:
+                picked = None
+                with profiling.phase('sorties.pick'):
+                    budget = (battery - battery_limit) / moving_cost
+                    for target, parents, target_energy in self._unvisited_by_energy(position, unvisited, budget):
+                        cost = target_energy * moving_cost
+                        if battery - cost - to_home[target] * moving_cost >= battery_limit:
+                            picked = target
+                            break
+                        if position != home:
+                            break
+                        # Not even a fresh battery gets there and back
+                        unvisited.discard(target)
+                        out_of_range += 1
+                if picked is None:
+                    if position == home:
+                        # Everything left is beyond what a full battery can pay for
+                        out_of_range += len(unvisited)
+                        unvisited.clear()
+                    break
+
+                path = [picked]
+                while path[-1] != position:
+                    path.append(parents[path[-1]])
+                path.reverse()
+                for posture in path:
+                    unvisited.discard(posture)
+                sortie.extend(path[1:])
+                position = picked
+                battery -= cost
+
+            if position == home:
+                continue
+
+            # Fly home, covering whatever lies on the way
+            way_home = path_along_cost_field(self.grid, to_home, position)
+            for posture in way_home:
+                unvisited.discard(posture)
+            sortie.extend(way_home[1:])
+            energy += capacity - battery + path_cost(way_home, self.grid) * moving_cost
+            sorties.append(sortie)
+
+        covered = set()
+        for sortie in sorties:
+            covered.update(sortie)
+        return {
+            'sorties': sorties,
+            'sortie_count': len(sorties),
+            'energy': energy,
+            'coverage': len(covered | {home}) / total * 100,
+            'out_of_range': out_of_range,
+            'path': [posture for sortie in sorties for posture in sortie[1:]]
+        }
+
+    def _unvisited_by_energy(self, position, unvisited, max_energy):
+        """
+        Dijkstra over grid.moves from position, yielding (cell, parents,
+        energy) for each cell in unvisited in order of energy; it goes no
+        further than the caller consumes, nor past max_energy
+        """
+        energy = {position: 0}
+        parents = {}
+        heap = [(0, position)]
+        while heap:
+            current_energy, current = heapq.heappop(heap)
+            if current_energy > energy[current]:
+                continue
+            if current in unvisited:
+                yield current, parents, current_energy
+            for nextpos, move_cost in self.grid.moves(current):
+                new_energy = current_energy + move_cost
+                if new_energy <= max_energy and (nextpos not in energy or new_energy < energy[nextpos]):
+                    energy[nextpos] = new_energy
+                    parents[nextpos] = current
+                    heapq.heappush(heap, (new_energy, nextpos))
+
+    def execute_sorties(self, sorties):
+        """
+        Fly plan_sortie_coverage()'s sorties (home to home), recharging the
+        drone on the home cell before each one. Stops when a move fails.
+
+        Returns:
+            list: Positions actually flown, in order
+        """
+        flown = []
+        for sortie in sorties:
+            self.drone.recharge()
+            for posture in sortie[1:]:
+                if not self.drone.move(posture):
+                    return flown
+                flown.append(posture)
+        return flown
+
+    def execute(self, segments):
+        """
+        Fly the drone along streamed segments as they arrive (headless
+        runner). Stops when the drone runs out of battery.
+
+        Returns:
+            list: Positions actually flown, in order
+        """
+        flown = []
+        for segment in segments:
+            for posture in segment:
+                if not self.drone.move(posture):
+                    return flown
+                flown.append(posture)
+        return flown
     
-    def estimate_coverage_percent(self, path):
-        visited = set(path)
-        total_safe = int(np.sum(self.grid.grid == 0))
+    def estimate_coverage_percent(self, path, sensor=None):
+        """
+        Coverage of the area reachable from the start, not of every safe cell
+
+        With a sensor (footprint.SensorFootprint), counts the reachable cells
+        observed from the start and along path instead of those entered
+        """
+        total_safe = self.reachable_cell_count()
 
         if total_safe == 0:
             return 0.0
-        
+
+        if sensor is not None:
+            reachable = self.grid.reachable_mask(self.drone.startposition)
+            seen = sensor.observed([self.drone.startposition] + list(path))
+            return float(np.sum(seen & reachable)) / total_safe * 100
+
+        visited = set(path)
         return (len(visited) / total_safe) * 100
     
 
@@ -154,4 +548,11 @@ if __name__ == "__main__":
     print(f"Battery needed: {len(path)} units")
 
     total_safe = int(np.sum(grid.grid == 0))
-    print(f"\nGrid stats: {total_safe} safe cells")
\ No newline at end of file
+    print(f"\nGrid stats: {total_safe} safe cells")
+
+    print("\nTesting multi-sortie coverage on a 40x40 grid....")
+    grid = Grid(size=40, obstacle_prob=0.12, no_fly_zone=0.06, seedling=42)
+    grid.setstartposition((0, 0))
+    report = CoveragePlanner(grid, Drone(startposition=(0, 0), battery_capacity=400)).plan_sortie_coverage()
+    print(f"[OK] {report['sortie_count']} sorties, {report['energy']:.0f} battery units, "
+          f"{report['coverage']:.1f}% covered")
\ No newline at end of file
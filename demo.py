@@ -7,6 +7,7 @@ from grid import Grid
 from drone import Drone
 from coverage import CoveragePlanner
 from visualize import Dashboard
+from planning_thread import PlanningThread, next_segment
 
 
 class LiveDemo:
@@ -15,7 +16,8 @@ class LiveDemo:
     It shows the drone moving through the grid in real-time
     """
     
-    def __init__(self, grid_size=20, seed=None, interactive=True):
+    def __init__(self, grid_size=20, seed=None, interactive=True, clearance_weight=0, horizon=None,
+                 log_path=None, background=True, handoff_lead=3, connectivity=4, route_budget=None):
         """
         Initialize the live demo
         
@@ -23,6 +25,18 @@ class LiveDemo:
             grid_size: Size of the grid (creates grid_size x grid_size grid)
             seed: Random seed for reproducible results
             interactive: If True, enable interactive controls for destination/obstacles
+            clearance_weight: Extra A* cost for flying next to obstacles when
+                              routing to the destination, detours and home (0 = shortest path)
+            horizon: Window half-width for receding-horizon coverage (None = plan
+                     the whole mission with the adaptive planner)
+            log_path: Write a mission event log (JSONL) here for later replay
+            background: Plan on a worker thread so the animation never waits
+                        (False plans inline, e.g. for headless runs)
+            handoff_lead: Steps the drone keeps flying its current path while
+                          a detour or route home is being planned
+            connectivity: 4 or 8 (diagonal moves allowed) for every planner
+            route_budget: Seconds an anytime search may spend on each
+                          destination, detour or route home (None = exact search)
         """
         # Calculate battery to cover entire grid with safety margin
         battery = grid_size * grid_size * 2
@@ -32,24 +46,44 @@ class LiveDemo:
             size=grid_size,
             obstacle_prob=0.12,  # 12% chance of obstacles
             no_fly_zone=0.06,    # 6% chance of no-fly zones
-            seedling=seed
+            seedling=seed,
+            connectivity=connectivity
         )
         
         # Make sure starting position is clear
         self.grid.setstartposition((0, 0))
         
         # Create the drone
-        self.drone = Drone(startposition=(0, 0), battery_capacity=battery)
+        self.drone = Drone(startposition=(0, 0), battery_capacity=battery, grid_size=grid_size,
+                           terrain=self.grid)
         
         # Create the coverage planner
         self.planner = CoveragePlanner(self.grid, self.drone)
         
         # Interactive mode settings
         self.interactive = interactive
+        self.clearance_weight = clearance_weight
+        self.route_budget = route_budget
+        self.horizon = horizon
+        self.log_path = log_path
+        self.log = None  # mission_log.MissionLog while a logged mission runs
         self.destination = None
         self.optimal_path = None
         self.full_path = None
+        self.path_stream = None  # Coverage segments still being planned
+        self.segment_version = None  # Grid version the pending segment is planned on
+        self.route_version = None    # Same for the route to the destination
+        self.schedule = None     # Optional dynamic.OccupancySchedule (moving obstacles)
+        self.skipped_cells = []  # Coverage cells a scheduled-conflict detour flew past
         self.is_started = False
+
+        # Background planning: coverage segments are requested `prefetch`
+        # steps before the drone needs them, and a detour / route home
+        # replaces full_path[splice['index']:] once it arrives
+        self.planning = PlanningThread(threaded=background)
+        self.handoff_lead = handoff_lead
+        self.prefetch = 10
+        self.splice = None
         
         # Track which step we're on
         self.current_step = 0
@@ -68,23 +102,201 @@ class LiveDemo:
         """Generate the coverage path based on current settings"""
         # Use dashboard destination as the source of truth
         destination = self.dashboard.destination
-        
-        # Generate the full coverage path with optional destination
+
+        if self.log_path:
+            from mission_log import MissionLog
+            if self.log is not None:
+                self.log.close()
+            self.log = MissionLog(self.log_path)
+            self.log.start(self.grid, self.drone, destination=destination,
+                           clearance_weight=self.clearance_weight)
+        
+        # Stream the coverage path with optional destination: the first
+        # segment is planned now, the rest while the drone is flying.
         # Keep 20 units of battery as reserve
-        self.full_path = self.planner.plan_adaptive_coverage(
-            battery_limit=20, 
-            end_point=destination
-        )
+        if self.horizon:
+            from horizon import RecedingHorizonPlanner
+            self.path_stream = RecedingHorizonPlanner(
+                self.grid, self.drone, window=self.horizon
+            ).iter_coverage(battery_limit=20, end_point=destination)
+        else:
+            self.path_stream = self.planner.iter_adaptive_coverage(
+                battery_limit=20, 
+                end_point=destination
+            )
+        self.full_path = []
+        self.skipped_cells = []
+        self.splice = None
+        self.current_step = 0
+        self.planning.cancel('splice')
+        self.request_segment()
         
         # If destination is set, calculate optimal path for visualization
         if destination:
-            from a_star import a_star_search
-            self.optimal_path = a_star_search(self.grid, (0, 0), destination)
-            self.dashboard.optimal_path = self.optimal_path
+            self.request_route(destination)
         
-        self.current_step = 0
         self.visual_pos = self.drone.position # Reset visual pos
     
+    def find_route(self, start, goal, start_time=None):
+        """
+        Point-to-point route for long transits (destination, detours, home).
+        Plain shortest paths use bidirectional A*; a clearance weight needs
+        the weighted single-direction search, and a schedule of moving
+        obstacles needs the space-time search (starting at start_time,
+        default the current step). With a route budget, the anytime search
+        returns the best route found within it.
+        """
+        from a_star import a_star_search, anytime_search, bidirectional_search
+
+        if self.schedule is not None:
+            from dynamic import space_time_a_star
+            return space_time_a_star(self.grid, self.schedule, start, goal,
+                                     start_time=self.current_step if start_time is None else start_time)
+        if self.clearance_weight > 0:
+            return a_star_search(self.grid, start, goal,
+                                 clearance_weight=self.clearance_weight)
+        if self.route_budget is not None:
+            return anytime_search(self.grid, start, goal, time_budget=self.route_budget)[0]
+        return bidirectional_search(self.grid, start, goal)
+
+    def request_segment(self):
+        """Ask the planning thread for the next coverage segment (once at a time)"""
+        if self.path_stream is not None and not self.planning.pending('segment'):
+            self.segment_version = self.grid.version
+            self.planning.submit('segment', next_segment, self.path_stream)
+
+    def request_route(self, destination):
+        """Plan the route to the destination shown on the dashboard"""
+        self.route_version = self.grid.version
+        self.planning.submit('route', self.find_route, (0, 0), destination)
+
+    def accept_segment(self, segment):
+        """
+        Append a coverage segment to full_path. One planned before the map
+        last changed is checked against the current grid first: cells that
+        have become blocked are dropped, and if that (or an earlier drop)
+        breaks the chain of moves, the segment is replaced by a route to
+        its last cell that is still safe.
+        """
+        if self.grid.version != self.segment_version:
+            kept = [cell for cell in segment if self.grid.isvalid(cell)]
+            if len(kept) < len(segment):
+                print(f"[REPLAN] Segment planned on an old map crosses {len(segment) - len(kept)} "
+                      "blocked cell(s), rerouting")
+            segment = kept
+
+        anchor = self.full_path[-1] if self.full_path else self.drone.position
+        previous = anchor
+        for cell in segment:
+            if cell not in self.grid.surroundings(previous):
+                route = self.find_route(anchor, segment[-1], start_time=len(self.full_path))
+                segment = route[1:] if route else []
+                break
+            previous = cell
+        self.full_path.extend(segment)
+
+    def plan_splice(self, kind, index, goal, rejoin=None, retry=None, **log_data):
+        """
+        Replace full_path[index:] with a route to goal, planned in the background
+
+        The route starts where the drone will be when it reaches index, so
+        it keeps flying the current path until then (and hovers there if
+        the route is late). The original path resumes after full_path[rejoin]
+        (None drops it).
+
+        Parameters:
+            kind: 'replan' or 'emergency' (the mission log event)
+            retry: Called instead of applying a route planned on a grid that
+                   has changed since
+        """
+        index = min(index, len(self.full_path))
+        anchor = self.drone.position if index <= self.current_step else self.full_path[index - 1]
+        self.splice = {'kind': kind, 'index': index, 'rejoin': rejoin, 'retry': retry,
+                       'version': self.grid.version, 'from': anchor, 'to': goal, 'log': log_data}
+        self.planning.submit('splice', self.find_route, anchor, goal, index)
+
+    def collect_plans(self):
+        """Hand finished background plans to the flight loop (never blocks)"""
+        result = self.planning.poll('segment')
+        if result is not None:
+            segment, error = result
+            if error is not None:
+                print(f"[ERROR] Coverage planning failed: {error}")
+            if segment is None:
+                self.path_stream = None
+                if not self.full_path:
+                    print("[ERROR] Could not generate a valid path!")
+                elif self.skipped_cells and not self.dashboard.destination:
+                    # Coverage is planned out: go back for cells detours flew past,
+                    # keeping the same 20 unit reserve
+                    from a_star import path_cost
+                    ahead = [self.drone.position] + self.full_path[self.current_step:]
+                    battery = self.drone.battery - path_cost(ahead, self.grid) * self.drone.moving_cost - 20
+                    self.path_stream = self.iter_skipped_cells(self.full_path[-1], set(self.full_path),
+                                                               len(self.full_path), self.skipped_cells, battery)
+                    self.skipped_cells = []
+                    self.request_segment()
+            else:
+                self.accept_segment(segment)
+
+        result = self.planning.poll('route')
+        if result is not None:
+            if self.grid.version != self.route_version and self.dashboard.destination:
+                # Planned on a map that has changed since: plan it again
+                self.request_route(self.dashboard.destination)
+            else:
+                self.optimal_path = self.dashboard.optimal_path = result[0]
+
+        result = self.planning.poll('splice')
+        if result is not None and self.splice is not None:
+            self.apply_splice(*result)
+
+    def apply_splice(self, route, error):
+        splice, self.splice = self.splice, None
+        if error is not None:
+            print(f"[REPLAN] FAIL: {error}")
+            return
+        if self.grid.version != splice['version'] and splice['retry'] is not None:
+            # The map changed while planning: plan again on the current one
+            splice['retry']()
+            return
+
+        if self.log is not None:
+            self.log.record(splice['kind'], self.current_step, **splice['log'],
+                            **{'from': splice['from'], 'to': splice['to'], 'path': route})
+
+        if not route:
+            if splice['kind'] == 'emergency':
+                print("[CRITICAL] Cannot find path home! Drone stranded.")
+            else:
+                print("[REPLAN] FAIL: No path to rejoin found.")
+            return
+
+        index, rejoin = splice['index'], splice['rejoin']
+        remaining_original = self.full_path[rejoin + 1:] if rejoin is not None else []
+        self.full_path[index:] = route[1:] + remaining_original
+        if splice['kind'] == 'emergency':
+            print(f"[SAFETY] Emergency path calculated: {len(route)} steps to home.")
+        else:
+            print(f"[REPLAN] Detour found! Length: {len(route)}. Path updated successfully.")
+
+        # Obstacles that landed while this splice was pending still lie ahead
+        self.check_path_ahead()
+
+    def check_path_ahead(self):
+        """Start a detour around the first blocked cell left on full_path"""
+        for cell in self.full_path[self.current_step:]:
+            if not self.grid.isvalid(cell):
+                print(f"[REPLAN] {cell} ahead is blocked, replanning")
+                self.trigger_replanning(cell)
+                return
+
+    def mission_complete(self):
+        """True once every planned step has been flown and planning is done"""
+        return (self.full_path is not None and self.path_stream is None
+                and self.splice is None and not self.planning.pending('segment')
+                and self.current_step >= len(self.full_path))
+
     def step(self):
         """
         Execute one step of the simulation
@@ -93,8 +305,27 @@ class LiveDemo:
         Returns:
             True if step was successful, False if path is complete
         """
+        # Take finished plans, and ask for the next segment shortly before
+        # the drone needs it
+        self.collect_plans()
+        if len(self.full_path) - self.current_step <= self.prefetch:
+            self.request_segment()
+
+        # Hover at the handoff point until the detour arrives
+        if self.splice is not None and self.current_step >= self.splice['index']:
+            return False
+
         # Check if there are more steps to execute
         if self.current_step < len(self.full_path):
+            if self.schedule is not None:
+                self.schedule.apply(self.current_step)
+                self.dashboard.occupancy = self.schedule.layer
+                # Next cell will be occupied when we get there: route around it in time
+                if not self.schedule.is_free(self.full_path[self.current_step], self.current_step + 1):
+                    self.avoid_scheduled_conflict()
+                if self.current_step >= len(self.full_path):
+                    return False
+
             # Get the next position from the path
             next_pos = self.full_path[self.current_step]
             
@@ -106,6 +337,8 @@ class LiveDemo:
 
             # Move the drone
             if self.drone.move(next_pos):
+                if self.log is not None:
+                    self.log.record('move', self.current_step, p=next_pos)
                 self.current_step += 1
                 return True
             else:
@@ -123,6 +356,7 @@ class LiveDemo:
         # Only update if not paused and simulation is started (for interactive mode)
         if not self.paused and (not self.interactive or self.is_started):
             # Only execute if we have a path
+            self.collect_plans()
             if self.full_path:
                 
                 if self.smooth_animation:
@@ -167,9 +401,13 @@ class LiveDemo:
         self.dashboard.update()
         
         # Check if mission is complete (only if we have a path)
-        if self.full_path and self.current_step >= len(self.full_path):
+        if self.full_path and self.mission_complete():
             # Get final drone status
             status = self.drone.get_status()
+
+            if self.log is not None and not self.log.closed:
+                self.log.record('end', self.current_step, **status)
+                self.log.close()
             
             # Calculate final coverage percentage
             total_safe = 0
@@ -208,8 +446,75 @@ class LiveDemo:
             self.dashboard.draw_optimal_path()
     
     
+    def avoid_scheduled_conflict(self, max_attempts=4):
+        """
+        Splice a space-time detour into full_path around a predicted
+        conflict with the schedule, rejoining at a later cell that is not
+        permanently blocked (hovering counts as a step). This runs inline
+        in step(), so at most max_attempts searches are made, rejoining
+        1, 2, 4, ... cells ahead, before the rest of the plan is dropped.
+        Cells a detour flies past are queued in skipped_cells and revisited
+        once coverage planning is done.
+        """
+        from dynamic import space_time_a_star
+
+        t = self.current_step
+        candidates = [rejoin for rejoin in range(t, len(self.full_path))
+                      if self.schedule.static_value(self.full_path[rejoin]) == 0
+                      and self.schedule.reachable(self.drone.position, self.full_path[rejoin])]
+        attempts, ahead = [], 1
+        while len(attempts) < max_attempts and ahead <= len(candidates):
+            attempts.append(candidates[ahead - 1])
+            ahead *= 2
+        if candidates and candidates[-1] not in attempts and len(attempts) < max_attempts:
+            attempts.append(candidates[-1])
+
+        for rejoin in attempts:
+            detour = space_time_a_star(self.grid, self.schedule, self.drone.position, self.full_path[rejoin],
+                                       start_time=t, max_time=t + 4 * self.grid.size)
+            if detour:
+                # Cells the detour flies past go back on the coverage queue
+                self.skipped_cells.extend(cell for cell in self.full_path[t:rejoin]
+                                          if cell not in detour and cell not in self.drone.visited)
+                self.full_path[t:rejoin + 1] = detour[1:]
+                return
+
+        # Nothing ahead can be reached: drop the rest of the plan
+        print("[DYNAMIC] No conflict-free route ahead, stopping.")
+        del self.full_path[t:]
+        self.path_stream = None
+
+    def iter_skipped_cells(self, position, planned, start_time, cells, battery):
+        """
+        Coverage stream that revisits cells (nearest first) from position,
+        where the drone will be at start_time, skipping any in planned
+        (already on the path). Stops before a route would cost more than
+        battery.
+        """
+        from a_star import distance, path_cost
+
+        pending = list(dict.fromkeys(cells))
+        while pending:
+            cell = min(pending, key=lambda c: distance(position, c))
+            pending.remove(cell)
+            if cell in planned or not self.grid.isvalid(cell):
+                continue
+            route = self.find_route(position, cell, start_time=start_time)
+            if not route:
+                continue
+            battery -= path_cost(route, self.grid) * self.drone.moving_cost
+            if battery < 0:
+                return
+            planned.update(route)
+            start_time += len(route) - 1
+            position = cell
+            yield route[1:]
+
     def handle_obstacle_update(self, pos):
         """Called when an obstacle is added/removed"""
+        if self.log is not None:
+            self.log.record('toggle', self.current_step, p=pos, v=self.grid.grid[pos[0]][pos[1]])
+
         if not self.is_started or not self.full_path:
             return
 
@@ -224,9 +529,16 @@ class LiveDemo:
     def trigger_replanning(self, blocked_pos):
         """
         Dynamically repair the path when blocked
-        Uses A* to find a local detour to a future point on the path
+        Plans an A* detour to a future point on the path in the background;
+        the drone flies on until the handoff point meanwhile. While another
+        splice is pending this waits for it: apply_splice() re-checks the
+        path it produces.
         """
-        # Show replanning indicator
+        if self.splice is not None:
+            print(f"[REPLAN] {blocked_pos} queued behind the pending {self.splice['kind']}")
+            return
+
+        # Show replanning indicator (drawn with the next animation frame)
         self.dashboard.axe_grid.text(
             self.grid.size / 2, -2.0,
             "⚠️ REPLANNING LIVE...",
@@ -234,16 +546,6 @@ class LiveDemo:
             bbox=dict(facecolor='black', edgecolor='red', alpha=0.9),
             zorder=20
         )
-        self.dashboard.fig.canvas.draw()
-        
-        current_pos = self.drone.position
-        
-        # Find a reentry point on the path after the blockage
-        # Look ahead in the path to find a safe point to rejoin
-        reentry_index = -1
-        
-        # Start looking from a bit ahead to avoid just backtracking to the immediate next step if it's blocked
-        found_reentry = False
         
         # We need to find the index in full_path that corresponds to the blocked position
         # and look after that
@@ -253,116 +555,42 @@ class LiveDemo:
             return # Blocked pos not in path? weird.
             
         # Try to rejoin path after the blockage
+        reentry_index = -1
         for i in range(blockage_idx + 1, len(self.full_path)):
-            candidate_pos = self.full_path[i]
-            if self.grid.isvalid(candidate_pos):
+            if self.grid.isvalid(self.full_path[i]):
                 reentry_index = i
-                found_reentry = True
                 break
         
-        if found_reentry:
-            target_pos = self.full_path[reentry_index]
-            print(f"[REPLAN] Calculating detour: {current_pos} -> {target_pos}")
-            
-            # importing locally to avoid circular imports if any
-            from a_star import a_star_search
-            
-            # Find path to reentry point
-            detour = a_star_search(self.grid, current_pos, target_pos)
-            
-            if detour:
-                print(f"[REPLAN] Detour found! Length: {len(detour)}")
-                
-                # Construct new full path:
-                # [History up to now] + [Detour] + [Rest of original path]
-                
-                # We need to be careful with overlaps. 
-                # Current step is where we are. 
-                # full_path[0...current_step-1] is history.
-                # full_path[current_step] is where we were going (but we might be there or not).
-                
-                # Actually, simpler: 
-                # 1. Keep history unchanged? No, full_path is the PLANNED path.
-                # 2. We are at current_pos.
-                # 3. We want new path segments: [Detour moves] + [original path from reentry_index+1:]
-                
-                # Correct splicing:
-                # detour includes start and end. 
-                # We want moves AFTER start, up to and including end.
-                detour_moves = detour[1:] 
-                
-                remaining_original = self.full_path[reentry_index+1:]
-                
-                # New future path
-                new_future = detour_moves + remaining_original
-                
-                # Update full path
-                # We keep the past path for metrics distinct from the planned path?
-                # The 'step' function uses 'full_path' by index. 
-                # If we change full_path, we must reset index or adjust it.
-                
-                # Easiest way: 
-                # Update full_path to be: [path_already_traveled] + [new_future]
-                path_traveled = self.full_path[:self.current_step] 
-                # Note: path_traveled does not include current_pos if we haven't 'stepped' out of it yet?
-                # Actually, step() gets next_pos = full_path[current_step].
-                # If we just moved to current_pos, current_step points to the NEXT move.
-                # So full_path[:current_step] are the completed moves?
-                # Let's verify: 
-                # Initial: current_step = 0. Next=path[0].
-                # After move: current_step = 1.
-                # So path[:current_step] are the nodes we have supposedly visited/processed.
-                
-                # But wait, drone.position IS the current position.
-                # If we use `detour` starting from `drone.position`, then `detour[0]` == `drone.position`.
-                # We want the drone to move to `detour[1]`.
-                
-                self.full_path = path_traveled + new_future
-                
-                # current_step stays same, pointing to the next move (which is now detour[1] which is at path_traveled length index)
-                # Wait: path_traveled length is `current_step`.
-                # new full_path length = `current_step` + `len(new_future)`.
-                # Next move is `self.full_path[self.current_step]`.
-                # This matches `new_future[0]` which is `detour[1]`. Correct.
-                
-                print("[REPLAN] Path updated successfully.")
-            else:
-                print("[REPLAN] FAIL: No path to rejoin found.")
-        else:
-             print("[REPLAN] FAIL: No valid reentry point found (rest of path blocked?).")
-
-    
-
+        if reentry_index < 0:
+            print("[REPLAN] FAIL: No valid reentry point found (rest of path blocked?).")
+            return
 
+        # Keep flying towards the blockage while the detour is planned, but
+        # hand over no later than the cell before it
+        handoff = min(self.current_step + self.handoff_lead, blockage_idx)
+        target_pos = self.full_path[reentry_index]
+        print(f"[REPLAN] Calculating detour from step {handoff} -> {target_pos}")
+        self.plan_splice('replan', handoff, target_pos, rejoin=reentry_index,
+                         retry=lambda: self.trigger_replanning(blocked_pos), blocked=blocked_pos)
 
     def trigger_emergency_return(self):
         """Abort mission and return to start"""
-        from a_star import a_star_search
-        
-        current_pos = self.drone.position
         start_pos = (0, 0)
-        
-        # Plan path home
-        return_path = a_star_search(self.grid, current_pos, start_pos)
-        
-        if return_path:
-            # Join from the NEXT step
-            # current path index points to next move.
-            # return_path[0] is current_pos. return_path[1] is next move.
-            
-            self.full_path = self.full_path[:self.current_step] + return_path[1:]
-            print(f"[SAFETY] Emergency path calculated: {len(return_path)} steps to home.")
-            
-            # Show visual alert
-            self.dashboard.axe_grid.text(
-                self.grid.size / 2, -2.5,
-                "🚨 EMERGENCY RETURN",
-                ha='center', color='red', fontsize=12, fontweight='bold',
-                bbox=dict(facecolor='black', edgecolor='red', alpha=0.9),
-                zorder=20
-            )
-        else:
-            print("[CRITICAL] Cannot find path home! Drone stranded.")
+
+        # Going home replaces whatever coverage was still to be planned
+        self.path_stream = None
+        self.planning.cancel('segment')
+        self.plan_splice('emergency', self.current_step, start_pos,
+                         retry=self.trigger_emergency_return)
+
+        # Show visual alert
+        self.dashboard.axe_grid.text(
+            self.grid.size / 2, -2.5,
+            "🚨 EMERGENCY RETURN",
+            ha='center', color='red', fontsize=12, fontweight='bold',
+            bbox=dict(facecolor='black', edgecolor='red', alpha=0.9),
+            zorder=20
+        )
 
 
     def run_interactive(self, interval=50):
@@ -407,20 +635,14 @@ class LiveDemo:
                 if not self.is_started:
                     if self.dashboard.destination:
                         print(f"\n[STARTED] Simulation starting... Target: {self.dashboard.destination}")
+                        # Returns at once: the first segment arrives with a later frame
                         self.generate_path()
-                        if self.full_path:
-                            self.is_started = True
-                            print(f"[INFO] Path found: {len(self.full_path)} steps")
-                            
-                            # Calculate expected coverage
-                            estimated_coverage = self.planner.estimate_coverage_percent(self.full_path)
-                            print(f"[INFO] Expected Coverage: {estimated_coverage:.1f}%")
-                            
-                            # Register replanning callback
-                            self.dashboard.replanning_callback = self.handle_obstacle_update
-
-                        else:
-                            print("[ERROR] Could not generate a valid path!")
+                        self.is_started = True
+                        print("[INFO] Planning in the background (the drone starts "
+                              "with the first segment)")
+
+                        # Register replanning callback
+                        self.dashboard.replanning_callback = self.handle_obstacle_update
                     else:
                         print("\n[!] Please click on the grid to set a DESTINATION first.")
                         # Visual feedback on graph
@@ -438,7 +660,13 @@ class LiveDemo:
                 print("\n[RESET] Simulation reset.")
                 self.is_started = False
                 self.current_step = 0
+                self.path_stream = None
+                self.splice = None
+                for kind in ('segment', 'route', 'splice'):
+                    self.planning.cancel(kind)
                 self.drone.reset()
+                if self.log is not None:
+                    self.log.close()
                 self.dashboard.destination = None  # Clear destination
                 self.dashboard.draw_grid()
                 print("[INFO] Destination cleared.")
@@ -501,7 +729,8 @@ class LiveDemo:
         self.paused = False
         
         # Reset grid with new scenario
-        self.grid = Grid(size=self.grid.size, obstacle_prob=0.12, no_fly_zone=0.06, seedling=None)
+        self.grid = Grid(size=self.grid.size, obstacle_prob=0.12, no_fly_zone=0.06, seedling=None,
+                         connectivity=self.grid.connectivity)
         # Note: We are creating a NEW grid object to reset configs cleanly
         # But we need to use the `load_scenario` method we added to Grid
         
@@ -510,7 +739,8 @@ class LiveDemo:
         self.grid.load_scenario(label)
         
         # Reset drone and planner
-        self.drone = Drone(startposition=(0, 0), battery_capacity=self.drone.battery_capacity)
+        self.drone = Drone(startposition=(0, 0), battery_capacity=self.drone.battery_capacity,
+                           grid_size=self.grid.size, terrain=self.grid)
         self.planner = CoveragePlanner(self.grid, self.drone)
         
         # Update dashboard references
@@ -520,6 +750,10 @@ class LiveDemo:
         # Reset state
         self.destination = None
         self.full_path = None
+        self.path_stream = None
+        self.splice = None
+        for kind in ('segment', 'route', 'splice'):
+            self.planning.cancel(kind)
         self.optimal_path = None
         self.current_step = 0
         
@@ -582,6 +816,41 @@ def static_demo():
     dashboard.show()
 
 
+def headless_demo(grid_size=50):
+    """
+    Fly a coverage mission without any GUI, consuming planned segments as
+    they are produced
+    """
+    import time
+
+    print("Headless Demo (Streaming Planner)")
+    print("-" * 40)
+
+    grid = Grid(size=grid_size, obstacle_prob=0.12, no_fly_zone=0.06, seedling=42)
+    grid.setstartposition((0, 0))
+    drone = Drone(startposition=(0, 0), battery_capacity=grid_size * grid_size * 2)
+    planner = CoveragePlanner(grid, drone)
+
+    start_time = time.perf_counter()
+    segments = planner.iter_adaptive_coverage(battery_limit=20)
+
+    first_segment = next(segments, [])
+    first_move_ms = (time.perf_counter() - start_time) * 1000
+
+    def all_segments():
+        yield first_segment
+        yield from segments
+
+    flown = planner.execute(all_segments())
+    total_ms = (time.perf_counter() - start_time) * 1000
+
+    print(f"  First move after: {first_move_ms:.1f}ms")
+    print(f"  Mission time:     {total_ms:.1f}ms")
+    print(f"  Steps flown:      {len(flown)}")
+    print(f"  Coverage:         {planner.estimate_coverage_percent(flown):.1f}%")
+    print(f"  Battery left:     {drone.get_battery_percentage():.1f}%")
+
+
 def comparison_demo():
     """
     Compare different coverage strategies to see which performs better
@@ -656,9 +925,11 @@ if __name__ == "__main__":
             static_demo()
         elif mode == "compare":
             comparison_demo()
+        elif mode == "headless":
+            headless_demo()
         else:
             print(f"Unknown mode: {mode}")
-            print("Usage: python demo.py [static|compare]")
+            print("Usage: python demo.py [static|compare|headless]")
     else:
         # Default: Run interactive mode
         demo = LiveDemo(grid_size=20, seed=42, interactive=True)
@@ -0,0 +1,237 @@
+"""
+Distance Oracle for Drone Path Optimizer
+All-pairs grid distances for a set of waypoints: one flood per waypoint
+(BFS, or Dijkstra once the grid has diagonal moves or a cost layer),
+optionally spread over a process pool and cut short by a deadline, kept
+in a bounded cache that is dropped when the grid changes.
+"""
+
+import time
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from a_star import a_star_search, flood_field, path_from_field
+from grid import DIAGONAL_COST
+
+
+def _flood_batch(cells, costs, connectivity, sources):
+    """Worker entry point: fields for several sources on a copy of the grid"""
+    from grid import Grid
+
+    grid = Grid(size=cells.shape[0], obstacle_prob=0, no_fly_zone=0, connectivity=connectivity)
+    grid.grid = cells
+    if costs is not None:
+        grid.set_cost_layer(costs)
+    grid.mark_changed()
+    return [flood_field(grid, [source]) for source in sources]
+
+
+class DistanceOracle:
+    """
+    Shortest-path distances between waypoints on a Grid
+
+    Floods are kept in the oracle's own least-recently-used store of at
+    most max_fields fields (one size x size int32 array each), dropped
+    as a whole whenever the grid changes, so memory stays bounded however
+    many waypoints are queried.
+    """
+
+    def __init__(self, grid, workers=None, parallel_threshold=32, max_fields=256):
+        """
+        Parameters:
+            grid: Grid object
+            workers: Process count for floods (None or 1 = run in-process)
+            parallel_threshold: Minimum number of missing floods before the
+                                process pool is worth its startup cost
+            max_fields: Most distance fields kept at once
+        """
+        self.grid = grid
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self.max_fields = max_fields
+        self._pool = None
+        self._fields = OrderedDict()
+        self._matrices = {}
+        self._version = None
+
+    def close(self):
+        """Shut down the process pool, if one was started"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _check_version(self):
+        """Forget every field and matrix once the grid has changed"""
+        self.grid.sync()
+        if self._version != self.grid.version:
+            self._fields.clear()
+            self._matrices.clear()
+            self._version = self.grid.version
+
+    def _store(self, source, field):
+        self._fields[source] = field
+        self._fields.move_to_end(source)
+        while len(self._fields) > self.max_fields:
+            self._fields.popitem(last=False)
+
+    def cached_field(self, source):
+        """The stored field from source, or None (does not flood)"""
+        self._check_version()
+        field = self._fields.get(tuple(source))
+        if field is not None:
+            self._fields.move_to_end(tuple(source))
+        return field
+
+    def flood(self, sources):
+        """
+        Make sure a distance field exists for every source. Only the last
+        max_fields of them stay stored afterwards.
+
+        Returns:
+            list: The fields, in the same order as sources
+        """
+        self._check_version()
+        sources = [tuple(s) for s in sources]
+        found = {s: self._fields[s] for s in sources if s in self._fields}
+        missing = list(dict.fromkeys(s for s in sources if s not in found))
+
+        if self.workers and self.workers > 1 and len(missing) >= self.parallel_threshold:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+            batches = [missing[i::self.workers] for i in range(self.workers)]
+            futures = [self._pool.submit(_flood_batch, self.grid.grid, self.grid.cost,
+                                         self.grid.connectivity, batch)
+                       for batch in batches if batch]
+            for batch, future in zip([b for b in batches if b], futures):
+                found.update(zip(batch, future.result()))
+        else:
+            for source in missing:
+                found[source] = flood_field(self.grid, [source])
+
+        for source in sources:
+            self._store(source, found[source])
+        return [found[source] for source in sources]
+
+    def matrix(self, points, deadline=None, stats=None):
+        """
+        Dense distance matrix between points
+
+        Rows are flooded in batches until deadline (a time.perf_counter()
+        value) passes; the first row is always exact. Rows left unflooded
+        take their entries from flooded rows where the pair has one (only
+        without a cost layer, where distances are symmetric) and otherwise
+        fall back to the a_star.heuristic estimate, which is exact on open
+        ground and never more than the true distance. Only complete
+        matrices are cached.
+
+        Parameters:
+            points: List of (row, col) tuples
+            deadline: Optional time.perf_counter() value to stop flooding at
+            stats: Optional dict; stats['estimated'] is set to the number
+                   of rows that were not flooded
+
+        Returns:
+            numpy array: K x K entries, matrix[i][j] from points[i] to
+                         points[j] (step counts on plain 4-connected grids,
+                         flood_field energies otherwise), -1 where a pair
+                         is disconnected
+        """
+        self._check_version()
+        points = [tuple(p) for p in points]
+        key = tuple(points)
+        if key in self._matrices:
+            if stats is not None:
+                stats['estimated'] = 0
+            return self._matrices[key]
+
+        rows = np.array([p[0] for p in points], dtype=np.int64)
+        cols = np.array([p[1] for p in points], dtype=np.int64)
+        weighted = self.grid.cost is not None or self.grid.connectivity == 8
+        matrix = np.empty((len(points), len(points)), dtype=float if weighted else np.int32)
+        flooded = np.zeros(len(points), dtype=bool)
+
+        parallel = self.workers and self.workers > 1 and len(points) >= self.parallel_threshold
+        batch = max(self.workers * 4, self.parallel_threshold) if parallel else 1
+        index = 0
+        while index < len(points):
+            if index > 0 and deadline is not None and time.perf_counter() > deadline:
+                break
+            chunk = list(range(index, min(index + batch, len(points))))
+            for i, field in zip(chunk, self.flood([points[i] for i in chunk])):
+                matrix[i] = field[rows, cols]
+                flooded[i] = True
+            index += batch
+
+        estimated = int(len(points) - flooded.sum())
+        if estimated:
+            labels = self.grid.component_labels()[rows, cols]
+            guess = np.where(labels[:, None] == labels[None, :], self._lower_bound(rows, cols), -1)
+            if self.grid.cost is None:
+                # Without a cost layer a -> b costs the same as b -> a
+                guess = np.where(flooded[None, :], matrix.T, guess)
+            matrix[~flooded] = guess[~flooded]
+        else:
+            self._matrices[key] = matrix
+
+        if stats is not None:
+            stats['estimated'] = estimated
+        return matrix
+
+    def _lower_bound(self, rows, cols):
+        """a_star.heuristic between every pair of points, vectorised"""
+        drow = np.abs(rows[:, None] - rows[None, :])
+        dcol = np.abs(cols[:, None] - cols[None, :])
+        if self.grid.connectivity == 8:
+            bound = np.maximum(drow, dcol) + (DIAGONAL_COST - 1) * np.minimum(drow, dcol)
+        else:
+            bound = drow + dcol
+        return bound * self.grid.cost_floor()
+
+    def distance(self, start, goal):
+        """Steps (or energy, see matrix) from start to goal, -1 if unreachable"""
+        field = self.flood([start])[0]
+        return field[goal[0]][goal[1]].item()
+
+    def path(self, start, goal):
+        """
+        Cell-by-cell shortest path from start to goal, or None. Follows a
+        stored field when there is one and runs A* otherwise, so a route's
+        legs never flood the grid.
+        """
+        field = self.cached_field(start)
+        if field is None:
+            return a_star_search(self.grid, tuple(start), tuple(goal))
+        return path_from_field(self.grid, field, tuple(goal))
+
+
+if __name__ == "__main__":
+    import time
+    from grid import Grid
+
+    print("=== Distance Oracle Demo ===")
+    print("-" * 40)
+
+    grid = Grid(size=80, obstacle_prob=0.15, no_fly_zone=0.05, seedling=42)
+    free = list(zip(*np.nonzero(grid.grid == 0)))
+    points = [tuple(map(int, free[i])) for i in range(0, len(free), len(free) // 200)][:200]
+
+    for workers in (None, 4):
+        grid.mark_changed()
+        with DistanceOracle(grid, workers=workers) as oracle:
+            start_time = time.perf_counter()
+            matrix = oracle.matrix(points)
+            first = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            oracle.matrix(points)
+            second = time.perf_counter() - start_time
+
+        print(f"workers={workers}: {len(points)}x{len(points)} matrix in {first * 1000:.0f}ms, "
+              f"cached repeat {second * 1000:.2f}ms")
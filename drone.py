@@ -1,8 +1,13 @@
 
+import numpy as np
+from grid import step_cost
+
 class Drone:
 
-    def __init__(self, startposition, battery_capacity=100, moving_cost=1):
+    def __init__(self, startposition, battery_capacity=100, moving_cost=1, grid_size=None, terrain=None):
         self.startposition = startposition
+        # Grid whose cost layer scales the battery used by each move (None = flat)
+        self.terrain = terrain
         self.position = startposition
         self.battery_capacity = battery_capacity
         self.battery = battery_capacity
@@ -10,17 +15,52 @@ class Drone:
         self.path_history = [startposition]
         self.visited = {startposition}
 
+        # Visits per cell, kept up to date by move(); grows if the drone
+        # leaves the area it was sized for
+        self.grid_size = grid_size
+        self.visit_counts = None
+        self._reset_visit_counts()
+
+    def _reset_visit_counts(self):
+        size = self.grid_size or max(self.startposition) + 1
+        self.visit_counts = np.zeros((size, size), dtype=np.int32)
+        self.visit_counts[self.startposition] = 1
+
+    def _ensure_size(self, size):
+        current = self.visit_counts.shape[0]
+        if size > current:
+            grown = np.zeros((max(2 * current, size),) * 2, dtype=np.int32)
+            grown[:current, :current] = self.visit_counts
+            self.visit_counts = grown
+
+    def get_visit_counts(self, size):
+        """size x size view of the visit counts (zeros where never flown)"""
+        self._ensure_size(size)
+        return self.visit_counts[:size, :size]
+
     def move(self, nextpos):
-        if self.battery < self.moving_cost:
+        # Diagonal moves (8-connected grids) fly sqrt(2) times as far, and
+        # costly cells (headwind, altitude) take more battery to enter
+        if self.terrain is not None:
+            cost = self.moving_cost * self.terrain.move_cost(self.position, nextpos)
+        else:
+            cost = self.moving_cost * step_cost(self.position, nextpos)
+        if self.battery < cost:
             return False
         
         self.position = nextpos
-        self.battery -= self.moving_cost
+        self.battery -= cost
         self.path_history.append(nextpos)
         self.visited.add(nextpos)
+        self._ensure_size(max(nextpos) + 1)
+        self.visit_counts[nextpos] += 1
 
         return True
     
+    def recharge(self):
+        """Full battery again (e.g. back on the charging cell between sorties)"""
+        self.battery = self.battery_capacity
+
     def can_move(self):
         return self.battery >= self.moving_cost
     
@@ -47,6 +87,7 @@ class Drone:
         self.battery = self.battery_capacity
         self.path_history = [self.startposition]
         self.visited = {self.startposition}
+        self._reset_visit_counts()
 
     def get_status(self):
         return {
@@ -0,0 +1,238 @@
+"""
+Dynamic Obstacles for Drone Path Optimizer
+Time-indexed occupancy layered over a static Grid: obstacles and no-fly
+zones that appear on a schedule or move along a trajectory, plus a
+space-time A* that plans around their predicted positions.
+"""
+
+import heapq
+import numpy as np
+from bisect import bisect_right
+from a_star import distance
+
+
+class OccupancySchedule:
+    """
+    Scheduled occupancy for a Grid, queried per (cell, time step)
+
+    Nothing is copied per tick: time windows are kept per cell in start
+    order, and each moving obstacle keeps an index from cell to the phases
+    of its (optionally looping) trajectory that land on that cell. The
+    grid itself is never written, so its version and cached fields
+    survive every tick.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self._windows = {}    # cell -> sorted [(start, end, value)]
+        self._movers = []     # (start, period, loop, value, positions)
+        self._mover_index = {}  # cell -> [(mover id, {phase, ...})]
+        # Occupancy of the step last passed to apply(), for display
+        self.layer = np.zeros((grid.size, grid.size), dtype=np.int8)
+        self._applied = set()  # cells set in layer
+
+    def add_window(self, cell, start, end=None, value=1):
+        """
+        Block cell from time step start up to (not including) end
+
+        Parameters:
+            cell: (row, col)
+            start: First blocked time step
+            end: First free time step again (None = stays blocked)
+            value: 1 for an obstacle, 2 for a no-fly zone
+        """
+        cell = tuple(cell)
+        end = float('inf') if end is None else end
+        windows = self._windows.setdefault(cell, [])
+        windows.append((start, end, value))
+        windows.sort()
+
+    def add_moving_obstacle(self, trajectory, start=0, dwell=1, loop=False, value=1):
+        """
+        An obstacle that steps through trajectory, dwell time steps per cell
+
+        Parameters:
+            trajectory: List of (row, col) cells, in visiting order
+            start: Time step at which it appears on trajectory[0]
+            dwell: Time steps spent on each cell
+            loop: Repeat the trajectory forever instead of vanishing at the end
+            value: 1 for an obstacle, 2 for a no-fly zone
+        """
+        positions = [tuple(c) for c in trajectory for _ in range(dwell)]
+        mover_id = len(self._movers)
+        self._movers.append((start, len(positions), loop, value, positions))
+
+        phases = {}
+        for phase, cell in enumerate(positions):
+            phases.setdefault(cell, set()).add(phase)
+        for cell, cell_phases in phases.items():
+            self._mover_index.setdefault(cell, []).append((mover_id, cell_phases))
+
+    def _mover_phase(self, mover_id, t):
+        start, period, loop, _, _ = self._movers[mover_id]
+        offset = t - start
+        if offset < 0 or (not loop and offset >= period):
+            return None
+        return offset % period
+
+    def dynamic_value(self, cell, t):
+        """Scheduled value (1 or 2) of cell at step t, or 0 if nothing is scheduled"""
+        cell = tuple(cell)
+
+        windows = self._windows.get(cell)
+        if windows:
+            # Only windows that have started can be active
+            for begin, end, value in windows[:bisect_right(windows, (t, float('inf'), 3))]:
+                if begin <= t < end:
+                    return value
+
+        for mover_id, phases in self._mover_index.get(cell, ()):
+            if self._mover_phase(mover_id, t) in phases:
+                return self._movers[mover_id][3]
+
+        return 0
+
+    def static_value(self, cell):
+        """Value of cell in the static grid"""
+        return self.grid.grid[cell[0]][cell[1]]
+
+    def reachable(self, start, goal):
+        """
+        grid.reachable on the static layer: False means no schedule can
+        ever open a way
+        """
+        return self.grid.reachable(start, goal)
+
+    def is_free(self, cell, t):
+        """True if cell is inside the grid, statically safe and unscheduled at step t"""
+        row, col = cell
+        if row < 0 or row >= self.grid.size or col < 0 or col >= self.grid.size:
+            return False
+        return self.static_value(cell) == 0 and self.dynamic_value(cell, t) == 0
+
+    def occupied_cells(self, t):
+        """Every scheduled cell that is blocked at step t, with its value"""
+        cells = {}
+        for cell, windows in self._windows.items():
+            for begin, end, value in windows:
+                if begin <= t < end:
+                    cells[cell] = value
+                    break
+        for mover_id, (_, _, _, value, positions) in enumerate(self._movers):
+            phase = self._mover_phase(mover_id, t)
+            if phase is not None:
+                cells.setdefault(positions[phase], value)
+        return cells
+
+    def apply(self, t):
+        """
+        Set layer to the occupancy of step t (cells the static grid already
+        blocks are left out), touching only cells whose state changed
+        since the previous apply()
+
+        Returns:
+            list: Cells that changed
+        """
+        wanted = {cell: value for cell, value in self.occupied_cells(t).items()
+                  if self.static_value(cell) == 0}
+        changed = []
+
+        for cell in self._applied - wanted.keys():
+            self.layer[cell] = 0
+            changed.append(cell)
+
+        for cell, value in wanted.items():
+            if self.layer[cell] != value:
+                self.layer[cell] = value
+                changed.append(cell)
+
+        self._applied = set(wanted)
+        return changed
+
+
+def space_time_a_star(grid, schedule, start, goal, start_time=0, max_time=None):
+    """
+    A* over (cell, time step) that avoids scheduled occupancy
+
+    Each step either moves to a 4-neighbor or hovers in place (cost 1
+    either way). A move is rejected if the target cell is occupied when
+    the drone would arrive, or if an obstacle is swapping places with the
+    drone on that step.
+
+    Parameters:
+        grid: Grid object (static layer)
+        schedule: OccupancySchedule
+        start, goal: (row, col)
+        start_time: Time step at which the drone is at start
+        max_time: Last time step the search may use (default: start_time +
+                  twice the number of cells)
+
+    Returns:
+        list: One cell per time step from start_time (hovering repeats the
+              cell), or None if the goal cannot be reached in time
+    """
+    if max_time is None:
+        max_time = start_time + 2 * grid.size * grid.size
+
+    if not schedule.is_free(start, start_time) or schedule.static_value(goal) != 0:
+        return None
+
+    # Walled-off goals would otherwise exhaust every (cell, time) state up to max_time
+    if not schedule.reachable(start, goal):
+        return None
+
+    openset = [(distance(start, goal), 0, start, start_time)]
+    parents = {(start, start_time): None}
+    closed = set()
+
+    while openset:
+        _, g, posture, t = heapq.heappop(openset)
+        state = (posture, t)
+
+        if posture == goal:
+            path = []
+            while state is not None:
+                path.append(state[0])
+                state = parents[state]
+            path.reverse()
+            return path
+
+        if state in closed or t >= max_time:
+            continue
+        closed.add(state)
+
+        row, col = posture
+        for nxt in ((row, col), (row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if not schedule.is_free(nxt, t + 1):
+                continue
+            # Swap conflict: something is leaving nxt for our cell this step
+            if nxt != posture and not schedule.is_free(nxt, t) and not schedule.is_free(posture, t + 1):
+                continue
+
+            next_state = (nxt, t + 1)
+            if next_state in parents:
+                continue
+            parents[next_state] = state
+            heapq.heappush(openset, (g + 1 + distance(nxt, goal), g + 1, nxt, t + 1))
+
+    return None
+
+
+if __name__ == "__main__":
+    from grid import Grid
+
+    print("=== Dynamic Obstacle Demo ===")
+    print("-" * 40)
+
+    grid = Grid(size=10, obstacle_prob=0, no_fly_zone=0)
+    schedule = OccupancySchedule(grid)
+
+    # A patrol sweeping down column 5 and back, and a no-fly zone that opens at t=4
+    patrol = [(r, 5) for r in range(10)] + [(r, 5) for r in range(8, 0, -1)]
+    schedule.add_moving_obstacle(patrol, loop=True)
+    schedule.add_window((0, 8), start=4, value=2)
+
+    path = space_time_a_star(grid, schedule, (0, 0), (0, 9))
+    print(f"Route in {len(path) - 1} steps:")
+    for t, cell in enumerate(path):
+        print(f"  t={t:>2} {cell}  patrol at {patrol[t % len(patrol)]}")
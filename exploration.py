@@ -0,0 +1,218 @@
+"""
+Frontier Exploration for Drone Path Optimizer
+The drone starts without a map: a belief grid is filled in from what its
+sensor sees around it, and it keeps flying to the nearest frontier (a
+known safe cell next to unknown space) until none is left.
+"""
+
+import time
+import numpy as np
+
+from grid import Grid, ORTHOGONAL
+from footprint import SensorFootprint
+
+
+class FrontierExplorer:
+    """
+    Frontier-based exploration of an unknown world
+
+    The belief is a Grid in which unknown cells are blocked, so every
+    planner only ever routes through cells the drone has seen to be safe.
+    Sensing patches the frontier set around the newly revealed cells only,
+    and a route to the nearest frontier is searched only when the current
+    target has been seen past, not on every step.
+    """
+
+    def __init__(self, world, drone, sensing_radius=3, shape='disk'):
+        """
+        Parameters:
+            world: Grid with the true map (only read through the sensor)
+            drone: Drone object (exploration starts from its position)
+            sensing_radius: Radius of the sensor footprint (>= 1)
+            shape: 'square' or 'disk'
+        """
+        if sensing_radius < 1:
+            raise ValueError("sensing_radius must be at least 1")
+
+        self.world = world
+        self.drone = drone
+        self.sensor = SensorFootprint(world, radius=sensing_radius, shape=shape)
+
+        size = world.size
+        self.belief = Grid(size=size, obstacle_prob=0, no_fly_zone=0, connectivity=world.connectivity)
+        self.belief.grid = np.ones((size, size), dtype=int)
+        self.belief.mark_changed()
+        self.known = np.zeros((size, size), dtype=bool)
+        self.known_count = 0
+        self.frontier = set()
+        self.route = []  # Cells still to fly towards the current frontier target
+        self._search = None  # (belief version, start, path) of the last frontier search
+
+        self.steps = 0
+        self.replans = 0
+        self.step_times = []
+        self.history = []  # Known cells after each step
+        self.sense()
+
+    def sense(self):
+        """
+        Reveal what the sensor sees from the drone's position
+
+        Returns:
+            list: Cells that were unknown until now
+        """
+        revealed = [cell for cell in self.sensor.visible_from(self.drone.position)
+                    if not self.known[cell]]
+        if not revealed:
+            return revealed
+
+        for cell in revealed:
+            self.known[cell] = True
+            self.belief.grid[cell] = self.world.grid[cell]
+        self.known_count += len(revealed)
+        self.belief.mark_changed()
+
+        # Only revealed cells and their neighbors can gain or lose frontier status
+        touched = set(revealed)
+        for row, col in revealed:
+            touched.update(self._neighbors((row, col)))
+        for cell in touched:
+            if self.is_frontier(cell):
+                self.frontier.add(cell)
+            else:
+                self.frontier.discard(cell)
+        return revealed
+
+    def _neighbors(self, pos):
+        row, col = pos
+        size = self.belief.size
+        return [(row + hori, col + verti) for hori, verti in ORTHOGONAL
+                if 0 <= row + hori < size and 0 <= col + verti < size]
+
+    def is_frontier(self, pos):
+        """Known safe cell with at least one unknown neighbor"""
+        return (self.known[pos] and self.belief.isvalid(pos)
+                and any(not self.known[other] for other in self._neighbors(pos)))
+
+    def nearest_frontier(self):
+        """
+        Path to the closest frontier cell by breadth-first search from the
+        drone over known safe cells, stopping at the first frontier reached,
+        so the search stays local while frontiers are nearby. The answer is
+        kept until the belief changes or the drone moves, so asking again
+        (e.g. report() after run() stopped) costs nothing. A cached flood
+        (flood_field / distance_field) would not be reused: a search is
+        only needed after sensing has changed the belief, and flooding the
+        whole belief each time is far slower than stopping at the nearest
+        frontier.
+
+        Returns:
+            list: Cells from the drone's position to the frontier, or None
+                  if no frontier is reachable
+        """
+        start = self.drone.position
+        key = (self.belief.version, start)
+        if self._search is not None and self._search[0] == key:
+            return self._search[1]
+        path = self._frontier_search(start)
+        self._search = (key, path)
+        return path
+
+    def _frontier_search(self, start):
+        parents = {start: None}
+        layer = [start]
+        while layer:
+            next_layer = []
+            for posture in layer:
+                if posture in self.frontier:
+                    path = [posture]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    path.reverse()
+                    return path
+                for other in self.belief.surroundings(posture):
+                    if other not in parents:
+                        parents[other] = posture
+                        next_layer.append(other)
+            layer = next_layer
+        return None
+
+    def step(self):
+        """
+        Sense, then move one cell towards the nearest reachable frontier.
+        The route is kept until its target stops being a frontier; known
+        safe cells stay safe, so it never has to be checked otherwise.
+
+        Returns:
+            bool: False once exploration is over (no reachable frontier or no battery)
+        """
+        start_time = time.perf_counter()
+        self.sense()
+
+        if not self.route or self.route[-1] not in self.frontier:
+            self.route = self.nearest_frontier()
+            if self.route:
+                self.route = self.route[1:]
+            self.replans += 1
+
+        moved = False
+        if self.route:
+            moved = self.drone.move(self.route[0])
+        if moved:
+            self.route.pop(0)
+            self.steps += 1
+            self.history.append(self.known_count)
+        self.step_times.append(time.perf_counter() - start_time)
+        return moved
+
+    def run(self, max_steps=None):
+        """Explore until done (or max_steps moves) and return report()"""
+        while max_steps is None or self.steps < max_steps:
+            if not self.step():
+                break
+        return self.report()
+
+    def report(self):
+        """
+        Returns:
+            dict: 'steps' flown, 'explored' (percent of the map known),
+                  'exploration_rate' (cells revealed per step), 'frontier'
+                  (cells left, including ones the drone cannot reach),
+                  'complete' (no reachable frontier left; reuses the last
+                  search when nothing has changed since), 'replans' (frontier
+                  searches) and 'step_ms_mean' / 'step_ms_max' compute time per step
+        """
+        total = self.world.size * self.world.size
+        times = self.step_times or [0.0]
+        return {
+            'steps': self.steps,
+            'explored': self.known_count / total * 100,
+            'exploration_rate': self.known_count / max(self.steps, 1),
+            'frontier': len(self.frontier),
+            'complete': self.nearest_frontier() is None,
+            'replans': self.replans,
+            'step_ms_mean': sum(times) / len(times) * 1000,
+            'step_ms_max': max(times) * 1000
+        }
+
+
+if __name__ == "__main__":
+    from drone import Drone
+
+    print("=== Frontier Exploration Demo ===")
+    print("-" * 40)
+
+    for size in (40, 100):
+        world = Grid(size=size, obstacle_prob=0.12, no_fly_zone=0.06, seedling=3)
+        world.setstartposition((0, 0))
+        drone = Drone(startposition=(0, 0), battery_capacity=size * size * 2, grid_size=size)
+        explorer = FrontierExplorer(world, drone, sensing_radius=3)
+
+        start_time = time.perf_counter()
+        report = explorer.run()
+        elapsed = time.perf_counter() - start_time
+
+        print(f"{size}x{size}: {report['steps']} steps, {report['explored']:.1f}% of the map known, "
+              f"{report['exploration_rate']:.1f} cells/step, {report['replans']} frontier searches, "
+              f"{report['step_ms_mean']:.2f}ms/step (max {report['step_ms_max']:.1f}ms), "
+              f"{elapsed:.1f}s total, {'complete' if report['complete'] else 'frontier left'}")
@@ -0,0 +1,249 @@
+"""
+Fleet State for Drone Path Optimizer
+Many drones held as arrays (positions, batteries, moving costs, a shared
+visit-count grid and one step-major position history) instead of one
+Drone object each. Bulk operations are vectorized, and fleet[i] gives a
+Drone-compatible view so existing planners work on single fleet members.
+"""
+
+import numpy as np
+from drone import Drone
+from grid import DIAGONAL_COST
+
+
+class Fleet:
+    """
+    Struct-of-arrays state for N drones
+
+    positions is (N, 2), battery / battery_capacity / moving_cost are (N,)
+    floats (diagonal moves and cell costs make battery levels fractional),
+    visit_counts is one grid shared by the whole fleet, and history[k, i]
+    is drone i's position after its k-th move (valid up to steps[i]).
+    """
+
+    def __init__(self, startpositions, battery_capacity=100, moving_cost=1, grid_size=None, terrain=None):
+        """
+        Parameters:
+            startpositions: (row, col) per drone
+            battery_capacity: One capacity for all, or one per drone
+            moving_cost: One cost for all, or one per drone
+            grid_size: Side of the visit-count grid (grown on demand if None)
+            terrain: Optional Grid whose cost layer scales the battery used
+                     by each move, as for Drone (None = flat)
+        """
+        self.startpositions = np.array(startpositions, dtype=np.int64).reshape(-1, 2)
+        count = len(self.startpositions)
+        self.battery_capacity = np.broadcast_to(np.asarray(battery_capacity, dtype=float), (count,)).copy()
+        self.moving_cost = np.broadcast_to(np.asarray(moving_cost, dtype=float), (count,)).copy()
+        self.grid_size = grid_size
+        self.terrain = terrain
+        self.reset()
+
+    def __len__(self):
+        return len(self.startpositions)
+
+    def __getitem__(self, index):
+        return DroneView(self, index)
+
+    def reset(self):
+        """Every drone back at its start with a full battery and no history"""
+        count = len(self)
+        self.positions = self.startpositions.copy()
+        self.battery = self.battery_capacity.copy()
+        self.steps = np.zeros(count, dtype=np.int64)
+        self.history = np.zeros((64, count, 2), dtype=np.int32)
+        self.history[0] = self.startpositions
+
+        size = self.grid_size or int(self.startpositions.max(initial=0)) + 1
+        self.visit_counts = np.zeros((size, size), dtype=np.int32)
+        np.add.at(self.visit_counts, (self.startpositions[:, 0], self.startpositions[:, 1]), 1)
+
+    def _ensure_size(self, size):
+        current = self.visit_counts.shape[0]
+        if size > current:
+            grown = np.zeros((max(2 * current, size),) * 2, dtype=np.int32)
+            grown[:current, :current] = self.visit_counts
+            self.visit_counts = grown
+
+    def get_visit_counts(self, size):
+        """size x size view of the fleet's shared visit counts"""
+        self._ensure_size(size)
+        return self.visit_counts[:size, :size]
+
+    def can_move(self):
+        """Mask of drones with enough battery for one more move"""
+        return self.battery >= self.moving_cost
+
+    def move(self, targets, mask=None):
+        """
+        Move every selected drone that can afford it to its target
+
+        Parameters:
+            targets: (N, 2) positions (rows of unselected drones are ignored)
+            mask: Optional (N,) bool selection (default: all drones)
+
+        Returns:
+            numpy array: (N,) bool, True for drones that moved
+        """
+        targets = np.asarray(targets, dtype=np.int64).reshape(-1, 2)
+        moved = self.battery >= self._move_costs(np.arange(len(self)), targets)
+        if mask is not None:
+            moved &= np.asarray(mask, dtype=bool)
+        index = np.flatnonzero(moved)
+        if len(index) == 0:
+            return moved
+
+        self._advance(index, targets[index])
+        return moved
+
+    def _move_costs(self, index, new):
+        """
+        Battery each drone in index needs to reach new: diagonal moves cost
+        sqrt(2) x, times the terrain cost of the cell entered (as Drone.move)
+        """
+        diagonal = np.all(new != self.positions[index], axis=1)
+        costs = self.moving_cost[index] * np.where(diagonal, DIAGONAL_COST, 1.0)
+        if self.terrain is not None and self.terrain.cost is not None:
+            costs = costs * self.terrain.cost[new[:, 0], new[:, 1]]
+        return costs
+
+    def _advance(self, index, new):
+        """Move drones index (already checked for battery) to cells new"""
+        self.battery[index] -= self._move_costs(index, new)
+        self.positions[index] = new
+
+        self.steps[index] += 1
+        depth = int(self.steps[index].max())
+        if depth >= len(self.history):
+            grown = np.zeros((max(2 * len(self.history), depth + 1),) + self.history.shape[1:], dtype=np.int32)
+            grown[:len(self.history)] = self.history
+            self.history = grown
+        self.history[self.steps[index], index] = new
+
+        self._ensure_size(int(new.max()) + 1)
+        np.add.at(self.visit_counts, (new[:, 0], new[:, 1]), 1)
+
+    def get_battery_percentages(self):
+        return self.battery / self.battery_capacity * 100
+
+    def get_coverage_count(self):
+        """Distinct cells visited by any drone"""
+        return int(np.count_nonzero(self.visit_counts))
+
+    def get_path_lengths(self):
+        return self.steps.copy()
+
+    def path_of(self, index):
+        """(steps + 1, 2) array: drone index's positions from its start"""
+        return self.history[:self.steps[index] + 1, index]
+
+
+class DroneView(Drone):
+    """
+    One fleet member behind the Drone interface; reads and writes go
+    straight to the fleet's arrays
+    """
+
+    def __init__(self, fleet, index):
+        self.fleet = fleet
+        self.index = index
+
+    @property
+    def startposition(self):
+        return tuple(int(v) for v in self.fleet.startpositions[self.index])
+
+    @property
+    def position(self):
+        return tuple(int(v) for v in self.fleet.positions[self.index])
+
+    @property
+    def battery(self):
+        return self.fleet.battery[self.index].item()
+
+    @battery.setter
+    def battery(self, value):
+        self.fleet.battery[self.index] = value
+
+    @property
+    def battery_capacity(self):
+        return self.fleet.battery_capacity[self.index].item()
+
+    @property
+    def moving_cost(self):
+        return self.fleet.moving_cost[self.index].item()
+
+    @property
+    def terrain(self):
+        return self.fleet.terrain
+
+    @property
+    def path_history(self):
+        return [tuple(cell) for cell in self.fleet.path_of(self.index).tolist()]
+
+    @property
+    def visited(self):
+        return set(map(tuple, self.fleet.path_of(self.index).tolist()))
+
+    @property
+    def visit_counts(self):
+        """This drone's own visits (the fleet keeps the shared total)"""
+        path = self.fleet.path_of(self.index)
+        counts = np.zeros(self.fleet.visit_counts.shape, dtype=np.int32)
+        np.add.at(counts, (path[:, 0], path[:, 1]), 1)
+        return counts
+
+    def get_visit_counts(self, size):
+        self.fleet._ensure_size(size)
+        return self.visit_counts[:size, :size]
+
+    def move(self, nextpos):
+        index, new = np.array([self.index]), np.array([nextpos], dtype=np.int64)
+        if self.battery < self.fleet._move_costs(index, new)[0]:
+            return False
+        self.fleet._advance(index, new)
+        return True
+
+    def get_path_length(self):
+        return int(self.fleet.steps[self.index])
+
+    def reset(self):
+        fleet, i = self.fleet, self.index
+        path = fleet.path_of(i)
+        np.subtract.at(fleet.visit_counts, (path[1:, 0], path[1:, 1]), 1)
+        fleet.positions[i] = fleet.startpositions[i]
+        fleet.battery[i] = fleet.battery_capacity[i]
+        fleet.steps[i] = 0
+
+
+if __name__ == "__main__":
+    import time
+
+    print("=== Fleet Demo ===")
+    print("-" * 40)
+
+    size, count, steps = 100, 500, 200
+    rng = np.random.default_rng(42)
+    starts = rng.integers(0, size, size=(count, 2))
+    moves = np.array([(0, 1), (1, 0), (0, -1), (-1, 0)])
+
+    fleet = Fleet(starts, battery_capacity=300, grid_size=size)
+    start_time = time.perf_counter()
+    for _ in range(steps):
+        targets = np.clip(fleet.positions + moves[rng.integers(0, 4, size=count)], 0, size - 1)
+        fleet.move(targets)
+    fleet_time = time.perf_counter() - start_time
+
+    drones = [Drone(tuple(s), battery_capacity=300, grid_size=size) for s in starts.tolist()]
+    start_time = time.perf_counter()
+    for _ in range(steps):
+        for drone, step in zip(drones, moves[rng.integers(0, 4, size=count)].tolist()):
+            row = min(max(drone.position[0] + step[0], 0), size - 1)
+            col = min(max(drone.position[1] + step[1], 0), size - 1)
+            drone.move((row, col))
+    object_time = time.perf_counter() - start_time
+
+    print(f"{count} drones x {steps} steps: Fleet {fleet_time * 1000:.0f}ms, "
+          f"Drone objects {object_time * 1000:.0f}ms")
+    print(f"Cells covered by the fleet: {fleet.get_coverage_count()}")
+    print(f"Mean battery: {fleet.get_battery_percentages().mean():.1f}%")
+    print(f"Drone 0 view: {fleet[0].get_status()}")
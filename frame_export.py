@@ -0,0 +1,242 @@
+"""
+Frame Export for Drone Path Optimizer
+Offline renderer for recorded or simulated missions: frames are painted
+into one preallocated RGB buffer, cell by cell as the mission changes,
+and written out as PNG files (zlib only) or an animated GIF (Pillow).
+"""
+
+import os
+import struct
+import zlib
+import numpy as np
+from palette import COLOR_PALETTE, HEAT_VISITS, VISITED_BASE, VISITED_HOT, hex_to_rgb
+
+
+def _png_chunk(kind, data):
+    return (struct.pack('>I', len(data)) + kind + data
+            + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+
+def encode_png(rgb, level=1):
+    """
+    PNG bytes for an (H, W, 3) uint8 array
+
+    Parameters:
+        rgb: Image array
+        level: zlib compression level (1 is fast and still small for grid art)
+    """
+    height, width, _ = rgb.shape
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)  # filter byte 0 per row
+    raw[:, 1:] = rgb.reshape(height, width * 3)
+    return _encode_raw(raw, width, height, level)
+
+
+def _encode_raw(raw, width, height, level):
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n'
+            + _png_chunk(b'IHDR', header)
+            + _png_chunk(b'IDAT', zlib.compress(raw, level))
+            + _png_chunk(b'IEND', b''))
+
+
+class FrameRenderer:
+    """
+    Keeps the current frame of a mission in one RGB buffer
+
+    Only the cells a move or obstacle toggle touches are repainted, so a
+    frame costs a few cell blocks no matter how big the grid or how long
+    the path is. Colors come from palette, like Dashboard's: visited
+    cells fade from the visited blue towards cyan over five visits.
+    """
+
+    def __init__(self, grid, start, cell_px=2):
+        """
+        Parameters:
+            grid: Grid object (its current cells are the background)
+            start: Drone start position (row, col)
+            cell_px: Pixels per grid cell
+        """
+        self.grid = grid
+        self.cell_px = cell_px
+        self.palette = np.array([hex_to_rgb(COLOR_PALETTE['safe']), hex_to_rgb(COLOR_PALETTE['obstacle']),
+                                 hex_to_rgb(COLOR_PALETTE['no_fly'])], dtype=np.uint8)
+        self.drone_color = np.array(hex_to_rgb(COLOR_PALETTE['drone']), dtype=np.uint8)
+        self.visits = np.zeros((grid.size, grid.size), dtype=np.int32)
+
+        # PNG rows are stored with their filter byte, so the frame is a view
+        # into the exact bytes zlib compresses
+        side = grid.size * cell_px
+        self._raw = np.zeros((side, side * 3 + 1), dtype=np.uint8)
+        self.frame = self._raw[:, 1:].reshape(side, side, 3)
+        self._blocks = self.frame.reshape(grid.size, cell_px, grid.size, cell_px, 3)
+        self._blocks[:] = self.palette[grid.grid][:, None, :, None, :]
+
+        self.position = tuple(start)
+        self.visits[self.position] = 1
+        self._paint(self.position)
+
+    def _cell_color(self, cell):
+        count = self.visits[cell]
+        if count > 0:
+            intensity = min(1.0, count / HEAT_VISITS)
+            return np.array([base + (hot - base) * intensity for base, hot in zip(VISITED_BASE, VISITED_HOT)],
+                            dtype=np.uint8)
+        return self.palette[self.grid.grid[cell[0]][cell[1]]]
+
+    def _paint(self, cell):
+        color = self.drone_color if cell == self.position else self._cell_color(cell)
+        self._blocks[cell[0], :, cell[1], :] = color
+
+    def move(self, cell):
+        """Drone moves to cell"""
+        previous, self.position = self.position, tuple(cell)
+        self.visits[self.position] += 1
+        self._paint(previous)
+        self._paint(self.position)
+
+    def set_cell(self, cell, value):
+        """Grid edit (the grid itself is updated too)"""
+        cell = tuple(cell)
+        self.grid.set_cell(cell, value)
+        self._paint(cell)
+
+    def apply(self, event):
+        """Apply one mission_log event; returns True if the frame changed"""
+        if event['e'] == 'move':
+            self.move(event['p'])
+            return True
+        if event['e'] == 'toggle':
+            self.set_cell(event['p'], event['v'])
+            return True
+        return False
+
+    def png(self, level=1):
+        """Current frame as PNG bytes"""
+        height, width, _ = self.frame.shape
+        return _encode_raw(self._raw, width, height, level)
+
+
+def export_mission(events, out_dir=None, gif_path=None, cell_px=2, every=1, fps=30, level=1,
+                   max_gif_frames=300):
+    """
+    Render a mission to PNG frames and/or an animated GIF
+
+    PNG frames are written as they are rendered. Pillow only writes a GIF
+    once it has every frame, so the GIF keeps one frame per
+    max(every, changes / max_gif_frames) mission changes, which bounds
+    its memory however long the mission is.
+
+    Parameters:
+        events: mission_log events (or a path to a log file)
+        out_dir: Folder for frame_000000.png, ... (None = no PNGs)
+        gif_path: Animated GIF to write (needs Pillow; None = no GIF)
+        cell_px: Pixels per grid cell
+        every: Keep one frame per this many mission changes
+        fps: GIF playback rate
+        level: zlib level for the PNG frames
+        max_gif_frames: Most frames held for the GIF (plus the final state)
+
+    Returns:
+        int: Number of frames written (PNG frames if out_dir is given,
+             otherwise GIF frames)
+    """
+    from mission_log import read_log, world_from_start
+
+    if isinstance(events, str):
+        events = read_log(events)
+
+    gif_frames = []
+    gif_every = every
+    if gif_path:
+        try:
+            from PIL import Image
+        except ImportError:
+            raise ImportError("GIF export needs Pillow (pip install pillow); PNG frames work without it")
+        total = sum(1 for event in events if event['e'] in ('move', 'toggle'))
+        gif_every = max(every, -(-total // max_gif_frames))
+
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    renderer = None
+    changes = 0
+    frames = 0
+
+    def emit(png, gif):
+        nonlocal frames
+        if png and out_dir:
+            with open(os.path.join(out_dir, f'frame_{frames:06d}.png'), 'wb') as f:
+                f.write(renderer.png(level))
+            frames += 1
+        if gif and gif_path:
+            gif_frames.append(Image.fromarray(renderer.frame.copy()))
+
+    for event in events:
+        if event['e'] == 'start':
+            grid, drone = world_from_start(event)
+            renderer = FrameRenderer(grid, drone.position, cell_px=cell_px)
+            emit(True, True)
+        elif renderer is not None and renderer.apply(event):
+            changes += 1
+            emit(changes % every == 0, changes % gif_every == 0)
+
+    if renderer is not None:
+        # Always end on the final state
+        emit(changes % every != 0, changes % gif_every != 0)
+
+    if not out_dir:
+        frames = len(gif_frames)
+
+    if gif_path and gif_frames:
+        gif_frames[0].save(gif_path, save_all=True, append_images=gif_frames[1:],
+                           duration=max(1, int(1000 / fps)), loop=0)
+
+    return frames
+
+
+def path_events(grid, start, path, battery_capacity=None):
+    """Events for a simulated mission (start snapshot plus one move per cell)"""
+    events = [{'t': 0, 'e': 'start', 'size': grid.size,
+               'cells': ''.join(str(v) for v in grid.grid.ravel().tolist()),
+               'position': list(start), 'battery_capacity': battery_capacity or len(path),
+               'battery': battery_capacity or len(path), 'moving_cost': 1}]
+    events.extend({'t': t, 'e': 'move', 'p': list(cell)} for t, cell in enumerate(path))
+    return events
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    import tempfile
+    from grid import Grid
+    from drone import Drone
+    from horizon import RecedingHorizonPlanner
+
+    print("=== Frame Export Demo ===")
+    print("-" * 40)
+
+    if len(sys.argv) > 1:
+        # python frame_export.py mission.jsonl out_dir [mission.gif]
+        count = export_mission(sys.argv[1], out_dir=sys.argv[2] if len(sys.argv) > 2 else 'frames',
+                               gif_path=sys.argv[3] if len(sys.argv) > 3 else None)
+        print(f"Wrote {count} frames")
+        sys.exit(0)
+
+    grid = Grid(size=200, obstacle_prob=0.12, no_fly_zone=0.06, seedling=42)
+    grid.setstartposition((0, 0))
+    drone = Drone(startposition=(0, 0), battery_capacity=10_000)
+    segments = RecedingHorizonPlanner(grid, drone).iter_coverage(battery_limit=0)
+    path = []
+    for segment in segments:
+        path.extend(segment)
+        if len(path) >= 10_000:
+            break
+    path = path[:10_000]
+
+    with tempfile.TemporaryDirectory() as folder:
+        start_time = time.perf_counter()
+        count = export_mission(path_events(grid, (0, 0), path), out_dir=folder, cell_px=1)
+        elapsed = time.perf_counter() - start_time
+        size_mb = sum(os.path.getsize(os.path.join(folder, name)) for name in os.listdir(folder)) / 1e6
+
+    print(f"{len(path)}-step mission on 200x200: {count} PNG frames in {elapsed:.1f}s ({size_mb:.0f} MB)")
@@ -1,22 +1,89 @@
 
+import zlib
 import numpy as np
 import random
 
 
+ORTHOGONAL = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+DIAGONAL = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+DIAGONAL_COST = 2 ** 0.5
+
+
+def step_cost(posture1, posture2):
+    """Length of one move: 1 for an orthogonal step, sqrt(2) for a diagonal one"""
+    if posture1[0] != posture2[0] and posture1[1] != posture2[1]:
+        return DIAGONAL_COST
+    return 1
+
+
 class Grid:
 
-    def __init__(self, size=20, obstacle_prob=0.1, no_fly_zone=0.05, seedling=None):
+    def __init__(self, size=20, obstacle_prob=0.1, no_fly_zone=0.05, seedling=None, connectivity=4):
+        """
+        Parameters:
+            connectivity: 4 (orthogonal moves only) or 8 (diagonal moves too,
+                          at cost sqrt(2), never cutting a blocked corner)
+        """
+        if connectivity not in (4, 8):
+            raise ValueError(f"connectivity must be 4 or 8, not {connectivity}")
+
         self.size = size
         self.obstacle_prob = obstacle_prob
         self.no_fly_zone = no_fly_zone
+        self.connectivity = connectivity
 
         if seedling is not None:
             np.random.seed(seedling)
             random.seed(seedling)
 
+        # Bumped on every edit so derived fields (neighbor tables, distance
+        # fields, ...) can be cached per grid version. Code that writes to
+        # self.grid directly should call mark_changed() afterwards.
+        self.version = 0
+        self._cache = {}
+        self._fingerprint = None
+
+        # Optional traversal cost per cell (float32, e.g. headwind, altitude
+        # or sensor noise): entering a cell costs step length x its cost.
+        # None means every cell costs 1.
+        self.cost = None
+
         self.grid = None
         self.generateTheGrid()
 
+    def mark_changed(self):
+        """Invalidate every cached field derived from the grid"""
+        self.version += 1
+        self._cache.clear()
+        self._fingerprint = zlib.crc32(np.ascontiguousarray(self.grid))
+
+    def sync(self):
+        """
+        Catch direct writes (grid.grid[r][c] = ...) made without calling
+        mark_changed(): if the cells differ from the fingerprint taken at
+        the last edit, every cached field is dropped. Costs one CRC of the
+        array, so it runs once per cached() lookup and edit, not per cell.
+        """
+        if zlib.crc32(np.ascontiguousarray(self.grid)) != self._fingerprint:
+            self.mark_changed()
+
+    def cached(self, key, builder):
+        """
+        Return the cached value for key, building it once per grid version
+        (after checking for direct writes with sync())
+        """
+        self.sync()
+        return self._cached(key, builder)
+
+    def _cached(self, key, builder):
+        # No sync(): for per-move lookups of fields that depend only on the
+        # cost layer, which is only ever replaced through _set_costs()
+        entry = self._cache.get(key)
+        if entry is None or entry[0] != self.version:
+            entry = (self.version, builder())
+            self._cache[key] = entry
+        return entry[1]
+
     def generateTheGrid(self):
         self.grid = np.zeros((self.size, self.size), dtype=int)
 
@@ -28,6 +95,8 @@ class Grid:
                     self.grid[i][j] = 1
                 elif rand_val < self.obstacle_prob + self.no_fly_zone:
                     self.grid[i][j] = 2
+
+        self.mark_changed()
     
     def load_scenario(self, scenario_type):
         """Load a specific scenario type"""
@@ -89,33 +158,319 @@ class Grid:
         row, col = pos
         surround = []
         
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-
-        for hori, verti in directions:
+        for hori, verti in ORTHOGONAL:
             newposition = (row + hori, col + verti)
             if self.isvalid(newposition):
                 surround.append(newposition)
 
+        if self.connectivity == 8:
+            # A diagonal move needs both cells it passes between to be open
+            for hori, verti in DIAGONAL:
+                newposition = (row + hori, col + verti)
+                if (self.isvalid(newposition) and self.isvalid((row + hori, col))
+                        and self.isvalid((row, col + verti))):
+                    surround.append(newposition)
+
         return surround
+
+    def moves(self, pos):
+        """(neighbor, move cost) pairs for every move allowed from pos"""
+        if self.cost is not None:
+            costs = self.cost_lists()
+            return [(other, step_cost(pos, other) * costs[other[0]][other[1]])
+                    for other in self.surroundings(pos)]
+        if self.connectivity == 4:
+            return [(other, 1) for other in self.surroundings(pos)]
+        return [(other, step_cost(pos, other)) for other in self.surroundings(pos)]
+
+    def set_cost_layer(self, costs):
+        """
+        Set the per-cell traversal cost
+
+        Parameters:
+            costs: size x size array of positive costs, or None for uniform cost 1
+        """
+        if costs is not None:
+            costs = np.array(costs, dtype=np.float32)
+            if costs.shape != (self.size, self.size):
+                raise ValueError(f"cost layer must be {self.size}x{self.size}, not {costs.shape}")
+            if not (costs > 0).all():
+                raise ValueError("cell costs must be positive")
+        self._set_costs(costs)
+
+    def add_cost_region(self, top_left, bottom_right, factor):
+        """Multiply the cost of a rectangle of cells (corners inclusive) by factor"""
+        if factor <= 0:
+            raise ValueError("cost factor must be positive")
+        costs = np.ones((self.size, self.size), dtype=np.float32) if self.cost is None else self.cost.copy()
+        (r0, c0), (r1, c1) = top_left, bottom_right
+        costs[max(r0, 0):r1 + 1, max(c0, 0):c1 + 1] *= factor
+        self._set_costs(costs)
+
+    def _set_costs(self, costs):
+        # Costs do not change which cells connect, so keep the labels
+        entry = self._cache.get('component_labels')
+        labels = entry[1] if entry is not None and entry[0] == self.version else None
+        self.cost = costs
+        self.mark_changed()
+        self._keep_components(labels)
+
+    def cell_cost(self, pos):
+        """Traversal cost of one cell (1 without a cost layer)"""
+        if self.cost is None:
+            return 1
+        return float(self.cost[pos[0]][pos[1]])
+
+    def move_cost(self, pos, nextpos):
+        """Energy (in units of moving_cost) of one move from pos into nextpos"""
+        if self.cost is None:
+            return step_cost(pos, nextpos)
+        return step_cost(pos, nextpos) * float(self.cost[nextpos[0]][nextpos[1]])
+
+    def cost_lists(self):
+        """Cost layer as nested lists (fast to index in search loops), cached per grid version"""
+        return self._cached('cost_lists', lambda: None if self.cost is None else self.cost.tolist())
+
+    def cost_floor(self):
+        """Cheapest cell cost, which scales distance heuristics so they stay admissible"""
+        if self.cost is None:
+            return 1
+        return self._cached('cost_floor', lambda: float(self.cost.min()))
     
+    def component_labels(self):
+        """
+        Connected-component label of every cell under 4-connected movement
+        (-1 on obstacle and no-fly cells). Two safe cells are mutually
+        reachable exactly when their labels match. Diagonal moves never cut
+        corners, so they join nothing new and the labels hold for 8-connected
+        grids too. Cached per grid version
+        and patched in place by set_cell/toggle_obstacle where possible.
+        """
+        return self.cached('component_labels', self._build_component_labels)
+
+    def _build_component_labels(self):
+        neighbors, _, _ = self.neighbor_table()
+        neighbors = neighbors.tolist()
+        free = (self.grid == 0).ravel().tolist()
+
+        labels = [-1] * (self.size * self.size)
+        next_label = 0
+        for seed in range(len(labels)):
+            if not free[seed] or labels[seed] != -1:
+                continue
+            labels[seed] = next_label
+            stack = [seed]
+            while stack:
+                cell = stack.pop()
+                for other in neighbors[cell]:
+                    if other >= 0 and labels[other] == -1:
+                        labels[other] = next_label
+                        stack.append(other)
+            next_label += 1
+
+        return np.array(labels, dtype=np.int32).reshape(self.size, self.size)
+
+    def _edited_components(self, pos, old_value, new_value):
+        """
+        Labels after changing one cell, derived from the current labels
+        without a full relabel, or None when a rebuild is needed (or no
+        labels were cached to begin with).
+        """
+        entry = self._cache.get('component_labels')
+        if entry is None or entry[0] != self.version:
+            return None
+
+        was_free, now_free = old_value == 0, new_value == 0
+        if was_free == now_free:
+            return entry[1]
+
+        row, col = pos
+        labels = entry[1].copy()
+        around = [labels[r][c] for r, c in
+                  ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+                  if 0 <= r < self.size and 0 <= c < self.size and labels[r][c] >= 0]
+
+        if now_free:
+            # Opening a cell can only join the components around it
+            if not around:
+                labels[row][col] = labels.max() + 1
+            else:
+                target = min(around)
+                labels[np.isin(labels, around)] = target
+                labels[row][col] = target
+            return labels
+
+        # Closing a cell with at most one open neighbor cannot split anything
+        if len(around) <= 1:
+            labels[row][col] = -1
+            return labels
+        return None
+
+    def _keep_components(self, labels):
+        if labels is not None:
+            self._cache['component_labels'] = (self.version, labels)
+
+    def reachable(self, start, goal):
+        """True if goal can be reached from start (O(1) once labels are cached)"""
+        if not self.isvalid(start) or not self.isvalid(goal):
+            return False
+        labels = self.component_labels()
+        return labels[start[0]][start[1]] == labels[goal[0]][goal[1]]
+
+    def reachable_mask(self, pos):
+        """Boolean mask of every cell reachable from pos (all False if pos is blocked)"""
+        if not self.isvalid(pos):
+            return np.zeros((self.size, self.size), dtype=bool)
+        labels = self.component_labels()
+        return labels == labels[pos[0]][pos[1]]
+
     def typeofcall(self, pos):
         row, col = pos
         if row < 0 or row >= self.size or col < 0 or col >= self.size:
             return -1
         
         return self.grid[row][col]
+
+    def neighbor_table(self):
+        """
+        Flat-index neighbor table for vectorized walkers.
+
+        Returns (neighbors, directions, degree): neighbors[i] lists the flat
+        indices of the valid 4-neighbors of cell i (whatever the grid's
+        connectivity) packed to the front and
+        padded with -1, directions[i] the matching index into the
+        (-1,0),(1,0),(0,-1),(0,1) direction list, and degree[i] how many
+        entries are valid.
+        """
+        return self.cached('neighbor_table', self._build_neighbor_table)
+
+    def _build_neighbor_table(self):
+        size = self.size
+        free = (self.grid == 0).ravel()
+        rows, cols = np.divmod(np.arange(size * size), size)
+
+        candidates = np.full((size * size, 4), -1, dtype=np.int64)
+        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        for k, (dr, dc) in enumerate(directions):
+            nr, nc = rows + dr, cols + dc
+            inside = (nr >= 0) & (nr < size) & (nc >= 0) & (nc < size)
+            flat = np.where(inside, nr * size + nc, 0)
+            ok = inside & free[flat]
+            candidates[:, k] = np.where(ok, flat, -1)
+
+        # Stable sort moves the valid neighbors to the front of each row
+        order = np.argsort(candidates < 0, axis=1, kind='stable')
+        neighbors = np.take_along_axis(candidates, order, axis=1)
+        dirs = np.where(neighbors >= 0, order, -1)
+        degree = np.sum(neighbors >= 0, axis=1)
+        return neighbors, dirs, degree
+
+    def move_table(self):
+        """
+        Flat-index table of the moves surroundings() allows, under the
+        grid's connectivity (diagonals included on 8-connected grids).
+
+        Returns (neighbors, degree): neighbors[i] holds the valid neighbors
+        of cell i, repeated cyclically to fill the row (so any slot below
+        degree[i] and slot % degree[i] both name one), and degree[i] how
+        many there are. Cells with no valid neighbor hold themselves and
+        report degree 1 so walkers simply stay put. Cached per grid version.
+        """
+        return self.cached('move_table', self._build_move_table)
+
+    def _build_move_table(self):
+        size = self.size
+        free = np.pad(self.grid == 0, 1)
+        rows, cols = np.divmod(np.arange(size * size), size)
+
+        def open_at(dr, dc):
+            return free[rows + 1 + dr, cols + 1 + dc]
+
+        directions = ORTHOGONAL + (DIAGONAL if self.connectivity == 8 else [])
+        candidates = np.full((size * size, len(directions)), -1, dtype=np.int64)
+        for k, (dr, dc) in enumerate(directions):
+            ok = open_at(dr, dc)
+            if dr and dc:
+                # No cutting corners, as in surroundings()
+                ok &= open_at(dr, 0) & open_at(0, dc)
+            candidates[:, k] = np.where(ok, (rows + dr) * size + cols + dc, -1)
+
+        order = np.argsort(candidates < 0, axis=1, kind='stable')
+        packed = np.take_along_axis(candidates, order, axis=1)
+        degree = np.sum(packed >= 0, axis=1)
+        slot = np.arange(len(directions))[None, :] % np.maximum(degree, 1)[:, None]
+        neighbors = np.take_along_axis(packed, slot, axis=1)
+        neighbors = np.where(degree[:, None] > 0, neighbors, np.arange(size * size)[:, None])
+        return neighbors, np.maximum(degree, 1)
+
+    def transition_table(self):
+        """
+        Uniform random-walk transitions for 4-connected movement: row i
+        holds 12 entries (lcm of 1..4) so a uniform choice among them is a
+        uniform choice among the valid neighbors of cell i, padded to 16.
+        Entries are stored as next_cell * 16, so walkers chain lookups by
+        adding their choice and recover cells with a shift. 8-connected
+        grids would need lcm(1..8) = 840 entries per cell; walkers there
+        pick slot % degree from move_table() instead.
+        """
+        return self.cached('transition_table', self._build_transition_table)
+
+    def _build_transition_table(self):
+        neighbors, degree = self.move_table()
+        if self.connectivity != 4:
+            raise ValueError("transition_table() is for 4-connected grids; use move_table()")
+        table = np.zeros((self.size * self.size, 16), dtype=np.int64)
+        slot = np.arange(12)[None, :] % degree[:, None]
+        table[:, :12] = np.take_along_axis(neighbors, slot, axis=1)
+        return table * 16
+
+    def clearance_field(self):
+        """
+        Chebyshev distance from every cell to the nearest obstacle or no-fly
+        cell: 0 on blocked cells, 1 on cells touching one (including
+        diagonally), and so on. Cells with nothing blocked in range get
+        the grid size. Cached per grid version.
+        """
+        return self.cached('clearance_field', self._build_clearance_field)
+
+    def _build_clearance_field(self):
+        blocked = self.grid != 0
+        clearance = np.full((self.size, self.size), float(self.size))
+        clearance[blocked] = 0.0
+
+        reached = blocked.copy()
+        frontier = blocked
+        distance = 0
+        while frontier.any() and not reached.all():
+            distance += 1
+            # Grow the frontier by one ring (3x3 dilation)
+            padded = np.pad(frontier, 1)
+            grown = np.zeros_like(frontier)
+            for dr in (0, 1, 2):
+                for dc in (0, 1, 2):
+                    grown |= padded[dr:dr + self.size, dc:dc + self.size]
+            frontier = grown & ~reached
+            clearance[frontier] = distance
+            reached |= frontier
+
+        return clearance
     
 
     def setstartposition(self, pos):
         row, col = pos
         if 0 <= row < self.size and 0 <= col < self.size:
             self.grid[row][col] = 0
+            self.mark_changed()
     
     def set_cell(self, pos, value):
         """Set a specific cell to a given value (0=safe, 1=obstacle, 2=no-fly)"""
         row, col = pos
         if 0 <= row < self.size and 0 <= col < self.size:
+            self.sync()
+            labels = self._edited_components(pos, self.grid[row][col], value)
             self.grid[row][col] = value
+            self.mark_changed()
+            self._keep_components(labels)
             return True
         return False
     
@@ -123,13 +478,19 @@ class Grid:
         """Toggle a cell between safe (0) and obstacle (1)"""
         row, col = pos
         if 0 <= row < self.size and 0 <= col < self.size:
+            self.sync()
             current = self.grid[row][col]
             # Toggle between safe and obstacle
+            new_value = current
             if current == 0:
-                self.grid[row][col] = 1
+                new_value = 1
             elif current == 1:
-                self.grid[row][col] = 0
+                new_value = 0
             # Don't toggle no-fly zones
+            labels = self._edited_components(pos, current, new_value)
+            self.grid[row][col] = new_value
+            self.mark_changed()
+            self._keep_components(labels)
             return True
         return False
     
@@ -0,0 +1,189 @@
+"""
+Receding-Horizon Planner for Drone Path Optimizer
+Plans only a short stretch inside a window around the drone and replans
+every few steps. A global field (distance to the goal, or to the nearest
+unvisited cell) acts as the terminal cost for leaving the window; it is
+cached and only rebuilt when its sources change or the local plan stops
+making progress.
+"""
+
+import heapq
+from a_star import cost_field, flood_field, path_cost
+
+
+class RecedingHorizonPlanner:
+    """
+    Windowed replanning: each round searches only the (2 * window + 1)^2
+    cells around the cursor and commits to the first replan_every moves,
+    so the per-step cost depends on the window, not the map
+    """
+
+    def __init__(self, grid, drone, window=6, replan_every=3):
+        """
+        Parameters:
+            grid: Grid object
+            drone: Drone object (planning starts from its position and battery)
+            window: Half-width of the local search square
+            replan_every: Moves committed before the window is replanned
+        """
+        self.grid = grid
+        self.drone = drone
+        self.window = window
+        self.replan_every = replan_every
+        self.field_builds = 0
+
+        self._field = None
+        self._field_key = None
+
+    def _terminal_field(self, sources, key, rebuild=False):
+        """Global terminal cost, kept until rebuild is asked for or key changes"""
+        if rebuild or self._field is None or key != self._field_key:
+            self._field = flood_field(self.grid, sources, toward=True)
+            self._field_key = key
+            self.field_builds += 1
+        return self._field
+
+    def _local_search(self, position):
+        """
+        Dijkstra over grid.moves limited to the window around position;
+        returns (steps, parents), steps being energy like path_cost (plain
+        step counts on 4-connected grids without a cost layer)
+        """
+        row0, col0 = position
+        steps = {}
+        best = {position: 0}
+        parents = {position: None}
+        openset = [(0, position)]
+        while openset:
+            energy, cell = heapq.heappop(openset)
+            if cell in steps:
+                continue
+            steps[cell] = energy
+            for other, move_cost in self.grid.moves(cell):
+                new_energy = energy + move_cost
+                if (abs(other[0] - row0) <= self.window and abs(other[1] - col0) <= self.window
+                        and new_energy < best.get(other, float('inf'))):
+                    best[other] = new_energy
+                    parents[other] = cell
+                    heapq.heappush(openset, (new_energy, other))
+        return steps, parents
+
+    def _choose(self, position, steps, targets, key):
+        """
+        Local target: the nearest cell in targets if the window holds one,
+        otherwise the window cell minimising steps + terminal cost that
+        gets strictly closer (per the field) than position
+        """
+        local = [cell for cell in steps if cell in targets and cell != position]
+        if local:
+            return min(local, key=lambda cell: (steps[cell], cell))
+
+        for rebuild in (False, True):
+            field = self._terminal_field(targets, key, rebuild=rebuild)
+            here = field[position[0]][position[1]]
+            best, best_cost = None, None
+            for cell, k in steps.items():
+                value = field[cell[0]][cell[1]]
+                if value < 0 or (here >= 0 and value >= here):
+                    continue
+                cost = (k + value, cell)
+                if best_cost is None or cost < best_cost:
+                    best, best_cost = cell, cost
+            if best is not None:
+                return best
+        return None
+
+    def _commit(self, target, parents):
+        """First replan_every moves of the local path to target"""
+        path = []
+        cell = target
+        while parents[cell] is not None:
+            path.append(cell)
+            cell = parents[cell]
+        path.reverse()
+        return path[:self.replan_every]
+
+    def iter_goal(self, goal, position=None):
+        """
+        Stream segments (moves only) from position (default: the drone's)
+        to goal, replanning the window every replan_every moves
+        """
+        goal = tuple(goal)
+        position = tuple(position or self.drone.position)
+        while position != goal:
+            steps, parents = self._local_search(position)
+            target = self._choose(position, steps, {goal}, ('goal', goal))
+            if target is None:
+                return
+            segment = self._commit(target, parents)
+            position = segment[-1]
+            yield segment
+
+    def iter_coverage(self, battery_limit=None, end_point=None):
+        """
+        Receding-horizon counterpart of CoveragePlanner.iter_adaptive_coverage:
+        same segment stream and battery reserve, but each round only looks
+        at the window around the cursor
+
+        Parameters:
+            battery_limit: Battery to keep in reserve (default 20% of capacity)
+            end_point: Optional cell to finish at; battery for reaching it
+                       is held back while covering
+        """
+        from coverage import CoveragePlanner
+
+        if battery_limit is None:
+            battery_limit = self.drone.battery_capacity * 0.2
+
+        unvisited = CoveragePlanner(self.grid, self.drone).get_unvisited_safe_cells()
+        position = self.drone.position
+        battery = self.drone.battery
+        moving_cost = self.drone.moving_cost
+        home = cost_field(self.grid, tuple(end_point)) if end_point else None
+
+        while unvisited:
+            steps, parents = self._local_search(position)
+            # Unvisited only shrinks, so its size identifies the field's sources
+            target = self._choose(position, steps, unvisited, ('coverage', len(unvisited)))
+            if target is None:
+                break
+            segment = self._commit(target, parents)
+
+            reserve = battery_limit
+            if home is not None:
+                reserve += max(home[segment[-1][0]][segment[-1][1]], 0) * moving_cost
+            energy = path_cost([position] + segment, self.grid) * moving_cost
+            if battery - energy < reserve:
+                break
+
+            unvisited.difference_update(segment)
+            position = segment[-1]
+            battery -= energy
+            yield segment
+
+        if end_point:
+            yield from self.iter_goal(end_point, position=position)
+
+
+if __name__ == "__main__":
+    import time
+    from grid import Grid
+    from drone import Drone
+    from coverage import CoveragePlanner
+
+    print("=== Receding-Horizon Planner Demo ===")
+    print("-" * 40)
+
+    for size in (40, 80):
+        grid = Grid(size=size, obstacle_prob=0.12, no_fly_zone=0.06, seedling=42)
+        grid.setstartposition((0, 0))
+
+        drone = Drone(startposition=(0, 0), battery_capacity=size * size * 2)
+        planner = RecedingHorizonPlanner(grid, drone)
+        start_time = time.perf_counter()
+        path = [cell for segment in planner.iter_coverage(battery_limit=20) for cell in segment]
+        elapsed = time.perf_counter() - start_time
+
+        coverage = CoveragePlanner(grid, drone).estimate_coverage_percent(path)
+        print(f"{size}x{size}: {len(path)} steps, {coverage:.1f}% coverage, "
+              f"{elapsed * 1e6 / max(len(path), 1):.0f}us/step, {planner.field_builds} field builds")
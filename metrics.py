@@ -6,6 +6,7 @@ safety scoring, and energy breakdown analysis.
 
 import numpy as np
 import random
+from grid import DIAGONAL_COST
 
 
 def calculate_turns(path):
@@ -91,6 +92,178 @@ def calculate_random_baseline(grid, start_pos, battery_capacity):
     }
 
 
+def _summarize(samples):
+    """Mean, spread and 95% confidence interval of the mean for a sample array"""
+    samples = np.asarray(samples, dtype=float)
+    mean = float(samples.mean()) if samples.size else 0.0
+    std = float(samples.std(ddof=1)) if samples.size > 1 else 0.0
+    half_width = 1.96 * std / np.sqrt(samples.size) if samples.size else 0.0
+
+    return {
+        'mean': mean,
+        'std': std,
+        'ci95': (mean - half_width, mean + half_width)
+    }
+
+
+def calculate_monte_carlo_baseline(grid, start_pos, battery_capacity, walkers=1000,
+                                   moving_cost=1, seed=None, chunk=1024, max_cells=50_000_000):
+    """
+    Random-walk baseline averaged over many walkers advanced together
+
+    Every walker follows the same rules as calculate_random_baseline
+    (uniform choice among the moves grid.surroundings allows, diagonals
+    included on 8-connected grids and costing sqrt(2) times as much,
+    stop when the battery cannot pay for the next move or when stuck),
+    but all of them step at once through a precomputed table. Coverage,
+    turns and battery are derived from the recorded trajectories once per
+    chunk of steps, so the per-step work is a couple of array operations
+    for the whole batch.
+
+    Parameters:
+        grid: Grid object
+        start_pos: Starting position (row, col)
+        battery_capacity: Maximum battery available
+        walkers: Number of random walks to simulate
+        moving_cost: Battery cost per move
+        seed: Optional seed for reproducible baselines
+        chunk: Number of steps recorded between bookkeeping passes
+        max_cells: Upper bound on walkers * cells tracked at once; walkers
+                   are simulated in batches to stay under it
+
+    Returns:
+        dict: Mean baseline statistics (path_length, coverage, turns,
+              battery_used) plus a 'distribution' entry with the mean, std
+              and 95% confidence interval of each
+    """
+    rng = np.random.default_rng(seed)
+    diagonal = grid.connectivity == 8
+    if diagonal:
+        # lcm(1..8) = 840: draw % degree is an exact uniform choice
+        neighbors, degree = grid.move_table()
+        width = neighbors.shape[1]
+        flat_neighbors = neighbors.ravel().astype(np.int32)
+        degree = degree.astype(np.uint16)
+    else:
+        flat_transitions = grid.transition_table().ravel().astype(np.int32)
+
+    n_cells = grid.size * grid.size
+    max_steps = int(battery_capacity // moving_cost)
+    start = start_pos[0] * grid.size + start_pos[1]
+    batch = max(1, min(walkers, max_cells // max(1, n_cells)))
+
+    lengths, coverages, turn_counts, spent = [], [], [], []
+
+    for offset in range(0, walkers, batch):
+        k = min(batch, walkers - offset)
+        row_offsets = np.arange(k, dtype=np.intp) * n_cells
+
+        # 4-connected walker state is cell * 16 so the next lookup is
+        # state + choice; 8-connected state is the cell itself
+        state = np.full(k, start if diagonal else start * 16, dtype=np.int32)
+        lookup = np.empty(k, dtype=np.intp)
+        if diagonal:
+            ways = np.empty(k, dtype=np.uint16)
+            slot = np.empty(k, dtype=np.uint16)
+        seen = np.zeros(k * n_cells, dtype=bool)
+        seen[row_offsets + start] = True
+
+        steps = np.zeros(k, dtype=np.int64)
+        turns = np.zeros(k, dtype=np.int64)
+        energy = np.zeros(k)
+        out_of_battery = np.zeros(k, dtype=bool)
+        previous_cell = np.full(k, start, dtype=np.int32)
+        previous_move = np.zeros(k, dtype=np.int32)
+
+        done = 0
+        while done < max_steps:
+            span = min(chunk, max_steps - done)
+            trajectory = np.empty((span, k), dtype=np.int32)
+
+            if diagonal:
+                draws = rng.integers(0, 840, size=(span, k), dtype=np.uint16)
+                for t in range(span):
+                    degree.take(state, out=ways)
+                    np.remainder(draws[t], ways, out=slot)
+                    np.multiply(state, width, out=lookup)
+                    lookup += slot
+                    flat_neighbors.take(lookup, out=trajectory[t])
+                    state = trajectory[t]
+                cells = trajectory
+            else:
+                choices = rng.integers(0, 12, size=(span, k), dtype=np.uint8)
+                for t in range(span):
+                    np.add(state, choices[t], out=lookup)
+                    flat_transitions.take(lookup, out=trajectory[t])
+                    state = trajectory[t]
+                cells = trajectory >> 4
+
+            # Moves are flat-index deltas (+-1, +-size, and +-size+-1 when
+            # diagonal); stuck walkers stay put
+            moves = np.diff(cells, axis=0, prepend=previous_cell[None, :])
+            moving = moves != 0
+            if diagonal:
+                # A walker is done once the battery cannot pay for its next move
+                distance = np.abs(moves)
+                cost = np.where((distance == 1) | (distance == grid.size), moving_cost, DIAGONAL_COST * moving_cost)
+                used = energy + np.cumsum(cost * moving, axis=0)
+                alive = (used <= battery_capacity + 1e-9) & ~out_of_battery
+                moving &= alive
+                energy = np.maximum(energy, np.where(alive, used, 0).max(axis=0))
+                out_of_battery |= ~alive[-1]
+                seen[(cells + row_offsets)[moving]] = True
+            else:
+                seen[cells + row_offsets] = True
+            steps += moving.sum(axis=0)
+
+            chained = np.diff(moves, axis=0, prepend=previous_move[None, :])
+            turned = (chained != 0) & moving
+            turned[0] &= previous_move != 0
+            turns += turned.sum(axis=0)
+
+            previous_cell = cells[-1]
+            previous_move = moves[-1]
+            done += span
+
+            # Every walker is pinned in a dead end or out of battery; nothing left to simulate
+            if not moving[-1].any():
+                break
+
+        lengths.append(steps)
+        coverages.append(seen.reshape(k, n_cells).sum(axis=1))
+        turn_counts.append(turns)
+        spent.append(energy if diagonal else steps * moving_cost)
+
+    lengths = np.concatenate(lengths)
+    coverages = np.concatenate(coverages)
+    turn_counts = np.concatenate(turn_counts)
+    battery = np.concatenate(spent)
+
+    distribution = {
+        'path_length': _summarize(lengths),
+        'coverage': _summarize(coverages),
+        'turns': _summarize(turn_counts),
+        'battery_used': _summarize(battery)
+    }
+
+    return {
+        'path_length': distribution['path_length']['mean'],
+        'coverage': distribution['coverage']['mean'],
+        'turns': distribution['turns']['mean'],
+        'battery_used': distribution['battery_used']['mean'],
+        'walkers': walkers,
+        'distribution': distribution
+    }
+
+
+def _path_cells(path, grid):
+    """Split a path into row/col arrays plus a mask of in-bounds positions"""
+    positions = np.asarray(path, dtype=np.int64).reshape(-1, 2)
+    rows, cols = positions[:, 0], positions[:, 1]
+    inside = (rows >= 0) & (rows < grid.size) & (cols >= 0) & (cols < grid.size)
+    return rows, cols, inside
+
+
 def safety_score(path, grid):
     """
     Calculate safety score (0-100) for a path
@@ -106,30 +279,31 @@ def safety_score(path, grid):
     if not path:
         return 100
     
-    violations = 0
-    total_checks = len(path)
-    
-    for pos in path:
-        row, col = pos
-        
-        # Check bounds
-        if row < 0 or row >= grid.size or col < 0 or col >= grid.size:
-            violations += 1
-            continue
-        
-        # Check cell type
-        cell_type = grid.typeofcall(pos)
-        if cell_type == 1 or cell_type == 2:  # Obstacle or no-fly
-            violations += 1
-    
-    # Calculate score
-    if total_checks == 0:
-        return 100
+    rows, cols, inside = _path_cells(path, grid)
+    total_checks = len(rows)
+
+    # Out of bounds, obstacle or no-fly positions all count as violations
+    safe = np.zeros(total_checks, dtype=bool)
+    safe[inside] = grid.grid[rows[inside], cols[inside]] == 0
+    violations = int(total_checks - np.count_nonzero(safe))
     
     score = int(((total_checks - violations) / total_checks) * 100)
     return max(0, min(100, score))  # Clamp between 0 and 100
 
 
+def _path_clearance(path, grid):
+    """Clearance of every safe position on the path (collisions are skipped)"""
+    if not path:
+        return np.zeros(0)
+
+    rows, cols, inside = _path_cells(path, grid)
+    rows, cols = rows[inside], cols[inside]
+    clearance = grid.clearance_field()[rows, cols]
+
+    # Blocked cells have zero clearance; those are collisions, not close calls
+    return clearance[clearance > 0]
+
+
 def calculate_safety_buffer_violations(path, grid):
     """
     Count how many times the path comes dangerously close to obstacles
@@ -142,39 +316,31 @@ def calculate_safety_buffer_violations(path, grid):
     Returns:
         int: Number of close calls
     """
-    violations = 0
+    # A clearance of 1 means one of the 8 surrounding cells is blocked
+    return int(np.count_nonzero(_path_clearance(path, grid) == 1))
+
+
+def calculate_clearance_stats(path, grid):
+    """
+    Minimum and mean distance (Chebyshev, in cells) between the path and
+    the nearest obstacle or no-fly zone
     
-    for pos in path:
-        row, col = pos
-        
-        # Check if we're in a safe cell
-        if not grid.isvalid(pos):
-            continue  # Skip invalid cells (those are actual collisions)
+    Parameters:
+        path: List of (row, col) tuples
+        grid: Grid object
         
-        # Check all 8 surrounding cells (diagonal + adjacent)
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue  # Skip current cell
-                
-                neighbor_row = row + dr
-                neighbor_col = col + dc
-                
-                # Check bounds
-                if (neighbor_row < 0 or neighbor_row >= grid.size or 
-                    neighbor_col < 0 or neighbor_col >= grid.size):
-                    continue
-                
-                # Check if neighbor is an obstacle
-                neighbor_type = grid.grid[neighbor_row][neighbor_col]
-                if neighbor_type == 1 or neighbor_type == 2:
-                    violations += 1
-                    break  # Count only once per position
-            else:
-                continue
-            break
-    
-    return violations
+    Returns:
+        dict: 'min_clearance' and 'mean_clearance' (grid size when no
+              obstacle exists, 0 for an empty path)
+    """
+    clearance = _path_clearance(path, grid)
+    if clearance.size == 0:
+        return {'min_clearance': 0.0, 'mean_clearance': 0.0}
+
+    return {
+        'min_clearance': float(clearance.min()),
+        'mean_clearance': float(clearance.mean())
+    }
 
 
 def energy_breakdown(path):
@@ -197,11 +363,19 @@ def energy_breakdown(path):
             'turn_penalty_cost': 0
         }
     
+    from grid import step_cost
+
     straight_moves = 0
     turn_moves = 0
+    # Flown length of the straight / turning moves (diagonals are sqrt(2) long)
+    straight_length = 0
+    turn_length = 0
+    # 45 degree turns (only possible with diagonal moves) pay half the penalty
+    penalty_units = 0
     
     # First move is always straight
     straight_moves = 1
+    straight_length = step_cost(path[0], path[1])
     
     # Check each subsequent move
     for i in range(1, len(path) - 1):
@@ -216,8 +390,11 @@ def energy_breakdown(path):
         # If directions are the same, it's a straight move
         if dir1 == dir2:
             straight_moves += 1
+            straight_length += step_cost(curr_pos, next_pos)
         else:
             turn_moves += 1
+            turn_length += step_cost(curr_pos, next_pos)
+            penalty_units += 1 if dir1[0] * dir2[0] + dir1[1] * dir2[1] > 0 else 2
     
     # Last move
     if len(path) >= 3:
@@ -225,18 +402,22 @@ def energy_breakdown(path):
         second_last_dir = (path[-2][0] - path[-3][0], path[-2][1] - path[-3][1])
         if prev_dir == second_last_dir:
             straight_moves += 1
+            straight_length += step_cost(path[-2], path[-1])
         else:
             turn_moves += 1
+            turn_length += step_cost(path[-2], path[-1])
+            penalty_units += 1 if prev_dir[0] * second_last_dir[0] + prev_dir[1] * second_last_dir[1] > 0 else 2
     elif len(path) == 2:
         straight_moves += 1
+        straight_length += step_cost(path[0], path[1])
     
-    # Energy costs (assuming 1 unit for straight, 3 units for turn with 2x penalty)
+    # Energy costs (1 unit per cell flown, plus 2 units per 90+ degree turn)
     base_cost = 1
     turn_penalty = 2
     
-    straight_energy = straight_moves * base_cost
-    turn_energy = turn_moves * (base_cost + turn_penalty)
-    turn_penalty_cost = turn_moves * turn_penalty
+    straight_energy = straight_length * base_cost
+    turn_penalty_cost = penalty_units * turn_penalty // 2
+    turn_energy = turn_length * base_cost + turn_penalty_cost
     total_energy = straight_energy + turn_energy
     
     return {
@@ -250,7 +431,7 @@ def energy_breakdown(path):
     }
 
 
-def get_comprehensive_metrics(path, grid, drone, existing_baseline=None):
+def get_comprehensive_metrics(path, grid, drone, existing_baseline=None, walkers=1000):
     """
     Get all metrics in one call for dashboard display
     
@@ -258,6 +439,8 @@ def get_comprehensive_metrics(path, grid, drone, existing_baseline=None):
         path: The complete path taken/planned
         grid: Grid object
         drone: Drone object (for baseline comparison)
+        existing_baseline: Baseline dict to reuse instead of simulating one
+        walkers: Random walks averaged for the baseline when none is given
         
     Returns:
         dict: Comprehensive metrics dictionary
@@ -267,12 +450,15 @@ def get_comprehensive_metrics(path, grid, drone, existing_baseline=None):
     energy = energy_breakdown(path)
     safety = safety_score(path, grid)
     buffer_violations = calculate_safety_buffer_violations(path, grid)
+    clearance = calculate_clearance_stats(path, grid)
     
-    # Generate random baseline for comparison
+    # Generate random baseline for comparison (averaged over many walkers
+    # rather than trusting a single noisy walk)
     if existing_baseline:
         baseline = existing_baseline
     else:
-        baseline = calculate_random_baseline(grid, drone.startposition, drone.battery_capacity)
+        baseline = calculate_monte_carlo_baseline(grid, drone.startposition, drone.battery_capacity,
+                                                  walkers=walkers, moving_cost=drone.moving_cost)
     
     # Comparison stats
     coverage_improvement = 0
@@ -292,13 +478,18 @@ def get_comprehensive_metrics(path, grid, drone, existing_baseline=None):
         path_length = len(path)
         path_length_improvement = ((path_length - baseline['path_length']) / baseline['path_length']) * 100
     
+    from a_star import path_cost
+
     return {
         'path_length': len(path),
+        'flight_distance': path_cost(path),
         'path_length_improvement': path_length_improvement,
         'turns': turns,
         'energy': energy,
         'safety_score': safety,
         'buffer_violations': buffer_violations,
+        'min_clearance': clearance['min_clearance'],
+        'mean_clearance': clearance['mean_clearance'],
         'baseline': baseline,
         'coverage_improvement': coverage_improvement,
         'turn_reduction': turn_reduction
@@ -334,6 +525,7 @@ if __name__ == "__main__":
     print(f"  Turns: {metrics['turns']}")
     print(f"  Safety Score: {metrics['safety_score']}/100")
     print(f"  Buffer Violations: {metrics['buffer_violations']}")
+    print(f"  Clearance: min {metrics['min_clearance']:.0f} | mean {metrics['mean_clearance']:.2f} cells")
     
     print(f"\nEnergy Breakdown:")
     print(f"  Straight Moves: {metrics['energy']['straight_moves']} ({metrics['energy']['straight_energy']} energy)")
@@ -342,9 +534,11 @@ if __name__ == "__main__":
     print(f"  Movement Efficiency: {metrics['energy']['efficiency']:.1f}%")
     
     print(f"\nBaseline Comparison:")
-    print(f"  Random Coverage: {metrics['baseline']['coverage']} cells")
+    print(f"  Random Coverage: {metrics['baseline']['coverage']:.1f} cells "
+          f"(95% CI {metrics['baseline']['distribution']['coverage']['ci95'][0]:.1f}"
+          f"-{metrics['baseline']['distribution']['coverage']['ci95'][1]:.1f})")
     print(f"  Our Coverage: {drone.get_coverage_count()} cells")
     print(f"  Improvement: {metrics['coverage_improvement']:+.1f}%")
-    print(f"  Random Turns: {metrics['baseline']['turns']}")
+    print(f"  Random Turns: {metrics['baseline']['turns']:.1f}")
     print(f"  Our Turns: {metrics['turns']}")
     print(f"  Turn Reduction: {metrics['turn_reduction']:+.1f}%")
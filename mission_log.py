@@ -0,0 +1,183 @@
+"""
+Mission Log for Drone Path Optimizer
+Append-only JSONL record of a mission (grid snapshot, moves, obstacle
+toggles, replans, emergency returns) and a headless replay engine that
+re-executes it against Grid/Drone at full speed.
+"""
+
+import json
+import numpy as np
+from grid import Grid
+from drone import Drone
+
+
+class MissionLog:
+    """
+    One JSON object per line, written as events happen. The file is line
+    buffered, so every recorded event is on disk right away and a crashed
+    or killed mission still leaves a log to replay up to that point.
+
+    Every event has 't' (the mission step it happened at) and 'e' (its
+    kind): 'start', 'move', 'toggle', 'replan', 'emergency' or 'end'.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'w', buffering=1)
+
+    def record(self, kind, t, **data):
+        """Append one event"""
+        event = {'t': t, 'e': kind}
+        for key, value in data.items():
+            event[key] = _plain(value)
+        self._file.write(json.dumps(event, separators=(',', ':')) + '\n')
+
+    def start(self, grid, drone, destination=None, clearance_weight=0):
+        """First event of a mission: everything replay needs to rebuild the world"""
+        self.record('start', 0,
+                    size=grid.size,
+                    connectivity=grid.connectivity,
+                    cells=''.join(str(v) for v in grid.grid.ravel().tolist()),
+                    cost=None if grid.cost is None else grid.cost.ravel().tolist(),
+                    position=drone.position,
+                    battery_capacity=drone.battery_capacity,
+                    battery=drone.battery,
+                    moving_cost=drone.moving_cost,
+                    destination=destination,
+                    clearance_weight=clearance_weight)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _plain(value):
+    """Tuples and numpy scalars to JSON-friendly lists and ints"""
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+def read_log(path):
+    """Load every event of a mission log, in order"""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def world_from_start(event):
+    """Grid and Drone as they were when a 'start' event was recorded"""
+    size = event['size']
+    grid = Grid(size=size, obstacle_prob=0, no_fly_zone=0,
+                connectivity=event.get('connectivity', 4))
+    grid.grid = np.array(list(event['cells']), dtype=int).reshape(size, size)
+    grid.mark_changed()
+    if event.get('cost') is not None:
+        grid.set_cost_layer(np.reshape(event['cost'], (size, size)))
+    drone = Drone(startposition=tuple(event['position']),
+                  battery_capacity=event['battery_capacity'],
+                  moving_cost=event['moving_cost'],
+                  terrain=grid)
+    drone.battery = event['battery']
+    return grid, drone
+
+
+def replay(events, check_routes=True):
+    """
+    Re-execute a recorded mission headlessly
+
+    Moves are applied to a fresh Drone and toggles to a Grid rebuilt from
+    the start snapshot, in recorded order. With check_routes, every
+    recorded replan and emergency return is planned again on the replayed
+    grid and compared with what the live run chose.
+
+    Parameters:
+        events: Events from read_log (or a path to a log file)
+        check_routes: Re-plan detours/returns and report differences
+
+    Returns:
+        dict: 'grid' and 'drone' in their final state, 'moves' applied,
+              'collisions' (steps that entered a blocked cell) and
+              'divergences' (events whose route no longer matches)
+    """
+    from a_star import a_star_search, bidirectional_search
+
+    if isinstance(events, str):
+        events = read_log(events)
+
+    grid = drone = None
+    clearance_weight = 0
+    moves = 0
+    collisions = []
+    divergences = []
+
+    for event in events:
+        kind = event['e']
+
+        if kind == 'start':
+            grid, drone = world_from_start(event)
+            clearance_weight = event.get('clearance_weight', 0)
+
+        elif kind == 'move':
+            posture = tuple(event['p'])
+            if not grid.isvalid(posture):
+                collisions.append(event['t'])
+            drone.move(posture)
+            moves += 1
+
+        elif kind == 'toggle':
+            grid.set_cell(tuple(event['p']), event['v'])
+
+        elif kind in ('replan', 'emergency') and check_routes:
+            start, goal = tuple(event['from']), tuple(event['to'])
+            if clearance_weight > 0:
+                route = a_star_search(grid, start, goal, clearance_weight=clearance_weight)
+            else:
+                route = bidirectional_search(grid, start, goal)
+            recorded = event.get('path')
+            if _plain(route) != recorded:
+                divergences.append({'t': event['t'], 'e': kind,
+                                    'recorded': recorded, 'replayed': _plain(route)})
+
+    return {
+        'grid': grid,
+        'drone': drone,
+        'moves': moves,
+        'collisions': collisions,
+        'divergences': divergences
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    print("=== Mission Replay ===")
+    print("-" * 40)
+
+    if len(sys.argv) < 2:
+        print("Usage: python mission_log.py <mission.jsonl>")
+        sys.exit(1)
+
+    events = read_log(sys.argv[1])
+    start_time = time.perf_counter()
+    report = replay(events)
+    elapsed = time.perf_counter() - start_time
+
+    status = report['drone'].get_status()
+    print(f"Events:      {len(events)} ({report['moves']} moves) in {elapsed * 1000:.1f}ms")
+    print(f"Final:       {status['position']}, battery {status['battery_percentage']:.1f}%")
+    print(f"Coverage:    {status['coverage']} cells")
+    print(f"Collisions:  {len(report['collisions'])}")
+    print(f"Divergences: {len(report['divergences'])}")
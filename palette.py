@@ -0,0 +1,30 @@
+"""
+Color Palette for Drone Path Optimizer
+Colors shared by the matplotlib Dashboard and the offline frame renderer,
+kept free of plotting imports so headless tools can use them.
+"""
+
+COLOR_PALETTE = {
+    'safe': '#1a1a2e',
+    'obstacle': '#e94560',
+    'no_fly': '#ff6b35',
+    'path': '#00ff88',
+    'drone': '#00d4ff',
+    'visited': '#0f3460',
+    'visitedd': '#0f3460', # Kept for safety if used anywhere else
+    'grid_lines': '#16213e',
+    'optimal_path': '#0080ff',
+    'destination': '#ffff00'
+}
+
+# Visit heatmap: visited cells blend from VISITED_BASE towards VISITED_HOT
+# (RGB 0-255), reaching full intensity at HEAT_VISITS visits
+VISITED_BASE = (15, 52, 96)
+VISITED_HOT = (0, 255, 212)
+HEAT_VISITS = 5
+
+
+def hex_to_rgb(hex_color):
+    """'#rrggbb' to an (r, g, b) tuple of 0-255 ints"""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
@@ -0,0 +1,159 @@
+"""
+Background Planning for Drone Path Optimizer
+A worker thread that runs planning jobs (coverage segments, detours,
+routes home) away from the animation loop. Jobs and results are kept per
+kind: a newer job of a kind replaces a queued one, and results of
+superseded jobs are dropped, so the caller only ever sees current plans.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class PlanningThread:
+    """
+    Runs submitted jobs one at a time on a daemon thread and hands the
+    results back through poll(), which never blocks
+
+    With threaded=False jobs run inline in submit(); the interface is the
+    same, which keeps headless runs and tests deterministic.
+    """
+
+    def __init__(self, threaded=True):
+        self.threaded = threaded
+        self._lock = threading.Condition()
+        self._jobs = OrderedDict()  # kind -> (generation, function, args), oldest first
+        self._results = {}          # kind -> (generation, value, error)
+        self._generation = {}       # kind -> newest generation submitted (or cancelled)
+        self._running = None        # kind of the job being computed
+        self._closed = False
+        self._thread = None
+        if threaded:
+            self._thread = threading.Thread(target=self._run, name='planning', daemon=True)
+            self._thread.start()
+
+    def submit(self, kind, function, *args):
+        """
+        Plan function(*args) for kind, replacing that kind's queued job and
+        invalidating its running one
+
+        Returns:
+            int: The job's generation
+        """
+        with self._lock:
+            generation = self._generation.get(kind, 0) + 1
+            self._generation[kind] = generation
+            self._results.pop(kind, None)
+            if not self.threaded:
+                self._results[kind] = (generation,) + _call(function, args)
+                return generation
+            self._jobs.pop(kind, None)
+            self._jobs[kind] = (generation, function, args)
+            self._lock.notify_all()
+            return generation
+
+    def cancel(self, kind):
+        """Forget kind's queued job and ignore the result of a running one"""
+        with self._lock:
+            self._generation[kind] = self._generation.get(kind, 0) + 1
+            self._jobs.pop(kind, None)
+            self._results.pop(kind, None)
+
+    def pending(self, kind):
+        """True while a job of kind is queued, running or waiting to be polled"""
+        with self._lock:
+            return kind in self._jobs or kind in self._results or self._running == kind
+
+    def poll(self, kind):
+        """
+        Take kind's finished result, if there is a current one
+
+        Returns:
+            (value, error) with error None on success, or None if nothing is ready
+        """
+        with self._lock:
+            result = self._results.pop(kind, None)
+            if result is None or result[0] != self._generation.get(kind):
+                return None
+            return result[1], result[2]
+
+    def wait(self, timeout=None):
+        """Block until no job is queued or running; False on timeout"""
+        with self._lock:
+            return self._lock.wait_for(lambda: not self._jobs and self._running is None, timeout)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._jobs.clear()
+            self._lock.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                self._lock.wait_for(lambda: self._jobs or self._closed)
+                if self._closed:
+                    return
+                kind, (generation, function, args) = self._jobs.popitem(last=False)
+                self._running = kind
+
+            value, error = _call(function, args)
+
+            with self._lock:
+                self._running = None
+                if generation == self._generation.get(kind):
+                    self._results[kind] = (generation, value, error)
+                self._lock.notify_all()
+
+
+def _call(function, args):
+    try:
+        return function(*args), None
+    except Exception as error:  # Reported through poll() on the caller's thread
+        return None, error
+
+
+def next_segment(stream):
+    """Next non-empty segment of a coverage stream, or None once it is exhausted"""
+    for segment in stream:
+        if segment:
+            return segment
+    return None
+
+
+if __name__ == "__main__":
+    import time
+    from grid import Grid
+    from drone import Drone
+    from coverage import CoveragePlanner
+
+    print("=== Background Planning Demo ===")
+    print("-" * 40)
+
+    grid = Grid(size=60, obstacle_prob=0.12, no_fly_zone=0.06, seedling=42)
+    grid.setstartposition((0, 0))
+    drone = Drone(startposition=(0, 0), battery_capacity=60 * 60 * 2, grid_size=60)
+    stream = CoveragePlanner(grid, drone).iter_adaptive_coverage(battery_limit=20)
+
+    planning = PlanningThread()
+    path, frames, longest = [], 0, 0.0
+    start_time = time.perf_counter()
+    while True:
+        # One "frame": hand over whatever is ready, never wait for the planner
+        frame_start = time.perf_counter()
+        result = planning.poll('segment')
+        if result is not None:
+            if result[0] is None:
+                break
+            path.extend(result[0])
+        if not planning.pending('segment'):
+            planning.submit('segment', next_segment, stream)
+        longest = max(longest, time.perf_counter() - frame_start)
+        frames += 1
+        time.sleep(0.001)
+
+    planning.close()
+    print(f"Planned {len(path)} steps in {time.perf_counter() - start_time:.2f}s over {frames} frames")
+    print(f"Longest frame spent on planning: {longest * 1000:.2f}ms")
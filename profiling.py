@@ -0,0 +1,196 @@
+"""
+Profiling for Drone Path Optimizer
+Opt-in counters and nested phase timings for the planners, A* and the
+dashboard. While no Profiler is enabled every hook is a single global
+check, so instrumented code runs at full speed.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from functools import wraps
+
+
+_active = None
+_NO_PHASE = nullcontext()
+
+
+class Profiler:
+    """
+    Collects counters (name -> total) and phase timings keyed by the stack
+    of enclosing phases, e.g. ('adaptive.pick', 'a_star_search'). Each
+    thread nests its phases on its own stack, so a planning thread and the
+    animation loop can be profiled together.
+    """
+
+    def __init__(self):
+        self.counters = defaultdict(int)
+        self.phases = defaultdict(lambda: [0, 0.0])  # stack -> [calls, seconds]
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def _stack(self):
+        """The calling thread's stack of open phases"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def peak(self, name, value):
+        self.counters[name] = max(self.counters[name], value)
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def __enter__(self):
+        enable(self)
+        return self
+
+    def __exit__(self, *exc):
+        disable()
+
+    def to_dict(self):
+        """Counters plus phases as {'outer;inner': {'calls', 'seconds'}}"""
+        return {
+            'counters': dict(self.counters),
+            'phases': {';'.join(stack): {'calls': calls, 'seconds': seconds}
+                       for stack, (calls, seconds) in self.phases.items()}
+        }
+
+    def to_json(self, path=None):
+        """JSON report; written to path if given"""
+        text = json.dumps(self.to_dict(), indent=2, sort_keys=True)
+        if path:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+    def folded(self):
+        """
+        Collapsed stacks ('outer;inner <microseconds>' per line, self time
+        only), the input format of flamegraph.pl and speedscope
+        """
+        child_time = defaultdict(float)
+        for stack, (_, seconds) in self.phases.items():
+            if len(stack) > 1:
+                child_time[stack[:-1]] += seconds
+
+        lines = []
+        for stack, (_, seconds) in sorted(self.phases.items()):
+            own = max(seconds - child_time[stack], 0.0)
+            lines.append(f"{';'.join(stack)} {int(round(own * 1e6))}")
+        return '\n'.join(lines) + '\n'
+
+    def summary(self, top=10):
+        """Slowest phases and all counters as printable lines"""
+        lines = []
+        ranked = sorted(self.phases.items(), key=lambda item: -item[1][1])
+        for stack, (calls, seconds) in ranked[:top]:
+            lines.append(f"  {' > '.join(stack):<45} {calls:>7} calls {seconds * 1000:>9.1f}ms")
+        for name, total in sorted(self.counters.items()):
+            lines.append(f"  {name:<45} {total:>7}")
+        return '\n'.join(lines)
+
+
+class _Phase:
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stack = self.profiler._stack
+        with self.profiler._lock:
+            entry = self.profiler.phases[tuple(stack)]
+            entry[0] += 1
+            entry[1] += elapsed
+        stack.pop()
+
+
+def enable(profiler=None):
+    """Start collecting into profiler (a new one by default) and return it"""
+    global _active
+    _active = profiler or Profiler()
+    return _active
+
+
+def disable():
+    """Stop collecting; returns the profiler that was active"""
+    global _active
+    profiler, _active = _active, None
+    return profiler
+
+
+def active():
+    """The enabled Profiler, or None"""
+    return _active
+
+
+def count(name, n=1):
+    """Add n to a counter if profiling is enabled"""
+    if _active is not None:
+        _active.counters[name] += n
+
+
+def peak(name, value):
+    """Raise a counter to value if profiling is enabled (a high-water mark, not a total)"""
+    if _active is not None and value > _active.counters[name]:
+        _active.counters[name] = value
+
+
+def phase(name):
+    """Context manager timing a phase if profiling is enabled"""
+    if _active is None:
+        return _NO_PHASE
+    return _Phase(_active, name)
+
+
+def profiled(name):
+    """Decorator: time every call of the function as a phase"""
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return function(*args, **kwargs)
+            with _Phase(_active, name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+if __name__ == "__main__":
+    # The hooks live in the imported module, not in this __main__ copy
+    import profiling
+    from grid import Grid
+    from drone import Drone
+    from coverage import CoveragePlanner
+
+    print("=== Planner Profile ===")
+    print("-" * 40)
+
+    grid = Grid(size=40, obstacle_prob=0.12, no_fly_zone=0.06, seedling=42)
+    grid.setstartposition((0, 0))
+
+    with profiling.Profiler() as profiler:
+        drone = Drone(startposition=(0, 0), battery_capacity=40 * 40 * 2)
+        CoveragePlanner(grid, drone).plan_adaptive_coverage(battery_limit=20)
+        drone = Drone(startposition=(0, 0), battery_capacity=300)
+        CoveragePlanner(grid, drone).plan_greedy_coverage()
+
+    print(profiler.summary())
+    print("\nFolded stacks (flame graph input):")
+    print(profiler.folded())
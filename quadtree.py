@@ -0,0 +1,325 @@
+"""
+Quadtree Free-Space Decomposition for Drone Path Optimizer
+Splits the grid into square blocks that are entirely safe or entirely
+blocked, so open areas become a handful of large leaves. Routes are
+searched over the leaf adjacency graph and refined to cells inside the
+chosen corridor; rectangle queries sum whole leaves at a time. Cell
+edits only rebuild the subtree around the changed cell.
+"""
+
+import heapq
+import numpy as np
+import profiling
+from a_star import heuristic
+
+
+class QuadTree:
+    """
+    Leaves are keyed (row, col, size) (top-left corner and side of the
+    block) and map to True for safe blocks, False for blocked ones. The
+    root is the smallest power-of-two square covering the grid; blocks
+    that cross the grid's edge are always split.
+    """
+
+    def __init__(self, grid):
+        """
+        Parameters:
+            grid: Grid object; edits made to it (set_cell, toggle_obstacle,
+                  or direct writes followed by mark_changed) are picked up
+                  on the next query
+        """
+        self.grid = grid
+        self.root_size = 1
+        while self.root_size < grid.size:
+            self.root_size *= 2
+        self.leaves = {}
+        self._adjacency = {}
+        self._free = None
+        self.version = None
+        self.rebuild()
+
+    def _free_mask(self):
+        return (self.grid.grid != 1) & (self.grid.grid != 2)
+
+    def rebuild(self):
+        """Decompose the whole grid from scratch"""
+        self._free = self._free_mask()
+        self.version = self.grid.version
+        self.leaves = {}
+        self._adjacency = {}
+        self._build(0, 0, self.root_size)
+
+    def _uniform(self, row, col, size):
+        """True / False if the block is all safe / all blocked, None if mixed or off the grid"""
+        block = self._free[row:row + size, col:col + size]
+        if block.shape != (size, size):
+            return None
+        if block.all():
+            return True
+        if not block.any():
+            return False
+        return None
+
+    def _children(self, row, col, size):
+        half = size // 2
+        return [(r, c, half) for r in (row, row + half) for c in (col, col + half)
+                if r < self.grid.size and c < self.grid.size]
+
+    def _build(self, row, col, size):
+        with profiling.phase('quadtree.build'):
+            stack = [(row, col, size)]
+            while stack:
+                node = stack.pop()
+                uniform = self._uniform(*node)
+                if uniform is not None:
+                    self.leaves[node] = uniform
+                else:
+                    stack.extend(self._children(*node))
+
+    def _drop(self, row, col, size):
+        """Remove every leaf inside a block"""
+        stack = [(row, col, size)]
+        while stack:
+            node = stack.pop()
+            if self.leaves.pop(node, None) is None and node[2] > 1:
+                stack.extend(self._children(*node))
+
+    def refresh(self):
+        """
+        Bring the tree up to date with the grid: each changed cell rebuilds
+        only the largest block around it that is now uniform (merging
+        leaves) or, failing that, the leaf that held it (splitting it)
+        """
+        if self.version == self.grid.version:
+            return
+        free = self._free_mask()
+        changed = np.argwhere(free != self._free)
+        self._free = free
+        self.version = self.grid.version
+        if len(changed) == 0:
+            return
+        self._adjacency = {}
+
+        for row, col in changed.tolist():
+            profiling.count('quadtree.cell_updates')
+            leaf = self.leaf_at((row, col))
+            region = leaf
+            size, top, left = self.root_size, 0, 0
+            while size >= leaf[2]:
+                if self._uniform(top, left, size) is not None:
+                    region = (top, left, size)
+                    break
+                size //= 2
+                top += size if row >= top + size else 0
+                left += size if col >= left + size else 0
+            self._drop(*region)
+            self._build(*region)
+
+    def leaf_at(self, pos):
+        """Key of the leaf containing cell pos"""
+        row, col = pos
+        top, left, size = 0, 0, self.root_size
+        while (top, left, size) not in self.leaves:
+            size //= 2
+            if row >= top + size:
+                top += size
+            if col >= left + size:
+                left += size
+        return (top, left, size)
+
+    def neighbors(self, leaf):
+        """Safe leaves sharing an edge with leaf (cached until the tree changes)"""
+        cached = self._adjacency.get(leaf)
+        if cached is not None:
+            return cached
+
+        row, col, size = leaf
+        found = []
+        # Walk each side just outside the leaf, jumping a whole neighbor at a time
+        for fixed, start, along_rows in ((row - 1, col, False), (row + size, col, False),
+                                         (col - 1, row, True), (col + size, row, True)):
+            if not 0 <= fixed < self.grid.size:
+                continue
+            offset = start
+            while offset < min(start + size, self.grid.size):
+                cell = (offset, fixed) if along_rows else (fixed, offset)
+                other = self.leaf_at(cell)
+                if self.leaves[other]:
+                    found.append(other)
+                offset = (other[0] if along_rows else other[1]) + other[2]
+        self._adjacency[leaf] = found
+        return found
+
+    def leaf_count(self):
+        """(safe leaves, blocked leaves)"""
+        self.refresh()
+        safe = sum(1 for free in self.leaves.values() if free)
+        return safe, len(self.leaves) - safe
+
+    def find_path(self, start, goal, stats=None):
+        """
+        Route over the leaf adjacency graph (edges weighted by the distance
+        between leaf centres), then refine it with A* over the cells of the
+        leaves on that route only. Paths are near-shortest, not optimal.
+
+        Parameters:
+            stats: Optional dict; filled with 'leaves_expanded',
+                   'cells_expanded' and their sum 'expanded'
+
+        Returns:
+            list: Cells from start to goal, or None if unreachable
+        """
+        self.refresh()
+        if not self.grid.reachable(start, goal):
+            if stats is not None:
+                stats.update(leaves_expanded=0, cells_expanded=0, expanded=0)
+            return None
+
+        corridor, leaves_expanded = self._leaf_route(self.leaf_at(start), self.leaf_at(goal), goal)
+
+        mask = np.zeros((self.grid.size, self.grid.size), dtype=bool)
+        for row, col, size in corridor:
+            mask[row:row + size, col:col + size] = True
+        path, cells_expanded = self._refine(start, goal, mask)
+
+        if stats is not None:
+            stats.update(leaves_expanded=leaves_expanded, cells_expanded=cells_expanded,
+                         expanded=leaves_expanded + cells_expanded)
+        profiling.count('quadtree.leaves_expanded', leaves_expanded)
+        profiling.count('quadtree.cells_expanded', cells_expanded)
+        return path
+
+    def _leaf_route(self, first, last, goal):
+        def centre(leaf):
+            return (leaf[0] + (leaf[2] - 1) / 2, leaf[1] + (leaf[2] - 1) / 2)
+
+        estimate = heuristic(self.grid)
+        cost_so_far = {first: 0}
+        parents = {first: None}
+        # Entries are (f, -g, g, leaf): deepest first on ties
+        openset = [(estimate(centre(first), goal), 0, 0, first)]
+        closed = set()
+        while openset:
+            _, _, g, leaf = heapq.heappop(openset)
+            if leaf == last:
+                break
+            if leaf in closed:
+                continue
+            closed.add(leaf)
+            here = centre(leaf)
+            for other in self.neighbors(leaf):
+                new_cost = g + estimate(here, centre(other))
+                if new_cost < cost_so_far.get(other, float('inf')):
+                    cost_so_far[other] = new_cost
+                    parents[other] = leaf
+                    heapq.heappush(openset, (new_cost + estimate(centre(other), goal), -new_cost, new_cost, other))
+
+        route = [last]
+        while parents[route[-1]] is not None:
+            route.append(parents[route[-1]])
+        return route, len(closed)
+
+    def _refine(self, start, goal, mask):
+        estimate = heuristic(self.grid)
+        cost_so_far = {start: 0}
+        parents = {start: None}
+        # Entries are (f, -g, g, posture): deepest first on ties
+        openset = [(estimate(start, goal), 0, 0, start)]
+        closed = set()
+        while openset:
+            _, _, g, posture = heapq.heappop(openset)
+            if posture == goal:
+                break
+            if posture in closed:
+                continue
+            closed.add(posture)
+            for other, move_cost in self.grid.moves(posture):
+                if not mask[other]:
+                    continue
+                new_cost = g + move_cost
+                if new_cost < cost_so_far.get(other, float('inf')):
+                    cost_so_far[other] = new_cost
+                    parents[other] = posture
+                    heapq.heappush(openset, (new_cost + estimate(other, goal), -new_cost, new_cost, other))
+
+        path = [goal]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path, len(closed)
+
+    def count_free(self, top_left, bottom_right):
+        """Number of safe cells in a rectangle (corners inclusive)"""
+        return sum((r1 - r0 + 1) * (c1 - c0 + 1)
+                   for r0, c0, r1, c1 in self.free_rectangles(top_left, bottom_right))
+
+    def free_cells(self, top_left, bottom_right):
+        """Safe cells in a rectangle (corners inclusive)"""
+        return [(row, col) for r0, c0, r1, c1 in self.free_rectangles(top_left, bottom_right)
+                for row in range(r0, r1 + 1) for col in range(c0, c1 + 1)]
+
+    def free_rectangles(self, top_left, bottom_right):
+        """
+        Safe space inside a rectangle (corners inclusive) as disjoint
+        (row0, col0, row1, col1) rectangles, one per overlapping safe leaf
+        """
+        self.refresh()
+        (qr0, qc0), (qr1, qc1) = top_left, bottom_right
+        found = []
+        stack = [(0, 0, self.root_size)]
+        while stack:
+            node = stack.pop()
+            row, col, size = node
+            if row > qr1 or col > qc1 or row + size <= qr0 or col + size <= qc0:
+                continue
+            free = self.leaves.get(node)
+            if free is None:
+                stack.extend(self._children(*node))
+            elif free:
+                found.append((max(row, qr0), max(col, qc0),
+                              min(row + size - 1, qr1), min(col + size - 1, qc1)))
+        return found
+
+
+if __name__ == "__main__":
+    import time
+    from grid import Grid
+    from a_star import a_star_search, path_cost
+
+    print("=== Quadtree Decomposition Demo ===")
+    print("-" * 40)
+
+    size = 256
+    for scenario in ('Open', 'Narrow Passage', 'Trap'):
+        grid = Grid(size=size, obstacle_prob=0, no_fly_zone=0, seedling=42)
+        grid.load_scenario(scenario)
+        goal = (size - 1, size - 1)
+        grid.setstartposition(goal)
+        grid.component_labels()  # Shared reachability check, not timed
+
+        start_time = time.perf_counter()
+        tree = QuadTree(grid)
+        build_ms = (time.perf_counter() - start_time) * 1000
+        safe, blocked = tree.leaf_count()
+
+        stats = {}
+        start_time = time.perf_counter()
+        path = tree.find_path((0, 0), goal, stats=stats)
+        tree_ms = (time.perf_counter() - start_time) * 1000
+
+        astar_stats = {}
+        start_time = time.perf_counter()
+        exact = a_star_search(grid, (0, 0), goal, stats=astar_stats)
+        astar_ms = (time.perf_counter() - start_time) * 1000
+
+        print(f"{scenario}: {safe} safe / {blocked} blocked leaves for "
+              f"{int(tree._free.sum())} safe cells (built in {build_ms:.0f}ms)")
+        print(f"  quadtree route: {stats['leaves_expanded']} leaves + {stats['cells_expanded']} cells "
+              f"expanded, {tree_ms:.1f}ms, energy {path_cost(path, grid):.0f}")
+        print(f"  cell A*:        {astar_stats['expanded']} cells expanded, "
+              f"{astar_ms:.1f}ms, energy {path_cost(exact, grid):.0f}")
+
+        start_time = time.perf_counter()
+        count = tree.count_free((10, 10), (200, 200))
+        print(f"  free cells in (10,10)-(200,200): {count} "
+              f"({(time.perf_counter() - start_time) * 1000:.2f}ms)")
@@ -0,0 +1,181 @@
+"""
+Route Optimizer for Drone Path Optimizer
+Improves the order in which a set of waypoints is visited: nearest-neighbor
+seeding followed by 2-opt and Or-opt moves on true grid distances, under a
+time budget.
+"""
+
+import time
+import numpy as np
+from a_star import path_cost
+from distance_oracle import DistanceOracle
+
+
+def route_length(order, matrix):
+    """Total length of an open route visiting matrix indices in order"""
+    return sum(matrix[a][b] for a, b in zip(order, order[1:]))
+
+
+def nearest_neighbor_order(matrix, start=0):
+    """Greedy route: from start, always go to the closest node not yet visited"""
+    remaining = set(range(len(matrix))) - {start}
+    order = [start]
+    while remaining:
+        here = matrix[order[-1]]
+        nxt = min(remaining, key=lambda node: (here[node], node))
+        order.append(nxt)
+        remaining.remove(nxt)
+    return order
+
+
+def _two_opt_pass(order, d, deadline):
+    """One sweep of 2-opt (segment reversal) moves; start stays fixed"""
+    improved = False
+    n = len(order)
+    for i in range(1, n - 1):
+        if time.perf_counter() > deadline:
+            break
+        a, b = order[i - 1], order[i]
+        for j in range(i + 1, n):
+            c = order[j]
+            # Open route: reversing up to the last node has no closing edge
+            if j == n - 1:
+                delta = d[a][c] - d[a][b]
+            else:
+                e = order[j + 1]
+                delta = d[a][c] + d[b][e] - d[a][b] - d[c][e]
+            if delta < 0:
+                order[i:j + 1] = reversed(order[i:j + 1])
+                improved = True
+                b = order[i]
+    return improved
+
+
+def _or_opt_pass(order, d, deadline, max_segment=3):
+    """One sweep of Or-opt moves: relocate runs of 1-3 nodes elsewhere"""
+    improved = False
+    for length in range(1, max_segment + 1):
+        i = 1
+        while i + length <= len(order):
+            if time.perf_counter() > deadline:
+                return improved
+            n = len(order)
+            seg_first, seg_last = order[i], order[i + length - 1]
+            prev = order[i - 1]
+            after = order[i + length] if i + length < n else None
+
+            removed = d[prev][seg_first] + (d[seg_last][after] - d[prev][after] if after is not None else 0)
+
+            rest = order[:i] + order[i + length:]
+            best_gain, best_spot, best_reverse = 0, None, False
+            for k in range(len(rest)):
+                left = rest[k]
+                right = rest[k + 1] if k + 1 < len(rest) else None
+                for reverse in (False, True):
+                    first, last = (seg_last, seg_first) if reverse else (seg_first, seg_last)
+                    added = d[left][first] + (d[last][right] - d[left][right] if right is not None else 0)
+                    gain = removed - added
+                    if gain > best_gain:
+                        best_gain, best_spot, best_reverse = gain, k, reverse
+
+            if best_spot is not None:
+                segment = order[i:i + length]
+                if best_reverse:
+                    segment.reverse()
+                order[:] = rest[:best_spot + 1] + segment + rest[best_spot + 1:]
+                improved = True
+            else:
+                i += 1
+    return improved
+
+
+def optimize_route(grid, start, waypoints, time_budget=0.5, matrix=None, oracle=None):
+    """
+    Order waypoints to minimise the flown distance from start
+
+    Parameters:
+        grid: Grid object
+        start: Starting position (row, col)
+        waypoints: Iterable of (row, col) tuples to visit
+        time_budget: Seconds allowed for building the distance matrix and
+                     2-opt / Or-opt improvement together (the matrix falls
+                     back to estimates for rows it had no time to flood)
+        matrix: Optional precomputed distance matrix over [start] + waypoints
+        oracle: Optional DistanceOracle to build the matrix and legs with
+
+    Returns:
+        dict: 'order' and 'greedy_order' (reachable waypoints in the
+              optimized and nearest-neighbor visiting orders), 'length' and
+              'greedy_length' (path_cost of the routes actually flown, so
+              steps unless the grid has diagonal moves or a cost layer),
+              'saved' versus the greedy order, 'unreachable' waypoints that
+              were dropped, 'estimated' matrix rows that were not flooded
+              and 'path' (cell-by-cell route from start)
+    """
+    deadline = time.perf_counter() + time_budget
+    points = [tuple(start)] + [tuple(p) for p in waypoints]
+    if oracle is None:
+        oracle = DistanceOracle(grid)
+    stats = {'estimated': 0}
+    if matrix is None:
+        matrix = oracle.matrix(points, deadline=deadline, stats=stats)
+
+    reachable = [i for i in range(len(points)) if i == 0 or matrix[0][i] >= 0]
+    unreachable = [points[i] for i in range(1, len(points)) if matrix[0][i] < 0]
+    d = np.asarray(matrix)[np.ix_(reachable, reachable)].tolist()
+
+    order = nearest_neighbor_order(d)
+    greedy_visit = [points[reachable[i]] for i in order]
+    greedy_length = route_length(order, d)
+
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = _two_opt_pass(order, d, deadline)
+        improved = _or_opt_pass(order, d, deadline) or improved
+
+    visit = [points[reachable[i]] for i in order]
+    path = stitch_route(oracle, visit)
+    length = path_cost(path, grid)
+    if stats['estimated']:
+        # Estimated rows can be off either way: measure the greedy route flown too
+        greedy_length = path_cost(stitch_route(oracle, greedy_visit), grid)
+
+    return {
+        'order': visit[1:],
+        'greedy_order': greedy_visit[1:],
+        'length': length,
+        'greedy_length': greedy_length,
+        'saved': greedy_length - length,
+        'unreachable': unreachable,
+        'estimated': stats['estimated'],
+        'path': path
+    }
+
+
+def stitch_route(oracle, visit):
+    """Join consecutive stops into one cell-by-cell path"""
+    path = [visit[0]]
+    for here, there in zip(visit, visit[1:]):
+        path.extend(oracle.path(here, there)[1:])
+    return path
+
+
+if __name__ == "__main__":
+    from grid import Grid
+    from drone import Drone
+    from coverage import CoveragePlanner
+
+    print("=== Route Optimizer Demo ===")
+    print("-" * 40)
+
+    grid = Grid(size=20, obstacle_prob=0.12, no_fly_zone=0.06, seedling=42)
+    grid.setstartposition((0, 0))
+    drone = Drone(startposition=(0, 0), battery_capacity=2000)
+    planner = CoveragePlanner(grid, drone)
+
+    greedy_path = planner.plan_adaptive_coverage(battery_limit=0)
+    result = optimize_route(grid, (0, 0), planner.get_unvisited_safe_cells(), time_budget=2.0)
+
+    print(f"Adaptive planner path: {len(greedy_path)} steps")
+    print(f"Nearest-neighbor order: {result['greedy_length']} steps")
+    print(f"Optimized order:        {result['length']} steps (saved {result['saved']})")
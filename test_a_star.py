@@ -6,7 +6,8 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from grid import Grid
-from a_star import a_star_search, distance
+from a_star import a_star_search, anytime_search, bidirectional_search, distance, octile, path_cost, cost_field
+from metrics import calculate_safety_buffer_violations
 
 
 def testDistance():
@@ -78,6 +79,47 @@ def testnopathExists():
     assert path is None
     print("[OK] No path detection test passed")
 
+def testdirectWriteAfterSearch():
+
+    grid = Grid(size = 5, obstacle_prob = 0, no_fly_zone = 0)
+    for i in range(5):
+        grid.grid[i][2] = 1
+    assert a_star_search(grid, (0, 0), (0, 4)) is None
+
+    # Opening the wall by writing the array directly must not leave stale components
+    grid.grid[2][2] = 0
+    path = a_star_search(grid, (0, 0), (0, 4))
+    assert path is not None and (2, 2) in path
+    assert bidirectional_search(grid, (0, 0), (0, 4)) is not None
+
+    # Closing it again the same way
+    grid.grid[2][2] = 1
+    assert a_star_search(grid, (0, 0), (0, 4)) is None
+
+    print("[OK] Direct write after search test passed")
+
+def testdirectWriteAfterEdit():
+
+    grid = Grid(size = 5, obstacle_prob = 0, no_fly_zone = 0)
+    for i in range(5):
+        grid.grid[i][2] = 1
+    grid.grid[4][4] = 2
+    grid.mark_changed()
+    assert grid.reachable((0, 0), (0, 4)) == False
+
+    # An edit carries the labels forward; a direct write right after it must still be seen
+    grid.set_cell((4, 4), 1)
+    grid.grid[0][2] = 0
+    assert grid.reachable((0, 0), (0, 4)) == True
+    assert a_star_search(grid, (0, 0), (0, 4)) is not None
+
+    # Every cached field is checked, not just the labels
+    clearance = grid.clearance_field().copy()
+    grid.grid[0][2] = 1
+    assert not (grid.clearance_field() == clearance).all()
+
+    print("[OK] Direct write after edit test passed")
+
 def testinvalidStartorGoal():
     # Fix: seedling
     grid = Grid(size = 5, seedling = 42)
@@ -96,6 +138,135 @@ def testinvalidStartorGoal():
 
 
 
+def testclearanceweightedPath():
+
+    grid = Grid(size = 7, obstacle_prob = 0, no_fly_zone = 0)
+    for col in range(2, 5):
+        grid.set_cell((0, col), 1)
+
+    start = (0, 0)
+    goal = (0, 6)
+
+    shortest = a_star_search(grid, start, goal)
+    assert len(shortest) == 9
+    assert calculate_safety_buffer_violations(shortest, grid) > 0
+
+    # A large enough penalty pushes the path one row further from the wall
+    safe = a_star_search(grid, start, goal, clearance_weight = 5, safe_distance = 1)
+    assert safe[0] == start
+    assert safe[-1] == goal
+    assert len(safe) == 11
+    assert calculate_safety_buffer_violations(safe, grid) == 0
+
+    print("[OK] Clearance weighted pathfinding test passed")
+
+
+def testbidirectionalMatchesAstar():
+
+    for scenario in ['Maze', 'Narrow Passage', 'Random', 'Trap']:
+        grid = Grid(size = 20, seedling = 42)
+        grid.load_scenario(scenario)
+        grid.setstartposition((19, 19))
+
+        expected = a_star_search(grid, (0, 0), (19, 19))
+        path = bidirectional_search(grid, (0, 0), (19, 19))
+
+        if expected is None:
+            assert path is None
+            continue
+
+        assert path[0] == (0, 0)
+        assert path[-1] == (19, 19)
+        assert len(path) == len(expected)
+        for current, following in zip(path, path[1:]):
+            assert distance(current, following) == 1
+            assert grid.isvalid(following)
+
+    # Walled-off goal
+    grid = Grid(size = 5, obstacle_prob = 0, no_fly_zone = 0)
+    for i in range(5):
+        grid.set_cell((i, 2), 1)
+    assert bidirectional_search(grid, (0, 0), (4, 4)) is None
+    assert bidirectional_search(grid, (0, 0), (0, 0)) == [(0, 0)]
+
+    print("[OK] Bidirectional search test passed")
+
+
+def testdiagonalPaths():
+
+    grid = Grid(size = 10, obstacle_prob = 0, no_fly_zone = 0, connectivity = 8)
+    path = a_star_search(grid, (0, 0), (9, 4))
+    assert len(path) == 10 and abs(path_cost(path) - octile((0, 0), (9, 4))) < 1e-9
+
+    grid = Grid(size = 30, obstacle_prob = 0.2, no_fly_zone = 0.05, seedling = 7, connectivity = 8)
+    grid.setstartposition((0, 0))
+    grid.set_cell((29, 29), 0)
+    square = Grid(size = 30, obstacle_prob = 0, no_fly_zone = 0)
+    square.grid = grid.grid.copy()
+    square.mark_changed()
+
+    path = a_star_search(grid, (0, 0), (29, 29))
+    both = bidirectional_search(grid, (0, 0), (29, 29))
+    assert abs(path_cost(path) - path_cost(both)) < 1e-9
+    assert path_cost(path) < len(a_star_search(square, (0, 0), (29, 29))) - 1
+
+    # Every step is a legal 8-connected move
+    for here, there in zip(path, path[1:]):
+        assert there in grid.surroundings(here)
+
+    print("[OK] Diagonal pathfinding test passed")
+
+
+def testcostlayerRouting():
+
+    # A headwind wall with one calm gap: the cheapest route detours through it
+    grid = Grid(size = 10, obstacle_prob = 0, no_fly_zone = 0)
+    grid.add_cost_region((0, 5), (9, 5), 30)
+    grid.add_cost_region((8, 5), (8, 5), 1 / 30)
+    assert abs(grid.cell_cost((8, 5)) - 1) < 1e-6 and grid.cell_cost((0, 5)) == 30
+
+    path = a_star_search(grid, (0, 0), (0, 9))
+    assert (8, 5) in path
+    assert abs(path_cost(path, grid) - 25) < 1e-4  # vs 8 + 30 straight through the wind
+
+    both = bidirectional_search(grid, (0, 0), (0, 9))
+    assert abs(path_cost(both, grid) - path_cost(path, grid)) < 1e-6
+
+    # Energy to fly home from anywhere matches A* run towards home
+    home = cost_field(grid, (0, 0))
+    for cell in ((0, 9), (9, 9), (5, 3)):
+        assert abs(home[cell] - path_cost(a_star_search(grid, cell, (0, 0)), grid)) < 1e-6
+
+    print("[OK] Cost layer routing test passed")
+
+
+def testanytimeSearch():
+
+    for connectivity in (4, 8):
+        grid = Grid(size = 40, obstacle_prob = 0.25, seedling = 5, connectivity = connectivity)
+        grid.setstartposition((0, 0))
+        grid.setstartposition((39, 39))
+        optimal = path_cost(a_star_search(grid, (0, 0), (39, 39)), grid)
+
+        # No budget: the first (inflated) solution, within its bound
+        stats = {}
+        path, bound = anytime_search(grid, (0, 0), (39, 39), time_budget = 0, stats = stats)
+        assert path[0] == (0, 0) and path[-1] == (39, 39)
+        assert all(b in grid.surroundings(a) for a, b in zip(path, path[1:]))
+        assert stats['iterations'] == 1 and 1 <= bound <= 3
+        assert path_cost(path, grid) <= bound * optimal + 1e-9
+
+        # Enough time: improved all the way down to the optimum
+        path, bound = anytime_search(grid, (0, 0), (39, 39), time_budget = 10, stats = stats)
+        assert bound == 1 and stats['epsilon'] == 1
+        assert abs(path_cost(path, grid) - optimal) < 1e-9
+
+    grid.set_cell((39, 39), 1)
+    assert anytime_search(grid, (0, 0), (39, 39)) == (None, float('inf'))
+
+    print("[OK] Anytime search test passed")
+
+
 if __name__ =="__main__":
     print("=== Running A* Pathfinding tests ===")
     print("-" * 40)
@@ -104,7 +275,14 @@ if __name__ =="__main__":
     testPathonemptyGrid()
     testpathwithObstacles()
     testnopathExists()
+    testdirectWriteAfterSearch()
+    testdirectWriteAfterEdit()
     testinvalidStartorGoal()
+    testclearanceweightedPath()
+    testbidirectionalMatchesAstar()
+    testdiagonalPaths()
+    testcostlayerRouting()
+    testanytimeSearch()
 
     print("\n[OK] All pathfinding tests passed")
     
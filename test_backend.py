@@ -0,0 +1,243 @@
+
+
+import sys
+import os
+import json
+import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'updated_drone', 'backend')))
+
+
+from drone import Drone
+from coverage import CoveragePlanner
+from a_star import a_star_search, path_cost
+import main as backend
+
+
+SPEC = {'grid': {'size': 15, 'seed': 42}, 'start': [0, 0], 'battery': 450, 'battery_limit': 20}
+
+
+async def withService(test, **options):
+    service = backend.PlanningService(workers = 2, **options)
+    bound = asyncio.get_running_loop().create_future()
+    server = asyncio.ensure_future(backend.serve(port = 0, service = service, ready = bound.set_result))
+    try:
+        return await test(service, await bound)
+    finally:
+        server.cancel()
+        await asyncio.gather(server, return_exceptions = True)
+
+
+async def httpRequest(port, method, path, payload = None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f'{method} {path} HTTP/1.1\r\nHost: localhost\r\n'
+                 f'Content-Length: {len(body)}\r\n\r\n'.encode() + body)
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(body)
+
+
+def expectedCoverage(spec):
+    grid = backend.build_grid(spec)
+    grid.setstartposition((0, 0))
+    drone = Drone((0, 0), battery_capacity = spec['battery'])
+    segments = CoveragePlanner(grid, drone).iter_adaptive_coverage(battery_limit = spec['battery_limit'])
+    return [list(posture) for segment in segments for posture in segment]
+
+
+def testHttpEndpoints():
+
+    spec = {'grid': {'size': 20, 'seed': 7}, 'start': [0, 0], 'goal': [19, 19]}
+    grid = backend.build_grid(spec)
+    grid.setstartposition((0, 0))
+    grid.set_cell((19, 19), 0)
+    spec['grid']['cells'] = grid.grid.flatten().tolist()
+
+    async def test(service, port):
+        assert (await httpRequest(port, 'GET', '/health'))[1]['status'] == 'ok'
+        assert (await httpRequest(port, 'GET', '/nowhere'))[0] == 404
+
+        status, route = await httpRequest(port, 'POST', '/route', spec)
+        assert status == 200
+        assert route['length'] == len(a_star_search(grid, (0, 0), (19, 19))) - 1
+        assert route['path'][0] == [0, 0] and route['path'][-1] == [19, 19]
+
+        status, result = await httpRequest(port, 'POST', '/coverage', SPEC)
+        assert status == 200
+        assert result['path'] == expectedCoverage(SPEC)
+        assert result['metrics']['steps'] == len(result['path'])
+        flown = [tuple(posture) for posture in [[0, 0]] + result['path']]
+        assert result['metrics']['battery_left'] == SPEC['battery'] - path_cost(flown, backend.build_grid(SPEC))
+
+    asyncio.run(withService(test))
+
+    print("[OK] HTTP endpoint test passed")
+
+
+def testWebSocketStreamsSegments():
+
+    async def test(service, port):
+        messages = [m async for m in backend.ws_plan('127.0.0.1', port, {'type': 'coverage', **SPEC})]
+        kinds = [m['type'] for m in messages]
+        assert kinds[-1] == 'done' and kinds.count('segment') > backend.METRICS_EVERY
+        assert 'metrics' in kinds and kinds.index('segment') < kinds.index('metrics')
+
+        path = [posture for m in messages if m['type'] == 'segment' for posture in m['path']]
+        assert path == expectedCoverage(SPEC)
+        assert messages[-1]['metrics']['coverage_percent'] > 90
+
+    asyncio.run(withService(test))
+
+    print("[OK] WebSocket streaming test passed")
+
+
+def testIdenticalJobsCoalesce():
+
+    async def test(service, port):
+        async def collect():
+            return [m async for m in backend.ws_plan('127.0.0.1', port, {'type': 'coverage', **SPEC})]
+
+        first, second = await asyncio.gather(collect(), collect())
+        assert first == second
+        assert service.runs == 1
+
+        routes = await asyncio.gather(*(httpRequest(port, 'POST', '/route',
+                                                    {**SPEC, 'start': [0, 0], 'goal': [5, 5]}) for _ in range(4)))
+        assert all(route == routes[0] for route in routes)
+        assert service.runs == 2
+
+    asyncio.run(withService(test))
+
+    print("[OK] Coalescing test passed")
+
+
+def testBackpressureAndBusy():
+
+    async def test():
+        job = backend.StreamJob(window = 3)
+        reader = job.subscribe()
+        first = asyncio.ensure_future(reader.__anext__())
+        await job.publish('a')
+        assert await first == 'a'
+
+        for item in 'bcd':
+            await job.publish(item)
+        blocked = asyncio.ensure_future(job.publish('e'))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()  # The reader is a full window behind
+
+        assert await reader.__anext__() == 'b'
+        await asyncio.wait_for(blocked, 1)
+        await reader.aclose()
+        await asyncio.wait_for(job.publish('f', final = True), 1)  # No readers left to wait for
+
+    async def busy(service, port):
+        status, reply = await httpRequest(port, 'POST', '/route', {**SPEC, 'goal': [5, 5]})
+        assert status == 503 and reply['error'] == 'busy'
+
+    asyncio.run(test())
+    asyncio.run(withService(busy, max_pending = 0))
+
+    print("[OK] Backpressure test passed")
+
+
+async def rawRequest(port, data):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(data)
+    response = await reader.read()
+    writer.close()
+    return int(response.split()[1])
+
+
+def testRejectsBadAndOversizedRequests():
+
+    async def test(service, port):
+        assert await rawRequest(port, b'garbage\r\n\r\n') == 400
+        assert await rawRequest(port, b'POST /route HTTP/1.1\r\nContent-Length: x\r\n\r\n') == 400
+        assert await rawRequest(port, b'GET /' + b'a' * 70000 + b' HTTP/1.1\r\n\r\n') == 400
+        assert await rawRequest(port, b'POST /route HTTP/1.1\r\nContent-Length: 99999999\r\n\r\n') == 413
+
+        status, reply = await httpRequest(port, 'POST', '/coverage', {'grid': {'size': 100000, 'seed': 1}})
+        assert status == 413 and 'limit' in reply['error']
+        assert service.runs == 0
+
+        # Still serving afterwards
+        assert (await httpRequest(port, 'GET', '/health'))[1]['status'] == 'ok'
+
+    asyncio.run(withService(test))
+
+    print("[OK] Bad request test passed")
+
+
+def testPumpNoticesDeadWorker():
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    async def test():
+        service = backend.PlanningService(workers = 1)
+        service.start()
+        service.pool.shutdown()
+        service.pool = ThreadPoolExecutor(1)
+        try:
+            # The worker returns without ever putting a final item
+            items = [item async for item in service.coverage(SPEC)]
+        finally:
+            service.close()
+        assert items[-1][0] == 'error' and 'without a result' in items[-1][1]
+
+    stream = backend.stream_coverage
+    backend.stream_coverage = lambda spec, queue: None
+    try:
+        asyncio.run(asyncio.wait_for(test(), 10))
+    finally:
+        backend.stream_coverage = stream
+
+    print("[OK] Dead worker test passed")
+
+
+def testServerFailuresAreNotBadRequests():
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    async def test(service, port):
+        # A spec the worker cannot set up is the client's fault
+        status, reply = await httpRequest(port, 'POST', '/coverage', {'grid': {'size': 5, 'cells': [0, 1]}})
+        assert status == 400 and 'ValueError' in reply['error']
+
+        # A worker that dies without a result is not
+        service.pool.shutdown()
+        service.pool = ThreadPoolExecutor(1)
+        backend.stream_coverage = lambda spec, queue: None
+        status, reply = await httpRequest(port, 'POST', '/coverage', SPEC)
+        assert status == 500 and 'without a result' in reply['error']
+
+        # Unexpected failures still get an error frame over the WebSocket
+        async def crash(spec):
+            raise RuntimeError('planner exploded')
+        service.route = crash
+        messages = [m async for m in backend.ws_plan('127.0.0.1', port, {**SPEC, 'type': 'route', 'goal': [5, 5]})]
+        assert messages == [{'type': 'error', 'error': 'RuntimeError: planner exploded'}]
+
+    stream = backend.stream_coverage
+    try:
+        asyncio.run(asyncio.wait_for(withService(test), 30))
+    finally:
+        backend.stream_coverage = stream
+
+    print("[OK] Server failure test passed")
+
+
+if __name__ == "__main__":
+    print("=== Running Backend Tests ===")
+    print("-" * 40)
+
+    testHttpEndpoints()
+    testWebSocketStreamsSegments()
+    testIdenticalJobsCoalesce()
+    testBackpressureAndBusy()
+    testRejectsBadAndOversizedRequests()
+    testPumpNoticesDeadWorker()
+    testServerFailuresAreNotBadRequests()
+
+    print("\n[OK] All backend tests passed!")
@@ -0,0 +1,168 @@
+
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+import numpy as np
+
+from grid import Grid
+from drone import Drone
+from coverage import CoveragePlanner
+from a_star import distance
+
+
+def assertContiguous(start, path):
+    previous = start
+    for posture in path:
+        assert distance(previous, posture) == 1
+        previous = posture
+
+
+def testStreamingMatchesPlan():
+
+    grid = Grid(size = 10, obstacle_prob = 0.15, seedling = 42)
+    grid.setstartposition((0, 0))
+
+    planned = CoveragePlanner(grid, Drone((0, 0), battery_capacity = 150)).plan_adaptive_coverage(battery_limit = 20)
+
+    streamed = []
+    for segment in CoveragePlanner(grid, Drone((0, 0), battery_capacity = 150)).iter_adaptive_coverage(battery_limit = 20):
+        assert len(segment) > 0
+        streamed.extend(segment)
+
+    assert streamed == planned
+    assertContiguous((0, 0), planned)
+    assert len(planned) <= 150 - 20
+
+    print("[OK] Streaming planner test passed")
+
+
+def testStreamingStopsEarly():
+
+    grid = Grid(size = 10, obstacle_prob = 0, no_fly_zone = 0)
+    planner = CoveragePlanner(grid, Drone((0, 0), battery_capacity = 1000))
+
+    segments = planner.iter_adaptive_coverage(battery_limit = 20)
+    first = next(segments)
+
+    # Only the first target has been planned so far
+    assert len(first) == 1
+    assertContiguous((0, 0), first)
+
+    print("[OK] Streaming early stop test passed")
+
+
+def testExecuteStreamedSegments():
+
+    grid = Grid(size = 8, obstacle_prob = 0, no_fly_zone = 0)
+    drone = Drone((0, 0), battery_capacity = 30)
+    planner = CoveragePlanner(grid, drone)
+
+    flown = planner.execute(planner.iter_greedy_coverage(look_ahead = 3))
+
+    assertContiguous((0, 0), flown)
+    assert drone.position == (flown[-1] if flown else (0, 0))
+    assert drone.get_path_length() == len(flown)
+
+    print("[OK] Execute streamed segments test passed")
+
+
+def testOptimizedCoverageBeatsGreedy():
+
+    grid = Grid(size = 12, obstacle_prob = 0.12, no_fly_zone = 0.06, seedling = 42)
+    grid.setstartposition((0, 0))
+    planner = CoveragePlanner(grid, Drone((0, 0), battery_capacity = 1000))
+
+    report = planner.plan_optimized_coverage(time_budget = 1.0)
+
+    assertContiguous((0, 0), report['path'])
+    assert len(report['path']) == report['length']
+    assert report['length'] <= report['greedy_length']
+    assert report['saved'] == report['greedy_length'] - report['length']
+    assert set(report['path']) >= planner.get_unvisited_safe_cells()
+
+    # Bigger maps are thinned to max_waypoints before building the matrix
+    grid = Grid(size = 20, obstacle_prob = 0.12, no_fly_zone = 0.06, seedling = 3)
+    grid.setstartposition((0, 0))
+    planner = CoveragePlanner(grid, Drone((0, 0), battery_capacity = 1000))
+    report = planner.plan_optimized_coverage(time_budget = 0.5, max_waypoints = 20)
+    assert len(report['order']) <= 20 and report['estimated'] == 0
+    assertContiguous((0, 0), report['path'])
+
+    # Thinning groups cells into blocks that are still swept cell by cell
+    grid = Grid(size = 30, obstacle_prob = 0.12, no_fly_zone = 0.06, seedling = 3)
+    grid.setstartposition((0, 0))
+    planner = CoveragePlanner(grid, Drone((0, 0), battery_capacity = 5000))
+    unvisited = planner.get_unvisited_safe_cells()
+    report = planner.plan_optimized_coverage(time_budget = 1.0, max_waypoints = 200)
+    assert report['waypoints'] <= 200 < len(unvisited)
+    assert report['coverage'] == 100.0 and set(report['path']) >= unvisited
+    assertContiguous((0, 0), report['path'])
+    assert report['length'] == len(report['path'])
+
+    print("[OK] Optimized coverage test passed")
+
+
+def testGreedyNeighborCounts():
+
+    grid = Grid(size = 15, obstacle_prob = 0.15, no_fly_zone = 0.05, seedling = 3, connectivity = 8)
+    grid.setstartposition((0, 0))
+    planner = CoveragePlanner(grid, Drone((0, 0), battery_capacity = 100))
+
+    unvisited = planner.get_unvisited_safe_cells()
+    mask = np.zeros((15, 15), dtype = bool)
+    for cell in unvisited:
+        mask[cell] = True
+    counts = planner._neighbor_counts(mask)
+    for cell in unvisited:
+        assert counts[cell] == sum(1 for other in grid.surroundings(cell) if other in unvisited)
+
+    path = planner.plan_greedy_coverage(look_ahead = 4)
+    previous = (0, 0)
+    for posture in path:
+        assert posture in grid.surroundings(previous)
+        previous = posture
+    assert len(set(path)) > 50
+
+    print("[OK] Greedy neighbor counts test passed")
+
+
+def testSortieCoverage():
+
+    grid = Grid(size = 20, obstacle_prob = 0.12, no_fly_zone = 0.06, seedling = 42)
+    grid.setstartposition((0, 0))
+    drone = Drone((0, 0), battery_capacity = 200)
+    planner = CoveragePlanner(grid, drone)
+    report = planner.plan_sortie_coverage(battery_limit = 40)
+
+    assert report['sortie_count'] > 1 and report['coverage'] == 100.0
+    assert report['out_of_range'] == 0
+
+    # Every sortie can be flown on one charge and ends home above the limit
+    energy = 0
+    for sortie in report['sorties']:
+        assert sortie[0] == sortie[-1] == (0, 0)
+        assertContiguous((0, 0), sortie[1:])
+        assert planner.execute_sorties([sortie]) == sortie[1:]
+        assert drone.battery >= 40
+        energy += 200 - drone.battery
+    assert energy == report['energy']
+    assert len(report['path']) == sum(len(sortie) - 1 for sortie in report['sorties'])
+
+    print("[OK] Sortie coverage test passed")
+
+
+if __name__ == "__main__":
+    print("=== Running Coverage Tests ===")
+    print("-" * 40)
+
+    testStreamingMatchesPlan()
+    testStreamingStopsEarly()
+    testExecuteStreamedSegments()
+    testOptimizedCoverageBeatsGreedy()
+    testGreedyNeighborCounts()
+    testSortieCoverage()
+
+    print("\n[OK] All coverage tests passed!")
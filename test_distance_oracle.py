@@ -0,0 +1,138 @@
+
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+import numpy as np
+
+from grid import Grid
+from a_star import a_star_search, path_cost
+from distance_oracle import DistanceOracle
+
+
+def samplePoints(grid, count):
+    points = []
+    for i in range(grid.size):
+        for j in range(grid.size):
+            if grid.isvalid((i, j)) and (i * grid.size + j) % 7 == 0:
+                points.append((i, j))
+    return points[:count]
+
+
+def testMatrixMatchesAstar():
+
+    grid = Grid(size = 12, obstacle_prob = 0.2, no_fly_zone = 0.05, seedling = 42)
+    points = samplePoints(grid, 8)
+
+    matrix = DistanceOracle(grid).matrix(points)
+
+    for i, a in enumerate(points):
+        for j, b in enumerate(points):
+            path = a_star_search(grid, a, b)
+            expected = len(path) - 1 if path else -1
+            assert matrix[i][j] == expected
+            assert matrix[i][j] == matrix[j][i]
+
+    print("[OK] Distance matrix test passed")
+
+
+def testProcessPoolMatchesSerial():
+
+    grid = Grid(size = 15, obstacle_prob = 0.15, no_fly_zone = 0.05, seedling = 7)
+    points = samplePoints(grid, 10)
+
+    serial = DistanceOracle(grid).matrix(points).copy()
+
+    grid.mark_changed()
+    with DistanceOracle(grid, workers = 2, parallel_threshold = 1) as oracle:
+        pooled = oracle.matrix(points)
+
+    assert (serial == pooled).all()
+
+    print("[OK] Process pool distance test passed")
+
+
+def testCachingAndPaths():
+
+    grid = Grid(size = 6, obstacle_prob = 0, no_fly_zone = 0)
+    oracle = DistanceOracle(grid)
+    points = [(0, 0), (5, 5), (0, 5)]
+
+    first = oracle.matrix(points)
+    assert oracle.matrix(points) is first
+    assert first[0][1] == 10
+
+    path = oracle.path((0, 0), (5, 5))
+    assert path[0] == (0, 0) and path[-1] == (5, 5) and len(path) == 11
+
+    # Editing the grid invalidates cached floods
+    for i in range(6):
+        grid.set_cell((i, 3), 1)
+    assert oracle.matrix(points)[0][1] == -1
+    assert oracle.path((0, 0), (5, 5)) is None
+
+    print("[OK] Oracle caching test passed")
+
+
+def testBoundedFieldsAndDeadline():
+
+    grid = Grid(size = 20, obstacle_prob = 0.1, no_fly_zone = 0.05, seedling = 7)
+    free = [tuple(map(int, cell)) for cell in zip(*np.nonzero(grid.grid == 0))]
+    points = free[::len(free) // 30][:30]
+    exact = DistanceOracle(grid).matrix(points)
+
+    # Fields beyond the cap are evicted, the matrix stays exact
+    oracle = DistanceOracle(grid, max_fields = 5)
+    assert (oracle.matrix(points) == exact).all()
+    assert len(oracle._fields) == 5
+    assert oracle.cached_field(points[-1]) is not None and oracle.cached_field(points[0]) is None
+    path = oracle.path(points[0], points[1])
+    assert len(path) - 1 == exact[0][1]
+
+    # An expired deadline floods only the first row and estimates the rest
+    stats = {}
+    rushed = DistanceOracle(grid).matrix(points, deadline = 0, stats = stats)
+    assert stats['estimated'] == len(points) - 1
+    assert (rushed[0] == exact[0]).all() and (rushed[:, 0] == exact[:, 0]).all()
+    assert ((rushed < 0) == (exact < 0)).all() and (rushed <= exact).all()
+
+    print("[OK] Bounded oracle test passed")
+
+
+def testCostLayerDistances():
+
+    grid = Grid(size = 15, obstacle_prob = 0.1, no_fly_zone = 0.05, seedling = 5, connectivity = 8)
+    grid.add_cost_region((3, 3), (11, 11), 4)
+    free = [tuple(map(int, cell)) for cell in zip(*np.nonzero(grid.grid == 0))]
+    points = free[::len(free) // 8][:8]
+
+    matrix = DistanceOracle(grid).matrix(points)
+    oracle = DistanceOracle(grid)
+    for i, a in enumerate(points):
+        for j, b in enumerate(points):
+            path = a_star_search(grid, a, b)
+            if path is None:
+                assert matrix[i][j] == -1
+                continue
+            assert abs(matrix[i][j] - path_cost(path, grid)) < 1e-6
+            # Legs stitched from a field cost the same as the A* route
+            leg = oracle.path(a, b)
+            assert leg[0] == a and leg[-1] == b
+            assert abs(path_cost(leg, grid) - matrix[i][j]) < 1e-6
+
+    print("[OK] Cost layer distance test passed")
+
+
+if __name__ == "__main__":
+    print("=== Running Distance Oracle Tests ===")
+    print("-" * 40)
+
+    testMatrixMatchesAstar()
+    testProcessPoolMatchesSerial()
+    testCachingAndPaths()
+    testBoundedFieldsAndDeadline()
+    testCostLayerDistances()
+
+    print("\n[OK] All distance oracle tests passed!")
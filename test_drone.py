@@ -6,6 +6,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 
 from drone import Drone
+from grid import Grid
 
 def testDroneCreation():
     
@@ -81,6 +82,42 @@ def testDroneReset():
     print("[OK] Drone reset test passed")
 
 
+def testVisitCounts():
+
+    drone = Drone(startposition = (0, 0), battery_capacity = 100, grid_size = 3)
+
+    drone.move((0, 1))
+    drone.move((0, 0))
+    drone.move((0, 1))
+
+    assert drone.visit_counts[0, 0] == 2
+    assert drone.visit_counts[0, 1] == 2
+    assert drone.visit_counts.sum() == len(drone.path_history)
+
+    # Flying past the sized area grows the array
+    drone.move((4, 1))
+    assert drone.get_visit_counts(5)[4, 1] == 1
+    assert drone.get_visit_counts(8).shape == (8, 8)
+
+    drone.reset()
+    assert drone.visit_counts.sum() == 1
+
+    print("[OK] Visit count test passed")
+
+
+def testTerrainCost():
+
+    grid = Grid(size = 5, obstacle_prob = 0, no_fly_zone = 0)
+    grid.add_cost_region((0, 2), (4, 2), 2.5)
+    drone = Drone((0, 0), battery_capacity = 10, terrain = grid)
+
+    assert drone.move((0, 1)) and drone.battery == 9
+    assert drone.move((0, 2)) and drone.battery == 6.5
+    assert drone.move((0, 3)) and drone.battery == 5.5
+
+    print("[OK] Terrain cost test passed")
+
+
 if __name__ == "__main__":
     print("=== Running Drone Tests ===")
     print("-" * 40)
@@ -90,5 +127,7 @@ if __name__ == "__main__":
     testBatteryDepletion()
     testVisitedTracking()
     testDroneReset()
+    testVisitCounts()
+    testTerrainCost()
 
     print("\n[OK] All Drone tests passed!")
@@ -0,0 +1,149 @@
+
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+from grid import Grid
+from a_star import distance
+from dynamic import OccupancySchedule, space_time_a_star
+
+
+def assertConflictFree(schedule, path, start_time = 0):
+    for k, posture in enumerate(path):
+        assert schedule.is_free(posture, start_time + k)
+    for previous, posture in zip(path, path[1:]):
+        assert distance(previous, posture) <= 1
+
+
+def testScheduleQueries():
+
+    grid = Grid(size = 6, obstacle_prob = 0, no_fly_zone = 0)
+    schedule = OccupancySchedule(grid)
+
+    schedule.add_window((2, 2), start = 3, end = 6, value = 2)
+    schedule.add_window((2, 2), start = 10, value = 1)
+    schedule.add_moving_obstacle([(0, 1), (0, 2), (0, 3)], start = 1, loop = True)
+
+    assert [schedule.dynamic_value((2, 2), t) for t in (2, 3, 5, 6, 10, 100)] == [0, 2, 2, 0, 1, 1]
+    assert schedule.dynamic_value((0, 1), 0) == 0
+    assert schedule.dynamic_value((0, 1), 1) == 1
+    assert schedule.dynamic_value((0, 3), 3) == 1
+    assert schedule.dynamic_value((0, 1), 4) == 1
+    assert schedule.occupied_cells(4) == {(2, 2): 2, (0, 1): 1}
+
+    print("[OK] Schedule query test passed")
+
+
+def testApplyOnlyTouchesChangedCells():
+
+    grid = Grid(size = 6, obstacle_prob = 0, no_fly_zone = 0)
+    grid.grid[4][4] = 1
+    grid.mark_changed()
+    schedule = OccupancySchedule(grid)
+    schedule.add_moving_obstacle([(4, 2), (4, 3), (4, 4), (4, 5)])
+    version = grid.version
+
+    assert schedule.apply(0) == [(4, 2)]
+    assert schedule.layer[4][2] == 1
+    assert sorted(schedule.apply(1)) == [(4, 2), (4, 3)]
+    assert schedule.layer[4][2] == 0 and schedule.layer[4][3] == 1
+
+    # Passing over a static obstacle leaves it alone
+    assert schedule.apply(2) == [(4, 3)]
+    assert schedule.layer[4][4] == 0
+    schedule.apply(3)
+    schedule.apply(4)
+    assert grid.grid[4][4] == 1 and schedule.layer[4][5] == 0
+
+    # The grid itself is never written, so its cached fields survive every tick
+    assert grid.version == version and grid.grid[4][2] == 0
+
+    print("[OK] Apply test passed")
+
+
+def testSpaceTimeAvoidsPatrol():
+
+    grid = Grid(size = 8, obstacle_prob = 0, no_fly_zone = 0)
+    for i in range(1, 8):
+        grid.grid[i][4] = 1
+    grid.mark_changed()
+
+    # A patrol sits in the only gap for a while, then leaves
+    schedule = OccupancySchedule(grid)
+    schedule.add_window((0, 4), start = 0, end = 7)
+
+    path = space_time_a_star(grid, schedule, (0, 0), (0, 7))
+
+    assert path[0] == (0, 0) and path[-1] == (0, 7)
+    assertConflictFree(schedule, path)
+    assert path.index((0, 4)) >= 7
+    assert len(path) - 1 == 7 + 3
+
+    print("[OK] Space-time A* test passed")
+
+
+def testSpaceTimeNoSwap():
+
+    grid = Grid(size = 5, obstacle_prob = 0, no_fly_zone = 0)
+    for j in range(5):
+        if j != 0:
+            for i in (1, 2, 3, 4):
+                grid.grid[i][j] = 1
+    grid.mark_changed()
+
+    # Obstacle flies head-on down the single-lane corridor
+    schedule = OccupancySchedule(grid)
+    schedule.add_moving_obstacle([(0, 4), (0, 3), (0, 2), (0, 1), (1, 0), (2, 0)])
+
+    path = space_time_a_star(grid, schedule, (0, 0), (0, 4))
+
+    assertConflictFree(schedule, path)
+    for t, (previous, posture) in enumerate(zip(path, path[1:])):
+        assert not (not schedule.is_free(posture, t) and not schedule.is_free(previous, t + 1))
+
+    # A goal that is blocked forever is never reached
+    schedule.add_window((0, 4), start = 0)
+    assert space_time_a_star(grid, schedule, (0, 0), (0, 4), max_time = 30) is None
+
+    print("[OK] Space-time swap test passed")
+
+
+def testSpaceTimeChecksStaticReachability():
+
+    grid = Grid(size = 30, obstacle_prob = 0, no_fly_zone = 0)
+    for i in range(30):
+        if i != 0:
+            grid.grid[i][15] = 1
+    grid.mark_changed()
+    schedule = OccupancySchedule(grid)
+    schedule.add_window((0, 15), start = 0, end = 5)
+
+    # The gap is only blocked for a while: the far side stays reachable
+    schedule.apply(0)
+    assert schedule.layer[0][15] == 1 and schedule.reachable((0, 0), (29, 29))
+    path = space_time_a_star(grid, schedule, (0, 0), (29, 29))
+    assert path[-1] == (29, 29)
+    assertConflictFree(schedule, path)
+
+    # Walled off for good: refused without searching every (cell, time) state
+    for i in range(30):
+        grid.set_cell((i, 20), 1)
+    assert not schedule.reachable((0, 0), (29, 29))
+    assert space_time_a_star(grid, schedule, (0, 0), (29, 29)) is None
+
+    print("[OK] Space-time reachability test passed")
+
+
+if __name__ == "__main__":
+    print("=== Running Dynamic Obstacle Tests ===")
+    print("-" * 40)
+
+    testScheduleQueries()
+    testApplyOnlyTouchesChangedCells()
+    testSpaceTimeAvoidsPatrol()
+    testSpaceTimeNoSwap()
+    testSpaceTimeChecksStaticReachability()
+
+    print("\n[OK] All dynamic obstacle tests passed!")
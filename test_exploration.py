@@ -0,0 +1,72 @@
+
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+from grid import Grid
+from drone import Drone
+from exploration import FrontierExplorer
+
+
+def bruteForceFrontier(explorer):
+    size = explorer.world.size
+    return {(row, col) for row in range(size) for col in range(size)
+            if explorer.is_frontier((row, col))}
+
+
+def testIncrementalFrontier():
+
+    world = Grid(size = 20, obstacle_prob = 0.15, no_fly_zone = 0.05, seedling = 3)
+    world.setstartposition((0, 0))
+    explorer = FrontierExplorer(world, Drone((0, 0), battery_capacity = 1000), sensing_radius = 2)
+
+    for _ in range(60):
+        explorer.step()
+        assert explorer.frontier == bruteForceFrontier(explorer)
+
+    # The drone only ever flies through cells it already knew to be safe
+    for posture in explorer.drone.path_history:
+        assert explorer.known[posture] and world.isvalid(posture)
+
+    print("[OK] Incremental frontier test passed")
+
+
+def testExplorationCompletes():
+
+    world = Grid(size = 30, obstacle_prob = 0.12, no_fly_zone = 0.06, seedling = 42)
+    world.setstartposition((0, 0))
+    explorer = FrontierExplorer(world, Drone((0, 0), battery_capacity = 5000), sensing_radius = 3)
+    report = explorer.run()
+
+    assert report['complete'] and report['steps'] == explorer.drone.get_path_length()
+    # Everything reachable from the start has been seen and matches the world
+    reachable = world.reachable_mask((0, 0))
+    assert explorer.known[reachable].all()
+    assert (explorer.belief.grid[explorer.known] == world.grid[explorer.known]).all()
+    assert report['exploration_rate'] > 1 and report['step_ms_mean'] > 0
+    assert len(explorer.history) == report['steps']
+
+    # The final report reuses the search that ended the run
+    searches = []
+    search = explorer._frontier_search
+    explorer._frontier_search = lambda start: searches.append(start) or search(start)
+    assert explorer.report()['complete'] and searches == []
+
+    # Out of battery: stops early with frontier left
+    explorer = FrontierExplorer(world, Drone((0, 0), battery_capacity = 20), sensing_radius = 3)
+    report = explorer.run()
+    assert report['steps'] == 20 and not report['complete']
+
+    print("[OK] Exploration completes test passed")
+
+
+if __name__ == "__main__":
+    print("=== Running Frontier Exploration Tests ===")
+    print("-" * 40)
+
+    testIncrementalFrontier()
+    testExplorationCompletes()
+
+    print("\n[OK] All frontier exploration tests passed!")
@@ -0,0 +1,121 @@
+
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+import numpy as np
+from grid import Grid
+from drone import Drone
+from coverage import CoveragePlanner
+from fleet import Fleet
+
+
+def testBulkMoveMatchesDrones():
+
+    starts = [(0, 0), (2, 2), (4, 1)]
+    fleet = Fleet(starts, battery_capacity = [3, 10, 10], grid_size = 5)
+    drones = [Drone(s, battery_capacity = c, grid_size = 5) for s, c in zip(starts, [3, 10, 10])]
+
+    steps = [[(0, 1), (2, 3), (4, 2)],
+             [(0, 2), (1, 3), (4, 1)],
+             [(0, 3), (1, 2), (4, 2)],
+             [(0, 4), (1, 1), (4, 3)]]
+
+    for targets in steps:
+        moved = fleet.move(targets)
+        assert moved.tolist() == [d.move(t) for d, t in zip(drones, targets)]
+
+    # The first drone ran out of battery after three moves
+    assert fleet.can_move().tolist() == [False, True, True]
+    assert fleet.positions.tolist() == [list(d.position) for d in drones]
+    assert fleet.battery.tolist() == [d.battery for d in drones]
+    assert fleet.get_path_lengths().tolist() == [d.get_path_length() for d in drones]
+    assert (fleet.visit_counts == sum(d.visit_counts for d in drones)).all()
+    assert fleet.get_coverage_count() == len(set().union(*(d.visited for d in drones)))
+    assert np.allclose(fleet.get_battery_percentages(), [d.get_battery_percentage() for d in drones])
+
+    print("[OK] Fleet bulk move test passed")
+
+
+def testMaskedMove():
+
+    fleet = Fleet([(0, 0), (1, 1)], battery_capacity = 10)
+    moved = fleet.move([(0, 1), (1, 2)], mask = [False, True])
+
+    assert moved.tolist() == [False, True]
+    assert fleet.positions.tolist() == [[0, 0], [1, 2]]
+    assert fleet.battery.tolist() == [10, 9]
+
+    print("[OK] Fleet masked move test passed")
+
+
+def testDroneViewCompatibility():
+
+    fleet = Fleet([(0, 0), (5, 5)], battery_capacity = 100, grid_size = 8)
+    view = fleet[1]
+
+    assert view.move((5, 6)) and view.move((5, 5))
+    assert fleet.positions[1].tolist() == [5, 5] and fleet.positions[0].tolist() == [0, 0]
+    assert view.path_history == [(5, 5), (5, 6), (5, 5)]
+    assert view.visited == {(5, 5), (5, 6)}
+    assert view.get_status() == {'position': (5, 5), 'battery': 98, 'battery_percentage': 98.0,
+                                 'coverage': 2, 'path_length': 2}
+
+    view.reset()
+    assert view.get_path_length() == 0 and view.battery == 100
+    assert fleet.get_coverage_count() == 2
+
+    print("[OK] Drone view test passed")
+
+
+def testPlannerFliesFleetMember():
+
+    grid = Grid(size = 8, obstacle_prob = 0, no_fly_zone = 0)
+    fleet = Fleet([(0, 0), (7, 7)], battery_capacity = 30, grid_size = 8)
+
+    planner = CoveragePlanner(grid, fleet[0])
+    flown = planner.execute(planner.iter_adaptive_coverage(battery_limit = 5))
+
+    assert fleet[0].path_history == [(0, 0)] + flown
+    assert fleet[1].get_path_length() == 0
+    assert fleet.battery[0] == 30 - len(flown)
+
+    print("[OK] Planner on fleet member test passed")
+
+
+def testTerrainCostsMatchDrones():
+
+    terrain = Grid(size = 6, obstacle_prob = 0, no_fly_zone = 0, connectivity = 8)
+    terrain.add_cost_region((0, 2), (5, 3), 3)
+    starts = [(0, 0), (5, 5)]
+    fleet = Fleet(starts, battery_capacity = 20, grid_size = 6, terrain = terrain)
+    drones = [Drone(s, battery_capacity = 20, grid_size = 6, terrain = terrain) for s in starts]
+    assert fleet.battery.dtype.kind == 'f' and fleet[0].terrain is terrain
+
+    steps = [[(1, 1), (4, 4)], [(1, 2), (4, 3)], [(2, 3), (3, 2)], [(2, 4), (3, 1)]]
+    for targets in steps:
+        moved = fleet.move(targets)
+        assert moved.tolist() == [d.move(t) for d, t in zip(drones, targets)]
+    assert np.allclose(fleet.battery, [d.battery for d in drones])
+
+    # Views debit the same weighted energy
+    view, drone = fleet[1], drones[1]
+    assert view.move((3, 2)) == drone.move((3, 2))
+    assert abs(view.battery - drone.battery) < 1e-9
+
+    print("[OK] Fleet terrain test passed")
+
+
+if __name__ == "__main__":
+    print("=== Running Fleet Tests ===")
+    print("-" * 40)
+
+    testBulkMoveMatchesDrones()
+    testMaskedMove()
+    testDroneViewCompatibility()
+    testPlannerFliesFleetMember()
+    testTerrainCostsMatchDrones()
+
+    print("\n[OK] All fleet tests passed!")
@@ -0,0 +1,75 @@
+
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from grid import Grid
+from drone import Drone
+from coverage import CoveragePlanner
+from footprint import SensorFootprint, footprint_kernel
+
+
+def testKernelShapes():
+
+    assert footprint_kernel(2, 'square').sum() == 25
+    assert footprint_kernel(2, 'disk').sum() == 13
+    assert footprint_kernel(0).sum() == 1
+
+    print("[OK] Footprint kernel test passed")
+
+
+def testOcclusion():
+
+    grid = Grid(size = 7, obstacle_prob = 0, seedling = 1)
+    for row in range(7):
+        grid.set_cell((row, 3), 1)
+    sensor = SensorFootprint(grid, radius = 3, shape = 'square')
+
+    # The wall itself is seen, nothing behind it
+    visible = set(sensor.visible_from((3, 2)))
+    assert (3, 3) in visible and (3, 4) not in visible
+    assert (3, 4) in SensorFootprint(grid, radius = 3, shape = 'square', occlusion = False).visible_from((3, 2))
+
+    # Gain is the convolution of the unseen mask with the occluded footprint
+    grid = Grid(size = 15, obstacle_prob = 0.2, seedling = 7)
+    sensor = SensorFootprint(grid, radius = 2)
+    unseen = np.random.default_rng(3).random((15, 15)) < 0.5
+    gain = sensor.gain_map(unseen)
+    for row in range(15):
+        for col in range(15):
+            assert gain[row, col] == sum(unseen[cell] for cell in sensor.visible_from((row, col)))
+
+    print("[OK] Occlusion test passed")
+
+
+def testViewpointCoverage():
+
+    grid = Grid(size = 20, obstacle_prob = 0.1, seedling = 42)
+    grid.setstartposition((0, 0))
+
+    planner = CoveragePlanner(grid, Drone((0, 0), battery_capacity = 2000))
+    cell_path = planner.plan_adaptive_coverage(battery_limit = 20)
+
+    sensor = SensorFootprint(grid, radius = 2)
+    planner = CoveragePlanner(grid, Drone((0, 0), battery_capacity = 2000))
+    path = planner.plan_viewpoint_coverage(sensor, battery_limit = 20)
+
+    assert all(grid.isvalid(posture) for posture in path)
+    assert planner.estimate_coverage_percent(path, sensor) == 100.0
+    assert len(path) * 1.5 < len(cell_path)
+
+    print("[OK] Viewpoint coverage test passed")
+
+
+if __name__ == "__main__":
+    print("=== Running Sensor Footprint Tests ===")
+    print("-" * 40)
+
+    testKernelShapes()
+    testOcclusion()
+    testViewpointCoverage()
+
+    print("\n[OK] All sensor footprint tests passed!")
@@ -0,0 +1,146 @@
+
+
+import sys
+import os
+import struct
+import subprocess
+import tempfile
+import zlib
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+import numpy as np
+from grid import Grid
+from frame_export import FrameRenderer, encode_png, export_mission, path_events
+
+
+def decodePng(data):
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    width, height = struct.unpack('>II', data[16:24])
+    position = 8
+    idat = b''
+    while position < len(data):
+        length, = struct.unpack('>I', data[position:position + 4])
+        kind = data[position + 4:position + 8]
+        if kind == b'IDAT':
+            idat += data[position + 8:position + 8 + length]
+        position += 12 + length
+    raw = np.frombuffer(zlib.decompress(idat), dtype = np.uint8).reshape(height, width * 3 + 1)
+    assert (raw[:, 0] == 0).all()
+    return raw[:, 1:].reshape(height, width, 3)
+
+
+def testPngRoundTrip():
+
+    image = np.random.RandomState(0).randint(0, 256, size = (7, 5, 3)).astype(np.uint8)
+    assert (decodePng(encode_png(image)) == image).all()
+
+    print("[OK] PNG encoding test passed")
+
+
+def testRendererPaintsChangedCells():
+
+    grid = Grid(size = 4, obstacle_prob = 0, no_fly_zone = 0)
+    grid.grid[3][3] = 2
+    grid.mark_changed()
+    renderer = FrameRenderer(grid, (0, 0), cell_px = 3)
+
+    assert renderer.frame.shape == (12, 12, 3)
+    assert (renderer.frame[0:3, 0:3] == renderer.drone_color).all()
+    assert (renderer.frame[9:12, 9:12] == renderer.palette[2]).all()
+
+    renderer.move((0, 1))
+    renderer.move((0, 0))
+    renderer.set_cell((2, 2), 1)
+
+    # (0, 1) visited once, drone back on (0, 0), new obstacle painted
+    assert tuple(renderer.frame[1, 4]) == (12, 92, 119)
+    assert (renderer.frame[0:3, 0:3] == renderer.drone_color).all()
+    assert (renderer.frame[6:9, 6:9] == renderer.palette[1]).all()
+    assert grid.grid[2][2] == 1
+
+    # The PNG is the live buffer
+    assert (decodePng(renderer.png()) == renderer.frame).all()
+
+    print("[OK] Renderer painting test passed")
+
+
+def testExportMission():
+
+    grid = Grid(size = 6, obstacle_prob = 0, no_fly_zone = 0)
+    path = [(0, 1), (0, 2), (1, 2), (1, 1), (1, 0)]
+    events = path_events(grid, (0, 0), path)
+
+    with tempfile.TemporaryDirectory() as folder:
+        assert export_mission(events, out_dir = folder) == 6
+        names = sorted(os.listdir(folder))
+        assert names[0] == 'frame_000000.png' and len(names) == 6
+        with open(os.path.join(folder, names[-1]), 'rb') as f:
+            last = decodePng(f.read())
+
+    with tempfile.TemporaryDirectory() as folder:
+        # Start, every second move, and the final state
+        assert export_mission(events, out_dir = folder, every = 2) == 4
+
+    renderer = FrameRenderer(Grid(size = 6, obstacle_prob = 0, no_fly_zone = 0), (0, 0))
+    for cell in path:
+        renderer.move(cell)
+    assert (last == renderer.frame).all()
+
+    try:
+        import PIL
+    except ImportError:
+        PIL = None
+    if PIL is not None:
+        with tempfile.TemporaryDirectory() as folder:
+            gif = os.path.join(folder, 'mission.gif')
+            export_mission(events, gif_path = gif)
+            assert os.path.getsize(gif) > 0
+
+    print("[OK] Mission export test passed")
+
+
+def testGifFramesAreCapped():
+
+    try:
+        from PIL import Image
+    except ImportError:
+        print("[SKIP] GIF cap test needs Pillow")
+        return
+
+    grid = Grid(size = 8, obstacle_prob = 0, no_fly_zone = 0)
+    path = [(row, col) for row in range(8) for col in (range(8) if row % 2 == 0 else range(7, -1, -1))][1:]
+    events = path_events(grid, (0, 0), path)
+
+    with tempfile.TemporaryDirectory() as folder:
+        gif = os.path.join(folder, 'mission.gif')
+        frames = export_mission(events, gif_path = gif, max_gif_frames = 10)
+        with Image.open(gif) as image:
+            assert image.n_frames == frames
+        # Start, one frame per ceil(63 / 10) = 7 moves, and the final state
+        assert frames == 1 + 63 // 7
+
+    print("[OK] GIF frame cap test passed")
+
+
+def testRendererDoesNotNeedMatplotlib():
+
+    code = ("import sys; from grid import Grid; from frame_export import FrameRenderer; "
+            "FrameRenderer(Grid(size = 4, obstacle_prob = 0, no_fly_zone = 0), (0, 0)); "
+            "assert 'matplotlib' not in sys.modules")
+    assert subprocess.run([sys.executable, '-c', code], cwd = os.path.dirname(os.path.abspath(__file__))).returncode == 0
+
+    print("[OK] Matplotlib-free renderer test passed")
+
+
+if __name__ == "__main__":
+    print("=== Running Frame Export Tests ===")
+    print("-" * 40)
+
+    testPngRoundTrip()
+    testRendererPaintsChangedCells()
+    testExportMission()
+    testGifFramesAreCapped()
+    testRendererDoesNotNeedMatplotlib()
+
+    print("\n[OK] All frame export tests passed!")
@@ -73,6 +73,27 @@ def testgetsurroundings():
 
     print("[OK] Get surroundings test passed")
 
+def testdiagonalsurroundings():
+
+    grid = Grid(size = 5, obstacle_prob = 0, no_fly_zone = 0, connectivity = 8)
+    assert len(grid.surroundings((2, 2))) == 8
+    assert sorted(grid.surroundings((0, 0))) == [(0, 1), (1, 0), (1, 1)]
+
+    # No cutting past a blocked corner
+    grid.set_cell((1, 2), 1)
+    around = grid.surroundings((2, 2))
+    assert (1, 1) not in around and (1, 3) not in around and (3, 3) in around
+    assert dict(grid.moves((2, 2)))[(3, 3)] == 2 ** 0.5
+    assert dict(grid.moves((2, 2)))[(3, 2)] == 1
+
+    try:
+        Grid(size = 5, connectivity = 6)
+        assert False, "connectivity 6 should be rejected"
+    except ValueError:
+        pass
+
+    print("[OK] Diagonal surroundings test passed")
+
 def testgridstats():
     
     # Fix: obstacle_prob, no_fly_zone
@@ -89,6 +110,43 @@ def testgridstats():
 
     print("[OK] Grid stats test passed")
 
+def testclearancefield():
+
+    grid = Grid(size = 7, obstacle_prob = 0, no_fly_zone = 0)
+    grid.set_cell((3, 3), 1)
+
+    clearance = grid.clearance_field()
+
+    assert clearance[3][3] == 0
+    assert clearance[2][2] == 1
+    assert clearance[3][5] == 2
+    assert clearance[0][0] == 3
+
+    # Edits invalidate the cached field
+    grid.toggle_obstacle((3, 3))
+    assert grid.clearance_field()[3][3] == grid.size
+
+    print("[OK] Clearance field test passed")
+
+def testreachable():
+
+    grid = Grid(size = 5, obstacle_prob = 0, no_fly_zone = 0)
+    assert grid.reachable((0, 0), (4, 4)) == True
+
+    # A full wall splits the grid in two
+    for i in range(5):
+        grid.set_cell((i, 2), 1)
+    assert grid.reachable((0, 0), (4, 4)) == False
+    assert grid.reachable((0, 0), (4, 1)) == True
+    assert grid.reachable((0, 0), (0, 2)) == False
+    assert int(grid.reachable_mask((0, 0)).sum()) == 10
+
+    # Opening a gap joins them again
+    grid.toggle_obstacle((2, 2))
+    assert grid.reachable((0, 0), (4, 4)) == True
+
+    print("[OK] Reachability test passed")
+
 if __name__ == "__main__":
     print("=== Running Grid Tests ===")
     print ("-" * 40)
@@ -97,7 +155,10 @@ if __name__ == "__main__":
     testgridcelltypes()
     testisvalid()
     testgetsurroundings()
+    testdiagonalsurroundings()
     testgridstats()
+    testclearancefield()
+    testreachable()
 
     print("\n[OK] All grid tests passed!")
 
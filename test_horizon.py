@@ -0,0 +1,118 @@
+
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+from grid import Grid
+from drone import Drone
+from a_star import a_star_search, distance, distance_field, path_cost
+from horizon import RecedingHorizonPlanner
+
+
+def assertContiguous(start, path):
+    previous = start
+    for posture in path:
+        assert distance(previous, posture) == 1
+        previous = posture
+
+
+def testGoalRouteIsShortest():
+
+    grid = Grid(size = 30, obstacle_prob = 0.15, no_fly_zone = 0.05, seedling = 42)
+    grid.setstartposition((0, 0))
+    field = distance_field(grid, (0, 0))
+    goal = tuple(int(i) for i in divmod(int(field.argmax()), grid.size))
+
+    planner = RecedingHorizonPlanner(grid, Drone((0, 0), battery_capacity = 1000), window = 4)
+    path = [posture for segment in planner.iter_goal(goal) for posture in segment]
+
+    assertContiguous((0, 0), path)
+    assert path[-1] == goal
+    assert len(path) == field[goal]
+
+    print("[OK] Receding-horizon goal test passed")
+
+
+def testGoalRouteHonoursCostLayer():
+
+    grid = Grid(size = 24, obstacle_prob = 0.1, no_fly_zone = 0.05, seedling = 42)
+    grid.setstartposition((0, 0))
+    grid.setstartposition((23, 23))
+    grid.add_cost_region((4, 0), (19, 17), 6)
+
+    planner = RecedingHorizonPlanner(grid, Drone((0, 0), battery_capacity = 1000), window = 4)
+    path = [(0, 0)] + [posture for segment in planner.iter_goal((23, 23)) for posture in segment]
+
+    assertContiguous((0, 0), path[1:])
+    assert path[-1] == (23, 23)
+    exact = a_star_search(grid, (0, 0), (23, 23))
+    assert abs(path_cost(path, grid) - path_cost(exact, grid)) < 1e-6
+    assert path_cost(path, grid) < len(path) * 2
+
+    print("[OK] Receding-horizon cost layer test passed")
+
+
+def testWindowBoundsLocalSearch():
+
+    grid = Grid(size = 40, obstacle_prob = 0, no_fly_zone = 0)
+    planner = RecedingHorizonPlanner(grid, Drone((20, 20), battery_capacity = 1000), window = 3)
+
+    steps, parents = planner._local_search((20, 20))
+    assert len(steps) == 7 * 7
+    assert max(steps.values()) == 6
+
+    print("[OK] Window bound test passed")
+
+
+def testFieldSurvivesDistantEdits():
+
+    grid = Grid(size = 20, obstacle_prob = 0, no_fly_zone = 0)
+    planner = RecedingHorizonPlanner(grid, Drone((0, 0), battery_capacity = 1000), window = 3)
+    segments = planner.iter_goal((19, 19))
+
+    next(segments)
+    grid.set_cell((0, 19), 1)
+    path = [posture for segment in segments for posture in segment]
+
+    assert path[-1] == (19, 19)
+    assert planner.field_builds == 1
+
+    print("[OK] Terminal field caching test passed")
+
+
+def testCoverageStream():
+
+    grid = Grid(size = 12, obstacle_prob = 0.12, no_fly_zone = 0.06, seedling = 7)
+    grid.setstartposition((0, 0))
+    drone = Drone((0, 0), battery_capacity = 1000)
+
+    planner = RecedingHorizonPlanner(grid, drone, window = 3)
+    path = [posture for segment in planner.iter_coverage(battery_limit = 20, end_point = (0, 0))
+            for posture in segment]
+
+    assertContiguous((0, 0), path)
+    assert path[-1] == (0, 0)
+    assert set(path) | {(0, 0)} == set(zip(*(i.tolist() for i in grid.reachable_mask((0, 0)).nonzero())))
+
+    # A short battery stops coverage early but still gets home
+    drone = Drone((0, 0), battery_capacity = 60)
+    path = [posture for segment in RecedingHorizonPlanner(grid, drone).iter_coverage(battery_limit = 5, end_point = (0, 0))
+            for posture in segment]
+    assert path[-1] == (0, 0) and len(path) <= 60 - 5
+
+    print("[OK] Receding-horizon coverage test passed")
+
+
+if __name__ == "__main__":
+    print("=== Running Receding-Horizon Tests ===")
+    print("-" * 40)
+
+    testGoalRouteIsShortest()
+    testGoalRouteHonoursCostLayer()
+    testWindowBoundsLocalSearch()
+    testFieldSurvivesDistantEdits()
+    testCoverageStream()
+
+    print("\n[OK] All receding-horizon tests passed!")
@@ -0,0 +1,136 @@
+
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+from grid import Grid
+from drone import Drone
+from metrics import (calculate_monte_carlo_baseline, calculate_random_baseline,
+                     calculate_safety_buffer_violations, calculate_clearance_stats,
+                     safety_score, energy_breakdown)
+
+
+def testMonteCarloBaselineOpenGrid():
+
+    grid = Grid(size = 5, obstacle_prob = 0, no_fly_zone = 0)
+
+    baseline = calculate_monte_carlo_baseline(grid, (0, 0), battery_capacity = 10,
+                                              walkers = 200, seed = 7)
+
+    # Nothing blocks the walkers, so every one of them spends the full battery
+    assert baseline['path_length'] == 10
+    assert baseline['battery_used'] == 10
+    assert 2 <= baseline['coverage'] <= 11
+    assert 0 <= baseline['turns'] <= 9
+
+    low, high = baseline['distribution']['coverage']['ci95']
+    assert low <= baseline['coverage'] <= high
+
+    print("[OK] Monte Carlo baseline open grid test passed")
+
+
+def testMonteCarloBaselineStuckStart():
+
+    grid = Grid(size = 5, obstacle_prob = 0, no_fly_zone = 0)
+    grid.set_cell((0, 1), 1)
+    grid.set_cell((1, 0), 1)
+
+    baseline = calculate_monte_carlo_baseline(grid, (0, 0), battery_capacity = 10,
+                                              walkers = 50, seed = 7)
+
+    assert baseline['path_length'] == 0
+    assert baseline['coverage'] == 1
+    assert baseline['turns'] == 0
+
+    print("[OK] Monte Carlo baseline stuck start test passed")
+
+
+def testMonteCarloBaselineSeeded():
+
+    grid = Grid(size = 10, obstacle_prob = 0.15, no_fly_zone = 0.05, seedling = 42)
+    grid.setstartposition((0, 0))
+
+    first = calculate_monte_carlo_baseline(grid, (0, 0), 50, walkers = 100, seed = 3)
+    second = calculate_monte_carlo_baseline(grid, (0, 0), 50, walkers = 100, seed = 3)
+
+    assert first['coverage'] == second['coverage']
+    assert first['turns'] == second['turns']
+
+    print("[OK] Monte Carlo baseline seeding test passed")
+
+
+def testMonteCarloBaselineDiagonal():
+
+    grid = Grid(size = 8, obstacle_prob = 0, no_fly_zone = 0, connectivity = 8)
+
+    baseline = calculate_monte_carlo_baseline(grid, (0, 0), battery_capacity = 10,
+                                              walkers = 500, seed = 7)
+
+    # Walkers take diagonal steps too, which cost sqrt(2) of the battery
+    assert 10 / 2 ** 0.5 <= baseline['path_length'] < 10
+    assert 10 - 2 ** 0.5 < baseline['battery_used'] <= 10
+
+    # Same walk rules as the single random walk
+    random.seed(7)
+    walks = [calculate_random_baseline(grid, (0, 0), 10) for _ in range(500)]
+    single = sum(walk['path_length'] for walk in walks) / len(walks)
+    assert abs(single - baseline['path_length']) < 0.3
+
+    print("[OK] Monte Carlo baseline diagonal test passed")
+
+
+def testClearanceMetrics():
+
+    grid = Grid(size = 5, obstacle_prob = 0, no_fly_zone = 0)
+    grid.set_cell((2, 2), 2)
+
+    path = [(0, 0), (1, 1), (1, 2), (0, 2), (0, 3), (0, 4)]
+
+    # (1, 1) and (1, 2) touch the no-fly cell, the rest are two cells away
+    assert calculate_safety_buffer_violations(path, grid) == 2
+    stats = calculate_clearance_stats(path, grid)
+    assert stats['min_clearance'] == 1
+    assert stats['mean_clearance'] == (1 + 1 + 2 + 2 + 2 + 2) / 6
+
+    assert safety_score(path, grid) == 100
+    assert safety_score(path + [(2, 2), (5, 0)], grid) == 75
+
+    print("[OK] Clearance metrics test passed")
+
+
+def testDiagonalEnergy():
+
+    # Diagonal cells cost sqrt(2) ...
+    straight = energy_breakdown([(0, 0), (0, 1), (0, 2)])
+    diagonal = energy_breakdown([(0, 0), (1, 1), (2, 2)])
+    assert abs(diagonal['total_energy'] - 2 ** 0.5 * straight['total_energy']) < 1e-9
+
+    # ... and a 45 degree turn pays half the penalty of a 90 degree one
+    sharp = energy_breakdown([(0, 0), (1, 0), (1, 1)])
+    gentle = energy_breakdown([(0, 0), (1, 1), (1, 2)])
+    assert gentle['turn_moves'] == sharp['turn_moves'] > 0
+    assert 2 * gentle['turn_penalty_cost'] == sharp['turn_penalty_cost']
+
+    drone = Drone((0, 0), battery_capacity = 10)
+    drone.move((1, 1))
+    drone.move((1, 2))
+    assert abs(drone.battery - (9 - 2 ** 0.5)) < 1e-9
+
+    print("[OK] Diagonal energy test passed")
+
+
+if __name__ == "__main__":
+    print("=== Running Metrics Tests ===")
+    print("-" * 40)
+
+    testMonteCarloBaselineOpenGrid()
+    testMonteCarloBaselineStuckStart()
+    testMonteCarloBaselineSeeded()
+    testMonteCarloBaselineDiagonal()
+    testClearanceMetrics()
+    testDiagonalEnergy()
+
+    print("\n[OK] All metrics tests passed!")
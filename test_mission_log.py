@@ -0,0 +1,116 @@
+
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+from grid import Grid
+from drone import Drone
+from coverage import CoveragePlanner
+from a_star import bidirectional_search
+from mission_log import MissionLog, read_log, replay
+
+
+def recordMission(path):
+    """Fly a short coverage mission with one obstacle toggle and detour, logging it"""
+    grid = Grid(size = 10, obstacle_prob = 0.1, no_fly_zone = 0.05, seedling = 42)
+    grid.setstartposition((0, 0))
+    drone = Drone((0, 0), battery_capacity = 120)
+    planned = CoveragePlanner(grid, drone).plan_adaptive_coverage(battery_limit = 20)
+
+    with MissionLog(path) as log:
+        log.start(grid, drone)
+        step = 0
+        while step < len(planned):
+            if step == 10:
+                # Block the next cell and route around it to the one after
+                blocked = planned[step]
+                grid.toggle_obstacle(blocked)
+                log.record('toggle', step, p = blocked, v = grid.grid[blocked[0]][blocked[1]])
+                detour = bidirectional_search(grid, drone.position, planned[step + 1])
+                log.record('replan', step, blocked = blocked,
+                           **{'from': drone.position, 'to': planned[step + 1], 'path': detour})
+                planned[step:step + 2] = detour[1:]
+            drone.move(planned[step])
+            log.record('move', step, p = planned[step])
+            step += 1
+        log.record('end', step, **drone.get_status())
+
+    return grid, drone
+
+
+def testReplayReproducesMission():
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'mission.jsonl')
+        grid, drone = recordMission(path)
+        events = read_log(path)
+
+    assert events[0]['e'] == 'start' and events[-1]['e'] == 'end'
+    assert [e['e'] for e in events].count('toggle') == 1
+
+    report = replay(events)
+
+    assert report['moves'] == drone.get_path_length()
+    assert report['drone'].position == drone.position
+    assert report['drone'].battery == drone.battery
+    assert report['drone'].visited == drone.visited
+    assert (report['grid'].grid == grid.grid).all()
+    assert report['collisions'] == []
+    assert report['divergences'] == []
+
+    print("[OK] Replay test passed")
+
+
+def testReplayFlagsChanges():
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'mission.jsonl')
+        recordMission(path)
+        events = read_log(path)
+
+    # A route recorded by different planner code no longer matches
+    replan = next(e for e in events if e['e'] == 'replan')
+    replan['path'] = replan['path'][:1] + replan['path'][1:][::-1]
+
+    # A move into a cell that was blocked at the time
+    toggle = next(e for e in events if e['e'] == 'toggle')
+    events.insert(events.index(toggle) + 1, {'t': toggle['t'], 'e': 'move', 'p': toggle['p']})
+
+    report = replay(events)
+
+    assert len(report['divergences']) == 1
+    assert report['divergences'][0]['e'] == 'replan'
+    assert report['collisions'] == [toggle['t']]
+
+    print("[OK] Replay divergence test passed")
+
+
+def testEventsReachDiskBeforeClose():
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'mission.jsonl')
+        grid = Grid(size = 5, obstacle_prob = 0, no_fly_zone = 0)
+        log = MissionLog(path)
+        log.start(grid, Drone((0, 0), battery_capacity = 10))
+        log.record('move', 0, p = (0, 1))
+
+        # Readable while the mission is still running (as after a crash)
+        events = read_log(path)
+        assert [e['e'] for e in events] == ['start', 'move'] and events[1]['p'] == [0, 1]
+        log.close()
+
+    print("[OK] Log flush test passed")
+
+
+if __name__ == "__main__":
+    print("=== Running Mission Log Tests ===")
+    print("-" * 40)
+
+    testReplayReproducesMission()
+    testReplayFlagsChanges()
+    testEventsReachDiskBeforeClose()
+
+    print("\n[OK] All mission log tests passed!")
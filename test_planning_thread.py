@@ -0,0 +1,227 @@
+
+
+import sys
+import os
+import time
+import threading
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+import matplotlib
+matplotlib.use('Agg')
+
+from planning_thread import PlanningThread
+from demo import LiveDemo
+
+
+def flyMission(demo, timeout = 30):
+    deadline = time.time() + timeout
+    while not demo.mission_complete():
+        assert time.time() < deadline
+        if not demo.step():
+            time.sleep(0.001)
+
+
+def testLatestJobWins():
+
+    planning = PlanningThread()
+    gate = threading.Event()
+    planning.submit('segment', gate.wait)
+
+    # Queued jobs of a kind replace each other; other kinds are kept
+    planning.submit('route', lambda: 'old')
+    planning.submit('route', lambda: 'new')
+    planning.submit('splice', lambda: 1 / 0)
+    assert planning.poll('route') is None and planning.pending('route')
+
+    gate.set()
+    assert planning.wait(5)
+    assert planning.poll('segment') == (True, None)
+    assert planning.poll('route') == ('new', None)
+    assert isinstance(planning.poll('splice')[1], ZeroDivisionError)
+    assert planning.poll('route') is None
+
+    # A cancelled job's result never shows up
+    gate.clear()
+    planning.submit('segment', gate.wait)
+    planning.cancel('segment')
+    gate.set()
+    assert planning.wait(5)
+    assert planning.poll('segment') is None and not planning.pending('segment')
+    planning.close()
+
+    print("[OK] Latest job wins test passed")
+
+
+def testBackgroundMatchesInline():
+
+    paths = []
+    for background in (False, True):
+        demo = LiveDemo(grid_size = 15, seed = 42, interactive = False, background = background)
+        demo.generate_path()
+        flyMission(demo)
+        paths.append(demo.drone.path_history)
+
+    fresh = LiveDemo(grid_size = 15, seed = 42, interactive = False)
+    expected = fresh.planner.plan_adaptive_coverage(battery_limit = 20)
+    assert paths[0] == paths[1] == [(0, 0)] + expected
+
+    print("[OK] Background planning test passed")
+
+
+def testDroneFliesOnWhileReplanning():
+
+    demo = LiveDemo(grid_size = 15, seed = 42, interactive = False, handoff_lead = 3)
+    demo.dashboard.setup_plot()
+    demo.generate_path()
+    demo.is_started = True
+    while len(demo.full_path) < 12:
+        demo.request_segment()
+        demo.planning.wait(5)
+        demo.collect_plans()
+    planned = list(demo.full_path)
+
+    # Hold the planning thread so the detour is still pending while the drone flies
+    gate = threading.Event()
+    demo.planning.submit('hold', gate.wait)
+    blocked = planned[8]
+    demo.grid.toggle_obstacle(blocked)
+    demo.handle_obstacle_update(blocked)
+    assert demo.splice['index'] == 3
+
+    for _ in range(10):
+        demo.step()
+    assert demo.current_step == 3 and demo.drone.path_history == [(0, 0)] + planned[:3]
+
+    gate.set()
+    flyMission(demo)
+    assert blocked not in demo.drone.path_history
+    assert all(demo.grid.isvalid(posture) for posture in demo.drone.path_history)
+    demo.planning.close()
+
+    print("[OK] Replanning handoff test passed")
+
+
+def testTwoObstaclesBeforeOnePoll():
+
+    demo = LiveDemo(grid_size = 12, seed = 42, interactive = False, background = False)
+    demo.dashboard.setup_plot()
+    demo.grid.grid[:] = 0
+    demo.grid.mark_changed()
+    demo.full_path = [(0, col) for col in range(1, 12)]
+    demo.is_started = True
+
+    # Both land before the first detour is collected
+    for blocked in ((0, 9), (0, 5)):
+        demo.grid.toggle_obstacle(blocked)
+        demo.handle_obstacle_update(blocked)
+
+    flyMission(demo)
+    path = demo.drone.path_history
+    assert (0, 9) not in path and (0, 5) not in path
+    assert path[-1] == (0, 11) and all(demo.grid.isvalid(posture) for posture in path)
+    assert all(b in demo.grid.surroundings(a) for a, b in zip(path, path[1:]))
+
+    print("[OK] Two obstacles before one poll test passed")
+
+
+def testStaleSegmentIsRevalidated():
+
+    demo = LiveDemo(grid_size = 15, seed = 42, interactive = False, background = False)
+    demo.generate_path()
+    while len(demo.full_path) < 6:
+        demo.collect_plans()
+        demo.request_segment()
+
+    # A segment finishes planning, then the map changes before it is collected
+    demo.collect_plans()
+    demo.request_segment()
+    segment, _ = demo.planning.poll('segment')
+    blocked = segment[-1]
+    demo.grid.toggle_obstacle(blocked)
+    demo.accept_segment(segment)
+    assert blocked not in demo.full_path
+
+    flyMission(demo)
+    path = demo.drone.path_history
+    assert blocked not in path and all(demo.grid.isvalid(posture) for posture in path)
+    assert all(b in demo.grid.surroundings(a) for a, b in zip(path, path[1:]))
+
+    print("[OK] Stale segment test passed")
+
+
+def testScheduledConflictSearchesAreCapped():
+
+    import dynamic
+
+    demo = LiveDemo(grid_size = 15, seed = 42, interactive = False, background = False)
+    demo.generate_path()
+    while len(demo.full_path) < 40 and demo.path_stream is not None:
+        demo.collect_plans()
+        demo.request_segment()
+    demo.schedule = dynamic.OccupancySchedule(demo.grid)
+    demo.schedule.add_window(demo.full_path[0], start = 0, end = 3)
+
+    calls = []
+    search = dynamic.space_time_a_star
+    dynamic.space_time_a_star = lambda *args, **kwargs: calls.append(args[3]) or None
+    try:
+        demo.avoid_scheduled_conflict(max_attempts = 4)
+    finally:
+        dynamic.space_time_a_star = search
+    assert len(calls) == 4 and demo.full_path == []
+
+    # With the real search the drone waits the window out and flies on
+    demo = LiveDemo(grid_size = 15, seed = 42, interactive = False, background = False)
+    demo.generate_path()
+    demo.collect_plans()
+    demo.schedule = dynamic.OccupancySchedule(demo.grid)
+    blocked = demo.full_path[0]
+    demo.schedule.add_window(blocked, start = 0, end = 3)
+    flyMission(demo)
+    path = demo.drone.path_history
+    assert blocked in path and path.index(blocked) >= 3
+
+    print("[OK] Scheduled conflict cap test passed")
+
+
+def testSkippedCellsAreRevisited():
+
+    import dynamic
+
+    demo = LiveDemo(grid_size = 15, seed = 42, interactive = False, background = False)
+    demo.grid.grid[:] = 0
+    demo.grid.mark_changed()
+    demo.full_path = []
+    demo.path_stream = iter([[(0, col) for col in range(1, 15)]])
+    demo.request_segment()
+    demo.is_started = True
+
+    # (0, 3) stays blocked longer than the inline detour may wait, so the
+    # detour flies past it; it is picked up again once coverage is planned out
+    demo.schedule = dynamic.OccupancySchedule(demo.grid)
+    demo.schedule.add_window((0, 3), start = 0, end = 120)
+    version = demo.grid.version
+    flyMission(demo)
+
+    path = demo.drone.path_history
+    assert (0, 3) in path and path.index((0, 3)) >= 120
+    assert all(demo.schedule.is_free(posture, k) for k, posture in enumerate(path))
+    assert demo.grid.version == version
+
+    print("[OK] Skipped cells revisit test passed")
+
+
+if __name__ == "__main__":
+    print("=== Running Background Planning Tests ===")
+    print("-" * 40)
+
+    testLatestJobWins()
+    testBackgroundMatchesInline()
+    testDroneFliesOnWhileReplanning()
+    testTwoObstaclesBeforeOnePoll()
+    testStaleSegmentIsRevalidated()
+    testScheduledConflictSearchesAreCapped()
+    testSkippedCellsAreRevisited()
+
+    print("\n[OK] All background planning tests passed!")
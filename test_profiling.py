@@ -0,0 +1,113 @@
+
+
+import sys
+import os
+import json
+import threading
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+import profiling
+from grid import Grid
+from drone import Drone
+from coverage import CoveragePlanner
+from a_star import a_star_search
+
+
+def testDisabledByDefault():
+
+    assert profiling.active() is None
+    with profiling.phase('nothing'):
+        profiling.count('nothing')
+    assert profiling.active() is None
+
+    print("[OK] Disabled profiling test passed")
+
+
+def testAstarCounters():
+
+    grid = Grid(size = 15, obstacle_prob = 0.15, no_fly_zone = 0.05, seedling = 42)
+    grid.setstartposition((0, 0))
+    goal = (14, 14)
+    grid.set_cell(goal, 0)
+
+    stats = {}
+    with profiling.Profiler() as profiler:
+        path = a_star_search(grid, (0, 0), goal, stats = stats)
+
+    assert profiling.active() is None
+    assert path is not None
+    assert stats['pushes'] >= stats['expanded'] > 0
+    assert 0 < stats['max_open'] <= stats['pushes']
+    assert profiler.counters['a_star.expanded'] == stats['expanded']
+    assert profiler.counters['a_star.pushes'] == stats['pushes']
+    assert profiler.counters['a_star.max_open'] == stats['max_open']
+    assert profiler.phases[('a_star_search',)][0] == 1
+
+    # The open-list size is the largest over all searches, not a sum
+    with profiler:
+        a_star_search(grid, (0, 0), (0, 1))
+    assert profiler.counters['a_star.max_open'] == stats['max_open']
+
+    print("[OK] A* counter test passed")
+
+
+def testPlannerPhases():
+
+    grid = Grid(size = 10, obstacle_prob = 0.15, seedling = 42)
+    grid.setstartposition((0, 0))
+
+    with profiling.Profiler() as profiler:
+        CoveragePlanner(grid, Drone((0, 0), battery_capacity = 150)).plan_adaptive_coverage(battery_limit = 20)
+
+    assert profiler.counters['nearest_unvisited.picks'] == profiler.counters['adaptive.iterations']
+    assert profiler.phases[('adaptive.pick',)][0] == profiler.counters['adaptive.iterations']
+    nested = profiler.phases[('adaptive.pick', 'a_star_search')]
+    assert nested[0] == profiler.counters['nearest_unvisited.a_star_calls']
+    assert nested[1] <= profiler.phases[('adaptive.pick',)][1]
+
+    report = json.loads(profiler.to_json())
+    assert report['phases']['adaptive.pick;a_star_search']['calls'] == nested[0]
+
+    folded = dict(line.rsplit(' ', 1) for line in profiler.folded().splitlines())
+    assert 'adaptive.pick;a_star_search' in folded
+    assert all(int(value) >= 0 for value in folded.values())
+
+    print("[OK] Planner phase test passed")
+
+
+def testThreadsKeepTheirOwnStacks():
+
+    inside = threading.Barrier(2)
+
+    def work(name):
+        with profiling.phase(name):
+            # Both threads are inside their outer phase at the same time
+            inside.wait()
+            with profiling.phase('inner'):
+                pass
+            inside.wait()
+
+    with profiling.Profiler() as profiler:
+        threads = [threading.Thread(target = work, args = (name,)) for name in ('planner', 'animation')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert set(profiler.phases) == {('planner',), ('animation',), ('planner', 'inner'), ('animation', 'inner')}
+    assert all(calls == 1 for calls, _ in profiler.phases.values())
+
+    print("[OK] Per-thread phase test passed")
+
+
+if __name__ == "__main__":
+    print("=== Running Profiling Tests ===")
+    print("-" * 40)
+
+    testDisabledByDefault()
+    testAstarCounters()
+    testPlannerPhases()
+    testThreadsKeepTheirOwnStacks()
+
+    print("\n[OK] All profiling tests passed!")
@@ -0,0 +1,89 @@
+
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import numpy as np
+
+from grid import Grid
+from a_star import a_star_search, path_cost
+from quadtree import QuadTree
+
+
+def testIncrementalMatchesRebuild():
+
+    grid = Grid(size = 37, obstacle_prob = 0.1, no_fly_zone = 0.05, seedling = 4)
+    tree = QuadTree(grid)
+    rng = random.Random(4)
+
+    for step in range(150):
+        cell = (rng.randrange(37), rng.randrange(37))
+        if step % 3 == 0:
+            grid.set_cell(cell, rng.choice((0, 1, 2)))
+        else:
+            grid.toggle_obstacle(cell)
+        if step % 10 == 0:
+            # Several edits picked up at once
+            continue
+        assert tree.leaf_count() == QuadTree(grid).leaf_count()
+        assert tree.leaves == QuadTree(grid).leaves
+
+    # Leaves tile the grid exactly
+    assert sum(size * size for _, _, size in tree.leaves) == 37 * 37
+    for (row, col, size), free in tree.leaves.items():
+        assert (grid.grid[row:row + size, col:col + size] == 0).all() == free
+
+    print("[OK] Incremental quadtree test passed")
+
+
+def testQuadtreeRouting():
+
+    for scenario in ('Open', 'Narrow Passage'):
+        grid = Grid(size = 64, obstacle_prob = 0, no_fly_zone = 0, seedling = 42)
+        grid.load_scenario(scenario)
+        grid.setstartposition((63, 63))
+        tree = QuadTree(grid)
+
+        stats, exact_stats = {}, {}
+        path = tree.find_path((0, 0), (63, 63), stats = stats)
+        exact = a_star_search(grid, (0, 0), (63, 63), stats = exact_stats)
+
+        assert path[0] == (0, 0) and path[-1] == (63, 63)
+        assert all(b in grid.surroundings(a) for a, b in zip(path, path[1:]))
+        assert path_cost(path, grid) <= path_cost(exact, grid) * 1.1
+        assert stats['expanded'] * 3 < exact_stats['expanded']
+
+    grid.set_cell((32, 32), 1)
+    assert tree.find_path((0, 0), (63, 63)) is None
+
+    print("[OK] Quadtree routing test passed")
+
+
+def testRectangleQueries():
+
+    grid = Grid(size = 50, obstacle_prob = 0.05, no_fly_zone = 0.02, seedling = 9)
+    tree = QuadTree(grid)
+    free = (grid.grid != 1) & (grid.grid != 2)
+    rng = random.Random(9)
+
+    for _ in range(30):
+        r0, r1 = sorted(rng.randrange(50) for _ in range(2))
+        c0, c1 = sorted(rng.randrange(50) for _ in range(2))
+        assert tree.count_free((r0, c0), (r1, c1)) == int(np.sum(free[r0:r1 + 1, c0:c1 + 1]))
+        expected = {(r, c) for r in range(r0, r1 + 1) for c in range(c0, c1 + 1) if free[r, c]}
+        assert set(tree.free_cells((r0, c0), (r1, c1))) == expected
+
+    print("[OK] Rectangle query test passed")
+
+
+if __name__ == "__main__":
+    print("=== Running Quadtree Tests ===")
+    print("-" * 40)
+
+    testIncrementalMatchesRebuild()
+    testQuadtreeRouting()
+    testRectangleQueries()
+
+    print("\n[OK] All quadtree tests passed!")
@@ -9,7 +9,7 @@ import csv
 from grid import Grid
 from drone import Drone
 from coverage import CoveragePlanner
-from a_star import a_star_search
+from a_star import a_star_search, bidirectional_search
 
 def test_scalability():
     """Test the system with different grid sizes"""
@@ -38,6 +38,13 @@ def test_scalability():
         astar_start = time.time()
         path = a_star_search(grid, (0, 0), (size-1, size-1))
         astar_time = time.time() - astar_start
+
+        # Same corner-to-corner route with bidirectional A*
+        bidir_start = time.time()
+        bidir_path = bidirectional_search(grid, (0, 0), (size-1, size-1))
+        bidir_time = time.time() - bidir_start
+        if path and bidir_path:
+            assert len(path) == len(bidir_path)
         
         # Test coverage planning
         coverage_start = time.time()
@@ -58,6 +65,7 @@ def test_scalability():
             'size': size,
             'setup_time_ms': setup_time * 1000,
             'astar_time_ms': astar_time * 1000,
+            'bidir_time_ms': bidir_time * 1000,
             'coverage_time_ms': coverage_time * 1000,
             'total_time_ms': total_time * 1000,
             'coverage_percent': coverage_percent,
@@ -72,6 +80,7 @@ def test_scalability():
         print(f"\n[Results:]")
         print(f"  Setup Time:        {result['setup_time_ms']:.2f}ms")
         print(f"  A* Pathfinding:    {result['astar_time_ms']:.2f}ms")
+        print(f"  Bidirectional A*:  {result['bidir_time_ms']:.2f}ms")
         print(f"  Coverage Planning: {result['coverage_time_ms']:.2f}ms")
         print(f"  -------------------------------------")
         print(f"  Total Time:        {result['total_time_ms']:.2f}ms")
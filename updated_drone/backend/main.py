@@ -0,0 +1,563 @@
+"""
+Mission Planning Service for Drone Path Optimizer
+Local asyncio HTTP/WebSocket server: planning jobs run in a process pool
+so the event loop never blocks, coverage segments and metrics snapshots
+stream back as they are planned, identical concurrent jobs share one
+run, and slow clients throttle their job all the way back to the worker.
+
+Endpoints:
+    GET  /health                 -> {"status": "ok", ...}
+    POST /route      {spec}      -> {"path": [...], "length": n} (plus "bound"
+                                 with a "time_budget" in seconds)
+    POST /coverage   {spec}      -> {"path": [...], "metrics": {...}}
+    GET  /ws  (WebSocket)        send {"type": "route" | "coverage", ...spec},
+                                 receive "segment" / "metrics" messages and
+                                 a final "done" (or "error")
+
+A spec holds a grid ({"size", "cells"} or {"size", "seed", "obstacle_prob",
+"no_fly_zone", "scenario"}) plus "start"/"goal" for routes or "battery",
+"battery_limit", "strategy" ("adaptive" | "greedy" | "horizon") and
+"end_point" for coverage. Malformed requests get 400, grids larger than
+MAX_GRID_SIZE and bodies over MAX_BODY_BYTES get 413, and jobs that fail
+on the server side (a planner error, a crashed worker) get 500.
+"""
+
+import os
+import sys
+import json
+import base64
+import hashlib
+import asyncio
+import struct
+import queue as queues
+import multiprocessing
+from contextlib import aclosing
+from concurrent.futures import ProcessPoolExecutor
+
+# The planners live at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+METRICS_EVERY = 10  # Segments between metrics snapshots
+POLL_SECONDS = 0.5  # How often a pump waiting on its worker checks that it is still alive
+MAX_GRID_SIZE = 400  # Largest grid side a spec may ask for
+MAX_BODY_BYTES = 1 << 22  # Largest HTTP body or WebSocket message accepted
+
+
+# ---------------------------------------------------------------------------
+# Worker side (runs in the process pool)
+# ---------------------------------------------------------------------------
+
+def build_grid(spec):
+    """Grid from a spec: explicit cells, or generated from seed / scenario"""
+    import numpy as np
+    from grid import Grid
+
+    grid_spec = spec.get('grid', {})
+    size = int(grid_spec.get('size', 20))
+    grid = Grid(size=size,
+                obstacle_prob=grid_spec.get('obstacle_prob', 0.12),
+                no_fly_zone=grid_spec.get('no_fly_zone', 0.06),
+                seedling=grid_spec.get('seed'))
+    if 'cells' in grid_spec:
+        grid.grid = np.array(grid_spec['cells'], dtype=int).reshape(size, size)
+        grid.mark_changed()
+    elif 'scenario' in grid_spec:
+        grid.load_scenario(grid_spec['scenario'])
+    return grid
+
+
+def metrics_snapshot(path, grid, drone_start, battery):
+    """Cheap running metrics for a partial coverage path"""
+    from a_star import path_cost
+    from metrics import calculate_turns, safety_score, calculate_clearance_stats
+
+    reachable = int(grid.reachable_mask(drone_start).sum())
+    covered = len(set(path) | {drone_start})
+    return {
+        'steps': len(path),
+        'coverage_percent': covered / reachable * 100 if reachable else 0.0,
+        'battery_left': battery - path_cost([drone_start] + path, grid),
+        'turns': calculate_turns(path),
+        'safety_score': safety_score(path, grid),
+        'min_clearance': calculate_clearance_stats(path, grid)['min_clearance']
+    }
+
+
+def plan_route(spec):
+    """
+    Point-to-point job: {"path", "length"}. With a "time_budget" the anytime
+    search answers within it and adds the path's suboptimality "bound".
+    """
+    from a_star import anytime_search, bidirectional_search
+
+    try:
+        grid = build_grid(spec)
+        start, goal = tuple(spec['start']), tuple(spec['goal'])
+    except (KeyError, TypeError, IndexError) as error:  # Reported as a bad request, not a crash
+        raise ValueError(f'invalid spec: {type(error).__name__}: {error}') from None
+    if spec.get('time_budget') is not None:
+        path, bound = anytime_search(grid, start, goal, time_budget=spec['time_budget'])
+        return {'path': path, 'length': len(path) - 1 if path else -1,
+                'bound': bound if path else None}
+    path = bidirectional_search(grid, start, goal)
+    return {'path': path, 'length': len(path) - 1 if path else -1}
+
+
+def stream_coverage(spec, queue):
+    """
+    Coverage job: puts ('segment', cells), ('metrics', snapshot) and
+    finally ('done', summary) on queue, or ('invalid', message) for a
+    spec that cannot be set up and ('error', message) if planning itself
+    failed. The queue is bounded, so a consumer that falls behind pauses
+    the planner.
+    """
+    from drone import Drone
+    from coverage import CoveragePlanner
+
+    try:
+        grid = build_grid(spec)
+        start = tuple(spec.get('start', (0, 0)))
+        grid.setstartposition(start)
+        battery = spec.get('battery', grid.size * grid.size * 2)
+        drone = Drone(startposition=start, battery_capacity=battery, grid_size=grid.size)
+        end_point = tuple(spec['end_point']) if spec.get('end_point') else None
+        battery_limit = spec.get('battery_limit', 20)
+    except (ValueError, KeyError, TypeError, IndexError) as error:  # The client's fault
+        queue.put(('invalid', f'{type(error).__name__}: {error}'))
+        return
+
+    try:
+        strategy = spec.get('strategy', 'adaptive')
+        if strategy == 'greedy':
+            segments = CoveragePlanner(grid, drone).iter_greedy_coverage(spec.get('look_ahead', 5))
+        elif strategy == 'horizon':
+            from horizon import RecedingHorizonPlanner
+            segments = RecedingHorizonPlanner(grid, drone, window=spec.get('window', 6)).iter_coverage(
+                battery_limit=battery_limit, end_point=end_point)
+        else:
+            segments = CoveragePlanner(grid, drone).iter_adaptive_coverage(
+                battery_limit=battery_limit, end_point=end_point)
+
+        path = []
+        for count, segment in enumerate(segments, 1):
+            path.extend(segment)
+            queue.put(('segment', [list(cell) for cell in segment]))
+            if count % METRICS_EVERY == 0:
+                queue.put(('metrics', metrics_snapshot(path, grid, start, battery)))
+
+        queue.put(('done', metrics_snapshot(path, grid, start, battery)))
+    except Exception as error:  # Reported to the client instead of killing the pump
+        queue.put(('error', f'{type(error).__name__}: {error}'))
+
+
+# ---------------------------------------------------------------------------
+# Jobs, coalescing and backpressure
+# ---------------------------------------------------------------------------
+
+class Busy(Exception):
+    """Raised when the service already has max_pending jobs"""
+
+
+class TooLarge(Exception):
+    """Raised for request bodies or grids over MAX_BODY_BYTES / MAX_GRID_SIZE"""
+
+
+def check_limits(spec):
+    """Refuse specs whose grid would be too large to plan (before any work is queued)"""
+    size = int(spec.get('grid', {}).get('size', 20))
+    if size < 1:
+        raise ValueError(f'grid size must be positive, not {size}')
+    if size > MAX_GRID_SIZE:
+        raise TooLarge(f'grid size {size} is over the limit of {MAX_GRID_SIZE}')
+
+
+class StreamJob:
+    """
+    One running coverage job and everyone listening to it
+
+    Items are kept so late subscribers replay from the start. The pump
+    only takes a new item from the worker while every subscriber is
+    within `window` items of the newest one.
+    """
+
+    def __init__(self, window):
+        self.items = []
+        self.finished = False
+        self.window = window
+        self.cursors = {}  # subscriber id -> next item index
+        self.changed = asyncio.Condition()
+
+    def _caught_up(self):
+        newest = len(self.items)
+        return all(newest - cursor < self.window for cursor in self.cursors.values())
+
+    async def publish(self, item, final=False):
+        async with self.changed:
+            await self.changed.wait_for(self._caught_up)
+            self.items.append(item)
+            self.finished = final
+            self.changed.notify_all()
+
+    async def subscribe(self):
+        """Async generator over the job's items, from the first one"""
+        token = object()
+        self.cursors[token] = 0
+        try:
+            while True:
+                async with self.changed:
+                    await self.changed.wait_for(
+                        lambda: self.cursors[token] < len(self.items) or self.finished)
+                    if self.cursors[token] >= len(self.items):
+                        return
+                    item = self.items[self.cursors[token]]
+                    self.cursors[token] += 1
+                    self.changed.notify_all()
+                yield item
+        finally:
+            async with self.changed:
+                del self.cursors[token]
+                self.changed.notify_all()
+
+
+class PlanningService:
+    """Process pool plus job bookkeeping shared by the HTTP and WebSocket handlers"""
+
+    def __init__(self, workers=None, max_pending=32, window=16):
+        """
+        Parameters:
+            workers: Pool size (default: CPU count)
+            max_pending: Jobs (running or queued) beyond which requests get "busy"
+            window: Items a subscriber may lag behind before its job pauses
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.window = window
+        self.pool = None
+        self.manager = None
+        self.slots = None
+        self.routes = {}   # job key -> asyncio.Task
+        self.streams = {}  # job key -> StreamJob
+        self.runs = 0      # Jobs actually sent to the pool (coalesced ones are not)
+
+    def start(self):
+        # spawn, not fork: the loop and the manager's threads must not be
+        # copied into workers mid-flight (a forked worker can deadlock)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+        self.manager = multiprocessing.Manager()
+        self.slots = asyncio.Semaphore(self.workers)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.manager.shutdown()
+            self.pool = self.manager = None
+
+    @staticmethod
+    def job_key(kind, spec):
+        spec = {k: v for k, v in spec.items() if k != 'type'}
+        return kind + ':' + json.dumps(spec, sort_keys=True, separators=(',', ':'))
+
+    def _admit(self):
+        if len(self.routes) + len(self.streams) >= self.max_pending:
+            raise Busy()
+
+    async def route(self, spec):
+        """Plan a route; identical concurrent requests share one pool job"""
+        check_limits(spec)
+        key = self.job_key('route', spec)
+        task = self.routes.get(key)
+        if task is None:
+            self._admit()
+            task = asyncio.ensure_future(self._run_route(spec))
+            self.routes[key] = task
+            task.add_done_callback(lambda _: self.routes.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _run_route(self, spec):
+        async with self.slots:
+            self.runs += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, plan_route, spec)
+
+    def coverage(self, spec):
+        """Async generator of (kind, payload) items for a coverage job"""
+        check_limits(spec)
+        key = self.job_key('coverage', spec)
+        job = self.streams.get(key)
+        if job is None:
+            self._admit()
+            job = StreamJob(self.window)
+            self.streams[key] = job
+            asyncio.ensure_future(self._pump(key, job, spec))
+        return job.subscribe()
+
+    async def _pump(self, key, job, spec):
+        loop = asyncio.get_running_loop()
+        try:
+            async with self.slots:
+                self.runs += 1
+                queue = self.manager.Queue(maxsize=self.window)
+                work = loop.run_in_executor(self.pool, stream_coverage, spec, queue)
+                while True:
+                    # Poll instead of blocking for good, so a worker that
+                    # died without a final item cannot hang the pump
+                    try:
+                        kind, payload = await loop.run_in_executor(None, queue.get, True, POLL_SECONDS)
+                    except queues.Empty:
+                        if work.done():
+                            await work
+                            raise RuntimeError('coverage worker stopped without a result')
+                        continue
+                    final = kind in ('done', 'invalid', 'error')
+                    await job.publish((kind, payload), final=final)
+                    if final:
+                        break
+                await work
+        except Exception as error:
+            await job.publish(('error', f'{type(error).__name__}: {error}'), final=True)
+        finally:
+            self.streams.pop(key, None)
+
+
+# ---------------------------------------------------------------------------
+# HTTP and WebSocket plumbing (stdlib only)
+# ---------------------------------------------------------------------------
+
+async def read_request(reader):
+    """
+    (method, path, headers, body) of one HTTP/1.1 request; ValueError or
+    asyncio.LimitOverrunError if it is malformed, TooLarge if its body is
+    over MAX_BODY_BYTES
+    """
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    method, path, _ = lines[0].split(' ', 2)
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', 0))
+    if length < 0:
+        raise ValueError(f'bad content-length {length}')
+    if length > MAX_BODY_BYTES:
+        raise TooLarge(f'body of {length} bytes is over the limit of {MAX_BODY_BYTES}')
+    body = await reader.readexactly(length) if length else b''
+    return method, path, headers, body
+
+
+async def send_json(writer, status, payload):
+    reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+               500: 'Internal Server Error', 503: 'Service Unavailable'}
+    body = json.dumps(payload).encode()
+    writer.write(f'HTTP/1.1 {status} {reasons.get(status, "")}\r\n'
+                 f'Content-Type: application/json\r\n'
+                 f'Content-Length: {len(body)}\r\n'
+                 f'Connection: close\r\n\r\n'.encode() + body)
+    await writer.drain()
+
+
+def ws_frame(payload, opcode=1, mask=False):
+    """One final WebSocket frame (clients must mask, servers must not)"""
+    header = bytes([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    if len(payload) < 126:
+        header += bytes([mask_bit | len(payload)])
+    elif len(payload) < 1 << 16:
+        header += bytes([mask_bit | 126]) + struct.pack('>H', len(payload))
+    else:
+        header += bytes([mask_bit | 127]) + struct.pack('>Q', len(payload))
+    if mask:
+        key = os.urandom(4)
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+        header += key
+    return header + payload
+
+
+async def ws_read(reader):
+    """(opcode, payload) of the next WebSocket frame"""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7f
+    if length == 126:
+        length, = struct.unpack('>H', await reader.readexactly(2))
+    elif length == 127:
+        length, = struct.unpack('>Q', await reader.readexactly(8))
+    if length > MAX_BODY_BYTES:
+        raise TooLarge(f'message of {length} bytes is over the limit of {MAX_BODY_BYTES}')
+    key = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if key:
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+    return first & 0x0f, payload
+
+
+async def ws_send(writer, message):
+    # drain() waits while the socket buffer is full: a slow client stops
+    # this loop, which stops its job's pump, which stops the worker
+    writer.write(ws_frame(json.dumps(message).encode()))
+    await writer.drain()
+
+
+class Server:
+
+    def __init__(self, service):
+        self.service = service
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                method, path, headers, body = await read_request(reader)
+            except TooLarge as error:
+                return await send_json(writer, 413, {'error': str(error)})
+            except (ValueError, asyncio.LimitOverrunError) as error:
+                return await send_json(writer, 400, {'error': f'malformed request: {error}'})
+            if path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+                await self.websocket(reader, writer, headers)
+            else:
+                await self.http(writer, method, path, body)
+        except (asyncio.IncompleteReadError, ConnectionError, TooLarge):
+            pass
+        finally:
+            writer.close()
+
+    async def http(self, writer, method, path, body):
+        service = self.service
+        if method == 'GET' and path == '/health':
+            return await send_json(writer, 200, {'status': 'ok', 'workers': service.workers,
+                                                 'pending': len(service.routes) + len(service.streams)})
+        if method != 'POST' or path not in ('/route', '/coverage'):
+            return await send_json(writer, 404, {'error': f'no endpoint {method} {path}'})
+        try:
+            spec = json.loads(body or b'{}')
+            if path == '/route':
+                return await send_json(writer, 200, await service.route(spec))
+
+            result = {'path': [], 'metrics': None}
+            async with aclosing(service.coverage(spec)) as items:
+                async for kind, payload in items:
+                    if kind == 'segment':
+                        result['path'].extend(payload)
+                    elif kind == 'done':
+                        result['metrics'] = payload
+                    elif kind == 'invalid':
+                        return await send_json(writer, 400, {'error': payload})
+                    elif kind == 'error':
+                        return await send_json(writer, 500, {'error': payload})
+            await send_json(writer, 200, result)
+        except Busy:
+            await send_json(writer, 503, {'error': 'busy'})
+        except TooLarge as error:
+            await send_json(writer, 413, {'error': str(error)})
+        except (ValueError, KeyError) as error:
+            await send_json(writer, 400, {'error': str(error)})
+        except Exception as error:  # e.g. a worker died: report it, keep serving
+            await send_json(writer, 500, {'error': f'{type(error).__name__}: {error}'})
+
+    async def websocket(self, reader, writer, headers):
+        accept = base64.b64encode(hashlib.sha1((headers['sec-websocket-key'] + WS_GUID).encode()).digest())
+        writer.write(b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n'
+                     b'Connection: Upgrade\r\nSec-WebSocket-Accept: ' + accept + b'\r\n\r\n')
+        await writer.drain()
+
+        while True:
+            opcode, payload = await ws_read(reader)
+            if opcode == 8:  # close
+                writer.write(ws_frame(b'', opcode=8))
+                await writer.drain()
+                return
+            if opcode == 9:  # ping
+                writer.write(ws_frame(payload, opcode=10))
+                await writer.drain()
+                continue
+            if opcode != 1:
+                continue
+
+            try:
+                spec = json.loads(payload)
+                if spec.get('type') == 'route':
+                    await ws_send(writer, {'type': 'done', **await self.service.route(spec)})
+                else:
+                    # aclosing: a client that drops mid-stream must release its job
+                    async with aclosing(self.service.coverage(spec)) as items:
+                        async for kind, item in items:
+                            if kind in ('invalid', 'error'):
+                                await ws_send(writer, {'type': 'error', 'error': item})
+                            else:
+                                key = 'path' if kind == 'segment' else 'metrics'
+                                await ws_send(writer, {'type': kind, key: item})
+            except Busy:
+                await ws_send(writer, {'type': 'error', 'error': 'busy'})
+            except (TooLarge, ValueError, KeyError) as error:
+                await ws_send(writer, {'type': 'error', 'error': str(error)})
+            except (asyncio.IncompleteReadError, ConnectionError):
+                raise  # The client went away; handle() closes up
+            except Exception as error:  # e.g. a worker died: report it, keep the connection
+                print(f"[SERVICE] WebSocket job failed: {type(error).__name__}: {error}")
+                await ws_send(writer, {'type': 'error', 'error': f'{type(error).__name__}: {error}'})
+
+
+async def serve(host='127.0.0.1', port=8000, workers=None, ready=None, service=None):
+    """
+    Run the service until cancelled
+
+    Parameters:
+        ready: Optional callback receiving the bound port (useful with port=0)
+        service: PlanningService to use (default: a new one with workers)
+    """
+    service = service or PlanningService(workers=workers)
+    service.start()
+    server = await asyncio.start_server(Server(service).handle, host, port)
+    bound = server.sockets[0].getsockname()[1]
+    print(f"[SERVICE] Listening on http://{host}:{bound} ({service.workers} workers)")
+    if ready:
+        ready(bound)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+# ---------------------------------------------------------------------------
+# Minimal localhost client
+# ---------------------------------------------------------------------------
+
+async def ws_plan(host, port, spec):
+    """Async generator over the messages of one WebSocket planning request"""
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write(f'GET /ws HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\n'
+                 f'Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n'
+                 f'Sec-WebSocket-Version: 13\r\n\r\n'.encode())
+    await reader.readuntil(b'\r\n\r\n')
+    writer.write(ws_frame(json.dumps(spec).encode(), mask=True))
+    await writer.drain()
+    try:
+        while True:
+            opcode, payload = await ws_read(reader)
+            if opcode != 1:
+                continue
+            message = json.loads(payload)
+            yield message
+            if message['type'] in ('done', 'error'):
+                return
+    finally:
+        writer.write(ws_frame(b'', opcode=8, mask=True))
+        writer.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Drone mission planning service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        print("\n[SERVICE] Stopped.")
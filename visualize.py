@@ -3,21 +3,12 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import numpy as np
 import matplotlib.cm as cm
+import profiling
+from palette import COLOR_PALETTE, HEAT_VISITS, VISITED_BASE, VISITED_HOT
 
 class Dashboard:
 
-    colorpalette = {
-        'safe': '#1a1a2e', 
-        'obstacle': '#e94560',
-        'no_fly': '#ff6b35',
-        'path': '#00ff88',
-        'drone': '#00d4ff',
-        'visited': '#0f3460',
-        'visitedd': '#0f3460', # Kept for safety if used anywhere else
-        'grid_lines': '#16213e',
-        'optimal_path': '#0080ff',
-        'destination': '#ffff00'
-    }
+    colorpalette = COLOR_PALETTE
 
     def __init__(self, grid, drone):
         self.grid = grid
@@ -36,6 +27,7 @@ class Dashboard:
         self.metrics_data = None  # Cache metrics calculations
         self.replanning_callback = None # Callback for obstacle updates
         self.radio = None # Widget reference
+        self.occupancy = None # Scheduled obstacles drawn over the grid (OccupancySchedule.layer)
 
     def setup_plot(self):
         self.fig = plt.figure(figsize=(20, 8))  # Larger to fit enhanced metrics
@@ -90,57 +82,29 @@ class Dashboard:
         hex_color = hex_color.lstrip('#')
         return tuple(int(hex_color[i:i+2], 16)/255 for i in (0, 2, 4))
 
+    @profiling.profiled('dashboard.draw_grid')
     def draw_grid(self, show_path=True, show_drone=True, drone_pos=None):
         """Draw the grid, obstacles, and drone"""
         self.axe_grid.clear()
         
-        # Create a colored grid based on cell types
-        grid_vis = np.zeros((self.grid.size, self.grid.size, 3))
-
-        
-        # Calculate visit counts for heatmap
-        visit_counts = {}
-        max_visits = 1
-        for pos in self.drone.path_history:
-            visit_counts[pos] = visit_counts.get(pos, 0) + 1
-            max_visits = max(max_visits, visit_counts[pos])
-            
-        for thei in range(self.grid.size):
-            for thej in range(self.grid.size):
-                cell_type = self.grid.grid[thei][thej]
-
-                if (thei, thej) in self.drone.visited:
-                    # Heatmap logic: 
-                    # Base color is 'visited'
-                    # We blend it with a "hot" color based on visit count
-                    count = visit_counts.get((thei, thej), 1)
-                    intensity = min(1.0, count / 5.0) # Cap at 5 visits for max intensity
-                    
-                    # Simple gradient: Dark Blue -> Bright Cyan/White
-                    # base = (15, 52, 96) # #0f3460
-                    # hot = (0, 255, 255) # Cyan
-                    
-                    # Using matplotlib colormap 'viridis' or 'plasma'
-                    # but let's stick to our theme.
-                    # Interpolate between 'visited' and 'path' colors?
-                    
-                    # Manual gradient for control
-                    r = 15 + (0 - 15) * intensity
-                    g = 52 + (255 - 52) * intensity
-                    b = 96 + (212 - 96) * intensity # Towards #00ffd4
-                    
-                    color = (r/255, g/255, b/255)
-                    
-                elif cell_type == 0: 
-                    color = self._hex_to_rgb(self.colorpalette['safe'])
-                elif cell_type == 1:
-                    color = self._hex_to_rgb(self.colorpalette['obstacle'])
-                elif cell_type == 2:
-                    color = self._hex_to_rgb(self.colorpalette['no_fly'])
-                else:
-                    color = (0, 0, 0) # Fallback
-
-                grid_vis[thei][thej] = color
+        # Color every cell by type in one lookup
+        palette = np.array([self._hex_to_rgb(self.colorpalette['safe']),
+                            self._hex_to_rgb(self.colorpalette['obstacle']),
+                            self._hex_to_rgb(self.colorpalette['no_fly']),
+                            (0, 0, 0)])  # Fallback
+        cells = self.grid.grid
+        if self.occupancy is not None:
+            cells = np.where(self.occupancy > 0, self.occupancy, cells)
+        grid_vis = palette[np.clip(cells, 0, 3)]
+
+        # Heatmap: visited cells blend from 'visited' dark blue towards
+        # cyan (#00ffd4), reaching full intensity at HEAT_VISITS visits
+        counts = self.drone.get_visit_counts(self.grid.size)
+        visited = counts > 0
+        intensity = np.minimum(1.0, counts[visited] / HEAT_VISITS)[:, None]
+        base = np.array(VISITED_BASE) / 255
+        hot = np.array(VISITED_HOT) / 255
+        grid_vis[visited] = base + (hot - base) * intensity
         
         self.axe_grid.imshow(grid_vis, origin='upper')
 
@@ -229,6 +193,7 @@ class Dashboard:
         self.axe_grid.tick_params(colors='white')
         plt.show()
 
+    @profiling.profiled('dashboard.draw_battery')
     def draw_battery(self):
         self.axe_battery.clear()
 
@@ -247,6 +212,7 @@ class Dashboard:
                                ha='center', va='center', color='white',
                                fontsize=16, fontweight='bold')
         
+    @profiling.profiled('dashboard.draw_coverage')
     def draw_coverage(self):
         self.axe_coverage.clear()
 
@@ -271,6 +237,7 @@ class Dashboard:
                                ha='center', va='center', color='white',
                                fontsize=16, fontweight='bold')
         
+    @profiling.profiled('dashboard.draw_stats')
     def draw_stats(self):
         self.axe_stats.clear()
 
@@ -310,6 +277,7 @@ class Dashboard:
         else:
             return '#e94560'
     
+    @profiling.profiled('dashboard.draw_optimal_path')
     def draw_optimal_path(self):
         """Draw the optimal path from start to destination in blue"""
         if self.optimal_path and len(self.optimal_path) > 1:
@@ -319,6 +287,7 @@ class Dashboard:
                                linewidth=3, alpha=0.8, 
                                linestyle='--', label='Optimal Path')
     
+    @profiling.profiled('dashboard.draw_destination')
     def draw_destination(self):
         """Draw the destination marker"""
         if self.destination:
@@ -379,6 +348,8 @@ class Dashboard:
                     self.draw_grid()
                     if self.destination:
                         self.draw_destination()
+                    if self.replanning_callback:
+                        self.replanning_callback((row, col))
                     self.fig.canvas.draw_idle()
     
     def on_hover(self, event):
@@ -389,6 +360,7 @@ class Dashboard:
             if 0 <= row < self.grid.size and 0 <= col < self.grid.size:
                 self.hover_pos = (row, col)
     
+    @profiling.profiled('dashboard.draw_enhanced_metrics')
     def draw_enhanced_metrics(self):
         """Draw enhanced metrics panel with turn count, baseline comparison, energy breakdown"""
         if not self.axe_metrics:
@@ -424,16 +396,17 @@ class Dashboard:
 [ADVANCED METRICS]
 
 Path Analysis:
-  Length: {metrics['path_length']} vs {metrics['baseline']['path_length']} ({metrics['path_length_improvement']:+.1f}%)
+  Length: {metrics['path_length']} vs {metrics['baseline']['path_length']:.0f} ({metrics['path_length_improvement']:+.1f}%)
   Turns: {metrics['turns']} ({metrics['turn_reduction']:+.1f}%)
 
 Energy Breakdown:
   Straight: {metrics['energy']['straight_moves']} | Turns: {metrics['energy']['turn_moves']}
   Efficiency: {metrics['energy']['efficiency']:.1f}% straight
-  Total Energy: {metrics['energy']['total_energy']} units
+  Total Energy: {metrics['energy']['total_energy']:.0f} units
 
 Safety Score: {metrics['safety_score']}/100 {'[OK]' if metrics['safety_score'] == 100 else '[WARNING]'}
   Buffer Violations: {metrics['buffer_violations']} close calls
+  Clearance: min {metrics['min_clearance']:.0f} | mean {metrics['mean_clearance']:.2f} cells
             """
 
             